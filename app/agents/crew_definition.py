@@ -3,21 +3,225 @@ CrewAI crew definition for the AI Docs Generator.
 """
 from crewai import Agent, Task, Crew, Process
 from langchain.tools import Tool
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Iterator
 import os
-import groq
+import asyncio
+import inspect
+import string
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import singledispatch
 from langchain.llms.base import LLM
+from langchain_core.outputs import GenerationChunk
 from pydantic import Field
 from dotenv import load_dotenv
+from app.agents.groq_api import (
+    acreate_completion,
+    create_completion,
+    get_cached_response,
+    record_usage,
+    response_cache_key,
+    store_cached_response,
+    stream_completion,
+)
+from app.agents.groq_clients import get_async_groq_client, get_groq_client
 
 # Load environment variables
 load_dotenv()
 
+# Static task descriptions, built once at import time
+_PLANNING_TASK_DESCRIPTION = """
+            Analyze the repository structure and create a comprehensive documentation plan.
+            
+            1. Identify the main components, modules, and services
+            2. Determine important relationships between components
+            3. Prioritize which parts need detailed documentation
+            4. Create a documentation outline with sections and subsections
+            5. Specify which diagrams would be most useful
+            
+            Your output should be a structured plan that other agents can follow to
+            generate comprehensive documentation.
+            """
+
+_CODE_ANALYSIS_TASK_DESCRIPTION = """
+            Analyze the code files according to the documentation plan.
+            
+            For each component identified in the plan:
+            1. Parse the code to understand its structure and functionality
+            2. Identify key classes, functions, and methods
+            3. Determine relationships with other components
+            4. Note any design patterns or architectural approaches
+            5. Extract API endpoints and parameters (if applicable)
+            
+            Your output should be a detailed analysis that the Documentation Writer
+            can use to create accurate documentation.
+            """
+
+_DOCUMENTATION_TASK_DESCRIPTION = """
+            Create comprehensive documentation based on the code analysis.
+            
+            Follow the documentation plan and use the code analysis to:
+            1. Write an overview of the project structure
+            2. Document each component with clear explanations
+            3. Describe key relationships between components
+            4. Provide examples of usage where appropriate
+            5. Include API references if applicable
+            
+            Format the documentation as markdown with clear sections and headers.
+            """
+
+_DIAGRAM_TASK_DESCRIPTION = """
+            Create visual diagrams based on the code analysis and documentation plan.
+            
+            Generate the following types of diagrams as specified in the plan:
+            1. Architecture diagrams showing high-level components
+            2. Flow diagrams for key processes
+            3. Entity-relationship diagrams if there's a database
+            4. Class or component relationship diagrams
+            
+            Use the appropriate format (Mermaid or Graphviz) and ensure diagrams are
+            clear, informative, and not too cluttered.
+            """
+
+_SIMPLIFIED_DOCUMENTATION_TEMPLATE = string.Template("""
+            $repository_context
+            
+            Generate basic documentation for the provided repository files. Keep your analysis brief and focused.
+            
+            For each main file:
+            - What is its purpose?
+            - What are its key functions/classes?
+            - How does it connect to other components?
+            
+            Format as simple markdown. IMPORTANT: Keep your response brief and avoid deep analysis to prevent timeouts.
+            Focus on generating a useful overview rather than comprehensive documentation.
+            """)
+
+
+# Prompt budget for the number of files listed, and the files that best describe a project
+_MAX_CONTEXT_FILES = 50
+_ENTRY_POINT_FILES = {
+    "main.py", "__init__.py", "app.py", "README.md", "setup.py", "pyproject.toml",
+    "package.json", "index.js", "index.ts",
+}
+_GENERATED_DIRECTORIES = {"node_modules", ".git", "dist", "build", "__pycache__", "venv"}
+
+
+def _select_representative_files(files: List[str], k: int = _MAX_CONTEXT_FILES) -> List[str]:
+    """
+    Pick at most k files to describe the repository in a prompt.
+    
+    Args:
+        files: Selected file paths
+        k: Maximum number of files to keep
+        
+    Returns:
+        Entry points and configuration first, then the shallowest paths
+    """
+    if len(files) <= k:
+        return list(files)
+    
+    # Skip vendored and generated output unless nothing else is left
+    candidates = [
+        path for path in files
+        if not _GENERATED_DIRECTORIES.intersection(path.split("/")[:-1])
+    ] or list(files)
+    
+    ranked = sorted(
+        candidates,
+        key=lambda path: (os.path.basename(path) not in _ENTRY_POINT_FILES, path.count("/"), path)
+    )
+    return ranked[:k]
+
+
+def _format_repository_context(repository_url: str, files: List[str]) -> str:
+    """Describe the repository and the files to document for a task prompt."""
+    return f"""
+            Repository URL: {repository_url}
+            
+            Files to document:
+            {', '.join(files)}
+            """
+
+
+# Per-agent limits so a looping agent fails fast instead of burning the token quota;
+# the documentation writer produces the longest output and gets more iterations
+_AGENT_MAX_ITER = 4
+_WRITER_MAX_ITER = 8
+_AGENT_MAX_EXECUTION_TIME = 120  # seconds
+
+# Older CrewAI versions have no kickoff inputs to interpolate into the task descriptions
+_KICKOFF_ACCEPTS_INPUTS = "inputs" in inspect.signature(Crew.kickoff).parameters
+
+
+# Task ID keywords mapped to result keys, checked in order
+_TASK_KINDS = [
+    ("planning", "plan"),
+    ("analysis", "analysis"),
+    ("code", "analysis"),
+    ("documentation", "documentation"),
+    ("doc", "documentation"),
+    ("diagram", "diagrams"),
+]
+
+
+def _classify_task_id(task_id: str) -> Optional[str]:
+    """Return the result key a task ID belongs to, or None if it isn't recognised."""
+    lowered = task_id.lower()
+    for keyword, kind in _TASK_KINDS:
+        if keyword in lowered:
+            return kind
+    return None
+
+
+# Result keys of list results from older CrewAI versions, in task order
+_LIST_RESULT_KINDS = ("plan", "analysis", "diagrams", "documentation")
+
+# Placeholder for each result key the crew didn't produce
+_MISSING_RESULT_TEXT = {
+    "documentation": "No documentation generated.",
+    "diagrams": "No diagrams generated.",
+    "plan": "No plan generated.",
+    "analysis": "No analysis generated.",
+}
+
+
+@singledispatch
+def _task_outputs(result: Any) -> Dict[str, Any]:
+    """
+    Normalize a Crew.kickoff() result to task outputs keyed by result kind.
+    
+    Strings, CrewOutput objects and other unknown types are the final
+    (documentation) task's output.
+    """
+    return {"documentation": str(result)}
+
+
+@_task_outputs.register(dict)
+def _dict_task_outputs(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify each task ID of a dict result once."""
+    outputs = {}
+    for task_id, task_result in result.items():
+        kind = _classify_task_id(task_id)
+        if kind is not None:
+            outputs[kind] = task_result.get("output", "") if isinstance(task_result, dict) else task_result
+    return outputs
+
+
+@_task_outputs.register(list)
+def _list_task_outputs(result: List[Any]) -> Dict[str, Any]:
+    """Map a list result onto the tasks in order, or take its last item as documentation."""
+    if len(result) >= len(_LIST_RESULT_KINDS):
+        return dict(zip(_LIST_RESULT_KINDS, result))
+    return {"documentation": result[-1]} if result else {}
+
+
 # Custom LLM class to integrate direct Groq client
 class GroqLLM(LLM):
     """LLM wrapper for Groq API."""
     
     client: Any = None
+    async_client: Any = None
     model_name: str = "llama3-70b-8192"
     temperature: float = 0.2
     api_key: str = Field(default="")
@@ -32,27 +236,117 @@ class GroqLLM(LLM):
         if not self.api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        self.client = groq.Client(api_key=self.api_key)
+        self.client = get_groq_client(self.api_key)
+        self.async_client = get_async_groq_client(self.api_key)
     
     @property
     def _llm_type(self) -> str:
         """Return type of LLM."""
         return "groq"
     
-    def _call(self, prompt: str, **kwargs) -> str:
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the Groq API."""
+        return [
+            {"role": "system", "content": "You are a helpful AI assistant."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def with_temperature(self, temperature: float) -> "GroqLLM":
+        """
+        Return a copy of this LLM with a different default temperature.
+        
+        The copy shares the Groq clients, so no new connection pool is created.
+        """
+        copy_model = getattr(self, "model_copy", None) or self.copy
+        return copy_model(update={"temperature": temperature})
+    
+    def _resolve_temperature(self, temperature: Optional[float]) -> float:
+        """Return the per-call temperature override, or the default temperature."""
+        return self.temperature if temperature is None else temperature
+    
+    def _cache_key(self, prompt: str, temperature: float) -> Optional[str]:
+        """Return the response cache key, or None if the call shouldn't be cached."""
+        return response_cache_key(self.model_name, temperature, prompt)
+    
+    def _call(self, prompt: str, temperature: Optional[float] = None, **kwargs) -> str:
         """Call the Groq API and return the response."""
+        temperature = self._resolve_temperature(temperature)
+        cache_key = self._cache_key(prompt, temperature)
+        if cache_key:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            response = self.client.chat.completions.create(
+            response = create_completion(
+                self.client,
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=self.temperature,
+                messages=self._build_messages(prompt),
+                temperature=temperature,
             )
-            return response.choices[0].message.content
+            record_usage(response)
+            content = response.choices[0].message.content
         except Exception as e:
             return f"Error with Groq API: {str(e)}"
+        
+        if cache_key and content is not None:
+            store_cached_response(cache_key, content)
+        return content
+    
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, temperature: Optional[float] = None, **kwargs) -> Iterator[GenerationChunk]:
+        """Stream the Groq response token by token (used by LLM.stream)."""
+        temperature = self._resolve_temperature(temperature)
+        cache_key = self._cache_key(prompt, temperature)
+        if cache_key:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                yield GenerationChunk(text=cached)
+                return
+        
+        parts = []
+        try:
+            for text in stream_completion(
+                self.client,
+                model=self.model_name,
+                messages=self._build_messages(prompt),
+                temperature=temperature,
+            ):
+                parts.append(text)
+                if run_manager:
+                    run_manager.on_llm_new_token(text)
+                yield GenerationChunk(text=text)
+        except Exception as e:
+            # Reported like _call does; a partial response is not cached
+            yield GenerationChunk(text=f"Error with Groq API: {str(e)}")
+            return
+        
+        if cache_key and parts:
+            store_cached_response(cache_key, "".join(parts))
+    
+    async def _acall(self, prompt: str, temperature: Optional[float] = None, **kwargs) -> str:
+        """Call the Groq API without blocking the event loop and return the response."""
+        temperature = self._resolve_temperature(temperature)
+        cache_key = self._cache_key(prompt, temperature)
+        if cache_key:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            response = await acreate_completion(
+                self.async_client,
+                model=self.model_name,
+                messages=self._build_messages(prompt),
+                temperature=temperature,
+            )
+            record_usage(response)
+            content = response.choices[0].message.content
+        except Exception as e:
+            return f"Error with Groq API: {str(e)}"
+        
+        if cache_key and content is not None:
+            store_cached_response(cache_key, content)
+        return content
 
 class DocsGeneratorCrew:
     """
@@ -95,12 +389,20 @@ class DocsGeneratorCrew:
         # Initialize Groq LLM
         self.groq_llm = GroqLLM(model_name=self.model_name, temperature=self.temperature)
         
+        # Extra crews used by run_many; CrewAI state isn't safe to share between threads
+        self._crew_pool: List["DocsGeneratorCrew"] = []
+        
         # Initialize agents
         self.planner = self._create_planner_agent()
         self.code_analyzer = self._create_code_analyzer_agent()
         self.doc_writer = self._create_doc_writer_agent()
         self.diagrammer = self._create_diagrammer_agent()
         
+        # run() only needs the simplified tasks, so install them up front with a
+        # placeholder for the repository context; the full pipeline is built by run_full()
+        simplified_tasks = self._create_simplified_tasks("{repository_context}")
+        self._simplified_tasks_installed = True
+        
         # Create the crew with more limited, focused tasks to avoid timeouts
         try:
             self.crew = Crew(
@@ -110,10 +412,9 @@ class DocsGeneratorCrew:
                     self.doc_writer,
                     self.diagrammer
                 ],
-                tasks=self._create_tasks(),
+                tasks=simplified_tasks,
                 verbose=self.verbose,
                 process=Process.sequential,  # Sequential is more reliable
-                max_rpm=10,  # Limit requests per minute to avoid rate limits
                 max_execution_time=300  # 5 minutes max per task
             )
         except TypeError:
@@ -125,7 +426,7 @@ class DocsGeneratorCrew:
                     self.doc_writer,
                     self.diagrammer
                 ],
-                tasks=self._create_tasks(),
+                tasks=simplified_tasks,
                 verbose=self.verbose,
                 process=Process.sequential  # Sequential is more reliable
             )
@@ -140,7 +441,9 @@ class DocsGeneratorCrew:
             years of experience working with different programming languages and frameworks,
             and you know how to identify important components and relationships.""",
             verbose=self.verbose,
-            allow_delegation=True,
+            allow_delegation=False,  # Task context drives hand-offs instead of delegation calls
+            max_iter=_AGENT_MAX_ITER,
+            max_execution_time=_AGENT_MAX_EXECUTION_TIME,
             tools=self.github_tools,
             llm=self.groq_llm
         )
@@ -156,16 +459,16 @@ class DocsGeneratorCrew:
             ability to simplify complex implementations and explain them clearly.""",
             verbose=self.verbose,
             allow_delegation=False,
+            max_iter=_AGENT_MAX_ITER,
+            max_execution_time=_AGENT_MAX_EXECUTION_TIME,
             tools=self.code_parser_tools,
             llm=self.groq_llm
         )
     
     def _create_doc_writer_agent(self) -> Agent:
         """Create the Documentation Writer agent."""
-        creativity_llm = GroqLLM(
-            model_name=self.model_name,
-            temperature=self.temperature + 0.1
-        )
+        # Reuse the shared LLM and its clients with a slightly higher temperature
+        creativity_llm = self.groq_llm.with_temperature(self.temperature + 0.1)
         
         return Agent(
             role="Documentation Writer",
@@ -176,6 +479,8 @@ class DocsGeneratorCrew:
             know how to structure documentation to make it easy to navigate and reference.""",
             verbose=self.verbose,
             allow_delegation=False,
+            max_iter=_WRITER_MAX_ITER,
+            max_execution_time=_AGENT_MAX_EXECUTION_TIME,
             llm=creativity_llm
         )
     
@@ -191,85 +496,43 @@ class DocsGeneratorCrew:
             quickly understand system architecture.""",
             verbose=self.verbose,
             allow_delegation=False,
+            max_iter=_AGENT_MAX_ITER,
+            max_execution_time=_AGENT_MAX_EXECUTION_TIME,
             tools=self.diagram_tools,
             llm=self.groq_llm
         )
     
-    def _create_tasks(self) -> List[Task]:
+    def _create_tasks(self, repository_context: str = "") -> List[Task]:
         """Create the tasks for the crew."""
         planning_task = Task(
-            description="""
-            Analyze the repository structure and create a comprehensive documentation plan.
-            
-            1. Identify the main components, modules, and services
-            2. Determine important relationships between components
-            3. Prioritize which parts need detailed documentation
-            4. Create a documentation outline with sections and subsections
-            5. Specify which diagrams would be most useful
-            
-            Your output should be a structured plan that other agents can follow to
-            generate comprehensive documentation.
-            """,
+            description=repository_context + _PLANNING_TASK_DESCRIPTION,
             agent=self.planner,
             expected_output="A structured documentation plan in JSON format"
         )
         
         code_analysis_task = Task(
-            description="""
-            Analyze the code files according to the documentation plan.
-            
-            For each component identified in the plan:
-            1. Parse the code to understand its structure and functionality
-            2. Identify key classes, functions, and methods
-            3. Determine relationships with other components
-            4. Note any design patterns or architectural approaches
-            5. Extract API endpoints and parameters (if applicable)
-            
-            Your output should be a detailed analysis that the Documentation Writer
-            can use to create accurate documentation.
-            """,
+            description=_CODE_ANALYSIS_TASK_DESCRIPTION,
             agent=self.code_analyzer,
             expected_output="A detailed code analysis in JSON format",
             context=[planning_task]
         )
         
         documentation_task = Task(
-            description="""
-            Create comprehensive documentation based on the code analysis.
-            
-            Follow the documentation plan and use the code analysis to:
-            1. Write an overview of the project structure
-            2. Document each component with clear explanations
-            3. Describe key relationships between components
-            4. Provide examples of usage where appropriate
-            5. Include API references if applicable
-            
-            Format the documentation as markdown with clear sections and headers.
-            """,
+            description=_DOCUMENTATION_TASK_DESCRIPTION,
             agent=self.doc_writer,
             expected_output="Complete markdown documentation",
             context=[planning_task, code_analysis_task]
         )
         
         diagram_task = Task(
-            description="""
-            Create visual diagrams based on the code analysis and documentation plan.
-            
-            Generate the following types of diagrams as specified in the plan:
-            1. Architecture diagrams showing high-level components
-            2. Flow diagrams for key processes
-            3. Entity-relationship diagrams if there's a database
-            4. Class or component relationship diagrams
-            
-            Use the appropriate format (Mermaid or Graphviz) and ensure diagrams are
-            clear, informative, and not too cluttered.
-            """,
+            description=_DIAGRAM_TASK_DESCRIPTION,
             agent=self.diagrammer,
             expected_output="Diagram specifications in Mermaid or Graphviz format",
             context=[planning_task, code_analysis_task]
         )
         
-        return [planning_task, code_analysis_task, documentation_task, diagram_task]
+        # Documentation runs last so its output is the crew's final result
+        return [planning_task, code_analysis_task, diagram_task, documentation_task]
     
     def run(self, repository_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -286,136 +549,186 @@ class DocsGeneratorCrew:
             repository_url = repository_data.get("url", "")
             files = repository_data.get("files", [])
             
-            # Create a simplified repository context
-            repository_context = f"""
-            Repository URL: {repository_url}
-            
-            Files to document:
-            {', '.join(files)}
-            """
-            
-            # Keep tasks more focused with smaller scopes
-            simplified_tasks = self._create_simplified_tasks(repository_context)
+            # Bound the prompt size for very large selections
+            files = _select_representative_files(files)
             
-            # Try to update crew with simplified tasks if method exists
-            try:
-                self.crew.tasks = simplified_tasks
-            except (AttributeError, TypeError):
-                # Fallback: create a new crew with the simplified tasks
-                self.crew = Crew(
-                    agents=[self.planner, self.code_analyzer, self.doc_writer, self.diagrammer],
-                    tasks=simplified_tasks,
-                    verbose=self.verbose,
-                    process=Process.sequential
-                )
-            
-            # Run without signal-based timeout (which doesn't work in Streamlit threads)
-            try:
-                # We'll just use a more direct, simplified approach instead
-                result = self.crew.kickoff()
-            except Exception as exec_error:
-                # Handle execution errors
-                error_str = str(exec_error)
-                if "Agent stopped due to iteration limit" in error_str or "time limit" in error_str:
-                    # For iteration limit errors, try to extract any partial results
-                    # Look for content after the error message
-                    # This is a best-effort attempt to salvage partial results
-                    partial_content = error_str.split("Agent stopped due")[-1]
-                    if len(partial_content) > 100:  # If we have meaningful content
-                        return {
-                            "documentation": f"Agent reached its limits while processing. Here's what was generated:\n\n{partial_content}",
-                            "diagrams": "Incomplete due to agent limits.",
-                            "plan": "Incomplete due to agent limits.",
-                            "analysis": "Incomplete due to agent limits."
-                        }
-                    else:
-                        return {
-                            "documentation": f"Agent reached its limits without producing usable results. Please try with fewer files.",
-                            "diagrams": "Not generated due to agent limits.",
-                            "plan": "Not generated due to agent limits.",
-                            "analysis": "Not generated due to agent limits."
-                        }
-                else:
-                    # Re-raise for the outer exception handler
-                    raise
+            return self._run_simplified(repository_url, files)
+        except Exception as e:
+            # Fallback to direct documentation generation
+            return {
+                "documentation": f"Error generating documentation with CrewAI: {str(e)}",
+                "diagrams": "Error generating diagrams.",
+                "plan": "Error generating plan.",
+                "analysis": "Error generating analysis."
+            }
+
+    def _run_simplified(self, repository_url: str, files: List[str]) -> Dict[str, Any]:
+        """
+        Run the simplified documentation task once for the given files.
+        
+        Args:
+            repository_url: URL of the repository being documented
+            files: File paths included in the prompt
             
-            # Handle different return types from different CrewAI versions
-            if isinstance(result, str):
-                # Some versions return a string (likely the final task's output)
-                documentation = result
-                return {
-                    "documentation": documentation,
-                    "diagrams": "Diagrams not available in this CrewAI version.",
-                    "plan": "Planning details not available in this CrewAI version.",
-                    "analysis": "Code analysis not available in this CrewAI version."
-                }
-            elif isinstance(result, dict):
-                # Extract the results from newer versions that return a dictionary
-                planning_result = None
-                analysis_result = None
-                docs_result = None
-                diagram_result = None
-                
-                for task_id, task_result in result.items():
-                    if isinstance(task_result, dict):
-                        # Structure from newer versions
-                        if "planning" in task_id.lower():
-                            planning_result = task_result.get("output", "")
-                        elif "analysis" in task_id.lower() or "code" in task_id.lower():
-                            analysis_result = task_result.get("output", "")
-                        elif "documentation" in task_id.lower() or "doc" in task_id.lower():
-                            docs_result = task_result.get("output", "")
-                        elif "diagram" in task_id.lower():
-                            diagram_result = task_result.get("output", "")
-                    elif isinstance(task_result, str):
-                        # Simple string result keyed by task ID
-                        if "planning" in task_id.lower():
-                            planning_result = task_result
-                        elif "analysis" in task_id.lower() or "code" in task_id.lower():
-                            analysis_result = task_result
-                        elif "documentation" in task_id.lower() or "doc" in task_id.lower():
-                            docs_result = task_result
-                        elif "diagram" in task_id.lower():
-                            diagram_result = task_result
-                return {
-                    "documentation": docs_result or "No documentation generated.",
-                    "diagrams": diagram_result or "No diagrams generated.",
-                    "plan": planning_result or "No plan generated.",
-                    "analysis": analysis_result or "No analysis generated."
-                }
-            elif isinstance(result, list):
-                # Some versions might return a list of results in order of tasks
-                if len(result) >= 4:
+        Returns:
+            Dictionary containing generated documentation and diagrams
+        """
+        # Create a simplified repository context
+        repository_context = _format_repository_context(repository_url, files)
+        
+        if _KICKOFF_ACCEPTS_INPUTS:
+            # Install the simplified tasks once; the repository context is passed as a
+            # kickoff input so the same crew and agents are reused between runs
+            if not self._simplified_tasks_installed:
+                simplified_tasks = self._create_simplified_tasks("{repository_context}")
+                try:
+                    self.crew.tasks = simplified_tasks
+                except (AttributeError, TypeError):
+                    # Fallback: create a new crew with the simplified tasks
+                    self.crew = Crew(
+                        agents=[self.planner, self.code_analyzer, self.doc_writer, self.diagrammer],
+                        tasks=simplified_tasks,
+                        verbose=self.verbose,
+                        process=Process.sequential
+                    )
+                self._simplified_tasks_installed = True
+            kickoff_kwargs = {"inputs": {"repository_context": repository_context}}
+        else:
+            # Without kickoff inputs the context has to be written into the tasks
+            self.crew.tasks = self._create_simplified_tasks(repository_context)
+            self._simplified_tasks_installed = False
+            kickoff_kwargs = {}
+        
+        # Run without signal-based timeout (which doesn't work in Streamlit threads)
+        try:
+            result = self.crew.kickoff(**kickoff_kwargs)
+        except Exception as exec_error:
+            # Handle execution errors
+            error_str = str(exec_error)
+            if "Agent stopped due to iteration limit" in error_str or "time limit" in error_str:
+                # For iteration limit errors, try to extract any partial results
+                # Look for content after the error message
+                # This is a best-effort attempt to salvage partial results
+                partial_content = error_str.split("Agent stopped due")[-1]
+                if len(partial_content) > 100:  # If we have meaningful content
                     return {
-                        "documentation": result[2] or "No documentation generated.",  # Assuming doc writer is 3rd
-                        "diagrams": result[3] or "No diagrams generated.",  # Assuming diagrammer is 4th
-                        "plan": result[0] or "No plan generated.",  # Assuming planner is 1st
-                        "analysis": result[1] or "No analysis generated."  # Assuming analyzer is 2nd
+                        "documentation": f"Agent reached its limits while processing. Here's what was generated:\n\n{partial_content}",
+                        "diagrams": "Incomplete due to agent limits.",
+                        "plan": "Incomplete due to agent limits.",
+                        "analysis": "Incomplete due to agent limits."
                     }
                 else:
                     return {
-                        "documentation": result[-1] if result else "No documentation generated.",
-                        "diagrams": "No diagrams available in this CrewAI version.",
-                        "plan": "No plan available in this CrewAI version.",
-                        "analysis": "No analysis available in this CrewAI version."
+                        "documentation": f"Agent reached its limits without producing usable results. Please try with fewer files.",
+                        "diagrams": "Not generated due to agent limits.",
+                        "plan": "Not generated due to agent limits.",
+                        "analysis": "Not generated due to agent limits."
                     }
             else:
-                # Unknown return type, just convert to string for documentation
-                documentation = str(result)
-                return {
-                    "documentation": documentation,
-                    "diagrams": "Diagrams not available for this result type.",
-                    "plan": "Planning details not available for this result type.",
-                    "analysis": "Code analysis not available for this result type."
-                }
+                # Re-raise for the outer exception handler
+                raise
+        
+        return self._format_result(result)
+    
+    def run_full(self, repository_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the full planning, analysis, diagram and documentation pipeline.
+        
+        Args:
+            repository_data: Dictionary containing repository information and code content
+            
+        Returns:
+            Dictionary containing generated documentation and diagrams
+        """
+        try:
+            repository_context = _format_repository_context(
+                repository_data.get("url", ""),
+                repository_data.get("files", [])
+            )
+            self.crew.tasks = self._create_tasks(repository_context)
+            self._simplified_tasks_installed = False
+            result = self.crew.kickoff()
+            return self._format_result(result)
         except Exception as e:
-            # Fallback to direct documentation generation
             return {
                 "documentation": f"Error generating documentation with CrewAI: {str(e)}",
                 "diagrams": "Error generating diagrams.",
                 "plan": "Error generating plan.",
                 "analysis": "Error generating analysis."
             }
+    
+    def _format_result(self, result: Any) -> Dict[str, Any]:
+        """
+        Convert a crew result into the documentation dictionary.
+        
+        Args:
+            result: Value returned by Crew.kickoff()
+            
+        Returns:
+            Dictionary containing generated documentation and diagrams
+        """
+        outputs = _task_outputs(result)
+        return {
+            key: outputs.get(key) or placeholder
+            for key, placeholder in _MISSING_RESULT_TEXT.items()
+        }
+    
+    def run_many(self, repositories: List[Dict[str, Any]], max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Run documentation generation for several repositories concurrently.
+        
+        Args:
+            repositories: List of repository data dictionaries, as accepted by run()
+            max_workers: Maximum number of crews running at the same time
+            
+        Returns:
+            List of documentation dictionaries in the same order as repositories
+        """
+        if not repositories:
+            return []
+        
+        worker_count = max(1, min(max_workers, len(repositories)))
+        
+        # Each thread borrows its own crew; this one counts towards the pool
+        while len(self._crew_pool) < worker_count - 1:
+            self._crew_pool.append(DocsGeneratorCrew(
+                model=self.model_name,
+                temperature=self.temperature,
+                verbose=self.verbose,
+                code_parser_tools=self.code_parser_tools,
+                github_tools=self.github_tools,
+                diagram_tools=self.diagram_tools,
+            ))
+        
+        available_crews = queue.Queue()
+        for crew in [self] + self._crew_pool[:worker_count - 1]:
+            available_crews.put(crew)
+        
+        def run_with_pooled_crew(repository_data: Dict[str, Any]) -> Dict[str, Any]:
+            crew = available_crews.get()
+            try:
+                return crew.run(repository_data)
+            finally:
+                available_crews.put(crew)
+        
+        # LLM calls are network-bound, so threads overlap them; the shared rate
+        # limiter keeps the combined request rate within the API quota
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            return list(executor.map(run_with_pooled_crew, repositories))
+    
+    async def run_async(self, repository_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the documentation generation process without blocking the event loop.
+        
+        Args:
+            repository_data: Dictionary containing repository information and code content
+            
+        Returns:
+            Dictionary containing generated documentation and diagrams
+        """
+        # Same approach as Crew.kickoff_async: the crew runs in a worker thread so
+        # several runs can be awaited together while their LLM calls are in flight
+        return await asyncio.to_thread(self.run, repository_data)
 
     def _create_simplified_tasks(self, repository_context: str) -> List[Task]:
         """
@@ -429,19 +742,7 @@ class DocsGeneratorCrew:
         """
         # Documentation task only - ultra simplified to avoid timeouts
         documentation_task = Task(
-            description=f"""
-            {repository_context}
-            
-            Generate basic documentation for the provided repository files. Keep your analysis brief and focused.
-            
-            For each main file:
-            - What is its purpose?
-            - What are its key functions/classes?
-            - How does it connect to other components?
-            
-            Format as simple markdown. IMPORTANT: Keep your response brief and avoid deep analysis to prevent timeouts.
-            Focus on generating a useful overview rather than comprehensive documentation.
-            """,
+            description=_SIMPLIFIED_DOCUMENTATION_TEMPLATE.substitute(repository_context=repository_context),
             agent=self.doc_writer,
             expected_output="Basic markdown documentation focusing on the most important aspects of the codebase",
             max_iterations=3  # Limit iterations to avoid timeouts
@@ -0,0 +1,253 @@
+"""
+Rate limiting and response caching shared by every Groq call in the process.
+
+Nothing here imports CrewAI or LangChain, so these helpers can be used and
+tested on their own.
+"""
+import asyncio
+import hashlib
+import os
+import random
+import threading
+import time
+import warnings
+from collections import OrderedDict, deque
+from typing import Any, Iterator, Optional
+
+# In-memory LRU cache of Groq responses keyed by a digest of (model, temperature, prompt)
+_RESPONSE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RESPONSE_CACHE_SIZE = 256
+_response_cache_lock = threading.Lock()
+
+# High temperatures are meant to produce varied output, so they aren't replayed
+_RESPONSE_CACHE_MAX_TEMPERATURE = 0.5
+
+
+def response_cache_key(model_name: str, temperature: float, prompt: str) -> Optional[str]:
+    """
+    Build the cache key for a Groq completion.
+    
+    Args:
+        model_name: Groq model name
+        temperature: Sampling temperature of the request
+        prompt: Prompt text
+    
+    Returns:
+        Digest of the request, or None if the response should not be cached
+    """
+    if temperature > _RESPONSE_CACHE_MAX_TEMPERATURE:
+        return None
+    return hashlib.blake2b(f"{model_name}|{temperature}|{prompt}".encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return a cached response and mark it as recently used."""
+    with _response_cache_lock:
+        content = _RESPONSE_CACHE.get(key)
+        if content is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+        return content
+
+
+def store_cached_response(key: str, content: str) -> None:
+    """Store a response, evicting the least recently used entry when full."""
+    with _response_cache_lock:
+        _RESPONSE_CACHE[key] = content
+        _RESPONSE_CACHE.move_to_end(key)
+        if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+
+class RateLimiter:
+    """
+    Sliding one-minute window limiter shared by every Groq call in the process.
+    
+    Groq limits both requests and tokens per minute, so both are tracked.
+    """
+    
+    def __init__(self, max_rpm: int, max_tpm: int = 0):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            max_rpm: Maximum requests per minute (0 or less disables the limit)
+            max_tpm: Maximum tokens per minute (0 or less disables token accounting)
+        """
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self._requests = deque()
+        self._tokens = deque()
+        self._lock = threading.Lock()
+    
+    def _prune(self, now: float) -> None:
+        """Drop entries that have left the one-minute window."""
+        while self._requests and now - self._requests[0] >= 60:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= 60:
+            self._tokens.popleft()
+    
+    def reserve(self) -> float:
+        """
+        Try to reserve a request slot.
+        
+        Returns:
+            0 if a slot was reserved, otherwise the number of seconds to wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            
+            waits = []
+            if self.max_rpm > 0 and len(self._requests) >= self.max_rpm:
+                waits.append(60 - (now - self._requests[0]))
+            if self.max_tpm > 0 and self._tokens and sum(count for _, count in self._tokens) >= self.max_tpm:
+                waits.append(60 - (now - self._tokens[0][0]))
+            
+            if waits:
+                return max(max(waits), 0.01)
+            
+            if self.max_rpm > 0:
+                self._requests.append(now)
+            return 0
+    
+    def wait(self) -> None:
+        """Block until a request slot is available."""
+        delay = self.reserve()
+        while delay:
+            time.sleep(delay)
+            delay = self.reserve()
+    
+    async def async_wait(self) -> None:
+        """Wait for a request slot without blocking the event loop."""
+        delay = self.reserve()
+        while delay:
+            await asyncio.sleep(delay)
+            delay = self.reserve()
+    
+    def record_tokens(self, count: int) -> None:
+        """Account for the tokens consumed by a completed request."""
+        if self.max_tpm > 0 and count:
+            with self._lock:
+                self._tokens.append((time.monotonic(), count))
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment.
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset, empty or not an integer
+    
+    Returns:
+        Parsed integer value
+    """
+    value = os.environ.get(name, "").strip()
+    try:
+        return int(value) if value else default
+    except ValueError:
+        warnings.warn(f"Ignoring non-integer {name}={value!r}; using {default}")
+        return default
+
+
+# Shared limiter for all Groq calls, configurable for higher API tiers
+rate_limiter = RateLimiter(
+    max_rpm=env_int("GROQ_MAX_RPM", 30),
+    max_tpm=env_int("GROQ_MAX_TPM", 0),
+)
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+def rate_limit_delay(error: Exception, attempt: int) -> float:
+    """
+    Compute how long to back off after a 429 response.
+    
+    Args:
+        error: The rate limit error raised by the Groq client
+        attempt: Zero-based retry attempt
+    
+    Returns:
+        Delay in seconds, honoring the Retry-After header when present
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, 30) + random.uniform(0, 1)
+
+
+def record_usage(response: Any) -> None:
+    """Feed the token usage of a completion into the shared rate limiter."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        rate_limiter.record_tokens(getattr(usage, "total_tokens", 0) or 0)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Return whether an API error is a 429 Too Many Requests response."""
+    return getattr(error, "status_code", None) == 429
+
+
+def create_completion(client: Any, **kwargs) -> Any:
+    """
+    Create a chat completion through the shared limiter, retrying 429 responses.
+    
+    Args:
+        client: Groq client
+        **kwargs: Arguments for client.chat.completions.create
+    
+    Returns:
+        The completion, or the stream of chunks when stream=True is passed
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        rate_limiter.wait()
+        try:
+            return client.chat.completions.create(**kwargs)
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            time.sleep(rate_limit_delay(e, attempt))
+
+
+async def acreate_completion(client: Any, **kwargs) -> Any:
+    """
+    Create a chat completion without blocking the event loop, retrying 429 responses.
+    
+    Args:
+        client: Async Groq client
+        **kwargs: Arguments for client.chat.completions.create
+    
+    Returns:
+        The completion
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        await rate_limiter.async_wait()
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            await asyncio.sleep(rate_limit_delay(e, attempt))
+
+
+def stream_completion(client: Any, **kwargs) -> Iterator[str]:
+    """
+    Stream the text of a chat completion as it is generated.
+    
+    A 429 response arrives before the first chunk, so opening the stream is
+    retried like any other request.
+    
+    Args:
+        client: Groq client
+        **kwargs: Arguments for client.chat.completions.create
+    
+    Yields:
+        Non-empty pieces of the response text
+    """
+    for chunk in create_completion(client, stream=True, **kwargs):
+        text = chunk.choices[0].delta.content if chunk.choices else None
+        if text:
+            yield text
+        # Groq reports the usage of the whole request on the last chunk
+        record_usage(getattr(chunk, "x_groq", None))
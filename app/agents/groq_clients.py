@@ -0,0 +1,41 @@
+"""
+Pooled Groq clients shared by the crew, the orchestrator and their tools.
+"""
+from functools import lru_cache
+from typing import Any
+
+import groq
+import httpx
+
+# Connection pool settings for the HTTP transport under the Groq clients
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+_HTTP_TIMEOUT = 60.0
+
+
+def create_http_client(client_class: type) -> Any:
+    """
+    Create a pooled httpx client, using HTTP/2 when the h2 package is installed.
+    
+    Args:
+        client_class: httpx.Client or httpx.AsyncClient
+        
+    Returns:
+        Configured httpx client instance
+    """
+    try:
+        return client_class(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    except ImportError:
+        # HTTP/2 support needs the optional h2 dependency (httpx[http2])
+        return client_class(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+
+@lru_cache(maxsize=None)
+def get_groq_client(api_key: str) -> groq.Client:
+    """Return a shared Groq client so its connection pool outlives individual LLMs."""
+    return groq.Client(api_key=api_key, http_client=create_http_client(httpx.Client))
+
+
+@lru_cache(maxsize=None)
+def get_async_groq_client(api_key: str) -> groq.AsyncClient:
+    """Return a shared async Groq client."""
+    return groq.AsyncClient(api_key=api_key, http_client=create_http_client(httpx.AsyncClient))
@@ -3,39 +3,154 @@ Orchestrator for AI Docs Generator agent crew.
 Manages the execution of CrewAI agents to generate documentation.
 """
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from app.agents.crew_definition import DocsGeneratorCrew
+from app.agents.groq_clients import create_http_client, get_groq_client
+from app.diagrams.generator import DiagramGenerator
 from langchain.tools import Tool
 from dotenv import load_dotenv
 import groq
+import httpx
 import json
-import tempfile
+import re
+import sys
+import threading
+import asyncio
+import hashlib
+import uuid
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements
+    orjson = None
 
 # Load environment variables
 load_dotenv()
 
-# Configure Groq client
-groq_client = groq.Client(api_key=os.environ.get("GROQ_API_KEY", ""))
+# Settings read once at import rather than on every call
+_GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "")
+_DEFAULT_MODEL = os.environ.get("DEFAULT_MODEL", "llama3-70b-8192")
+
+# Configure Groq client, sharing the pooled HTTP/2 client used by the crew's LLMs
+groq_client = get_groq_client(_GROQ_API_KEY)
+
+# Generated diagrams keyed by (diagram type, format, parsed data fingerprint)
+_diagram_cache: Dict[tuple, str] = {}
+_DIAGRAM_CACHE_SIZE = 64
+
+# Repository data for in-flight runs, keyed by the handle the tools are bound to
+_STATE: Dict[str, Dict[str, Any]] = {}
+
+SEQUENCE_DIAGRAM_SYSTEM_PROMPT = "You are a technical diagram generator that creates sequence diagrams based on code components."
+
+# Largest tool result handed back to an agent, in bytes of JSON
+_MAX_TOOL_RESULT_BYTES = 256 * 1024
+
+# Body of the first Mermaid fence; an unclosed fence runs to the end of the text
+_MERMAID_FENCE_RE = re.compile(r"```mermaid(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def _dumps(value: Any, max_bytes: Optional[int] = None) -> str:
+    """
+    Serialize a tool return value to a JSON string.
+    
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        value: JSON serializable value
+        max_bytes: Optional size limit; longer output is cut off with a note
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        data = orjson.dumps(value)
+    else:
+        data = json.dumps(value).encode("utf-8")
+    
+    if max_bytes is not None and len(data) > max_bytes:
+        # Slice the bytes so only the kept prefix is decoded
+        kept = data[:max_bytes].decode("utf-8", errors="ignore")
+        return f"{kept}\n... [truncated {len(data) - max_bytes} bytes]"
+    return data.decode()
+
+
+def _bind_state(
+    handle: Optional[str],
+    func: Callable[..., str],
+    parse: Optional[Callable[[str], Any]] = None,
+) -> Callable[..., str]:
+    """
+    Bind a tool function to the data registered under a handle.
+    
+    The bound tool only receives the argument chosen by the LLM, so the
+    repository data never crosses the tool boundary.
+    
+    Args:
+        handle: Key into _STATE, or None to return the function unbound
+        func: Tool function taking (data, argument)
+        parse: Optional conversion applied to the LLM argument
+        
+    Returns:
+        Tool callable
+    """
+    if handle is None:
+        return func
+    
+    def bound(argument: str = "") -> str:
+        return func(_STATE[handle], parse(argument) if parse else argument)
+    
+    return bound
+
+
+def _parse_diagram_format(argument: str) -> str:
+    """Default an empty diagram format argument to mermaid."""
+    return (argument or "").strip() or "mermaid"
+
+
+def _parse_class_names(argument: str) -> List[str]:
+    """Split a comma separated list of class names."""
+    return [name.strip() for name in (argument or "").split(",") if name.strip()]
+
+
+# Conversions applied to the LLM argument of the tools that take structured input
+_TOOL_ARGUMENT_PARSERS = {
+    "generate_architecture_diagram": _parse_diagram_format,
+    "generate_class_diagram": _parse_class_names,
+}
+
+
+def _bind_tools(tools: Tuple[Tool, ...], handle: Optional[str]) -> List[Tool]:
+    """
+    Copy prebuilt tools with their functions bound to the data under a handle.
+    
+    The copies share everything but func with the prebuilt tools and skip the
+    validation that building a Tool runs.
+    
+    Args:
+        tools: Tools built at import with unbound functions
+        handle: Key into _STATE, or None to keep the functions unbound
+        
+    Returns:
+        Tools for one run
+    """
+    bound_tools = []
+    for tool in tools:
+        copy_tool = getattr(tool, "model_copy", None) or tool.copy
+        func = _bind_state(handle, tool.func, _TOOL_ARGUMENT_PARSERS.get(tool.name))
+        bound_tools.append(copy_tool(update={"func": func}))
+    return bound_tools
 
 
 class GithubTools:
     """Tools for GitHub repository interaction."""
     
     @staticmethod
-    def create_github_tools() -> List[Tool]:
+    def create_github_tools(handle: Optional[str] = None) -> List[Tool]:
         """Create tools for GitHub repository interaction."""
-        return [
-            Tool(
-                name="search_repository_files",
-                func=GithubTools.search_repository_files,
-                description="Search for files in a repository by name or extension",
-            ),
-            Tool(
-                name="read_repository_file",
-                func=GithubTools.read_repository_file,
-                description="Read the contents of a file in the repository",
-            ),
-        ]
+        return _bind_tools(_GITHUB_TOOLS, handle)
     
     @staticmethod
     def search_repository_files(repository_data: Dict[str, Any], query: str) -> str:
@@ -49,15 +164,52 @@ class GithubTools:
         Returns:
             List of matching files
         """
-        files = repository_data.get("files", {})
+        paths, buffer, offsets = GithubTools._ensure_path_index(repository_data)
+        lowered_query = query.lower()
         
         # Filter files based on query
-        matching_files = []
-        for file_path in files.keys():
-            if query.lower() in file_path.lower():
-                matching_files.append(file_path)
+        if not lowered_query:
+            matching_files = list(paths)
+        elif "\n" in lowered_query:
+            # Paths never contain newlines, which also keeps matches within one path
+            matching_files = []
+        else:
+            # Let str.find scan the whole buffer in C and only map hits back to paths
+            matching_files = []
+            start = buffer.find(lowered_query)
+            while start != -1:
+                index = bisect_right(offsets, start) - 1
+                matching_files.append(paths[index])
+                next_path = offsets[index + 1] if index + 1 < len(offsets) else len(buffer)
+                start = buffer.find(lowered_query, next_path)
+        
+        return _dumps(matching_files)
+    
+    @staticmethod
+    def _ensure_path_index(repository_data: Dict[str, Any]) -> Tuple[List[str], str, List[int]]:
+        """
+        Build (once) a search index over the repository file paths.
         
-        return json.dumps(matching_files)
+        Args:
+            repository_data: Repository data; the index is stored on it for reuse
+            
+        Returns:
+            Tuple of (paths, newline-joined lowercased paths, start offset of each path)
+        """
+        index = repository_data.get("_path_index")
+        if index is None:
+            paths = list(repository_data.get("files", {}))
+            lowered = [file_path.lower() for file_path in paths]
+            
+            offsets = []
+            position = 0
+            for lowered_path in lowered:
+                offsets.append(position)
+                position += len(lowered_path) + 1
+            
+            index = (paths, "\n".join(lowered), offsets)
+            repository_data["_path_index"] = index
+        return index
     
     @staticmethod
     def read_repository_file(repository_data: Dict[str, Any], file_path: str) -> str:
@@ -84,25 +236,9 @@ class CodeParserTools:
     """Tools for code parsing and analysis."""
     
     @staticmethod
-    def create_code_parser_tools() -> List[Tool]:
+    def create_code_parser_tools(handle: Optional[str] = None) -> List[Tool]:
         """Create tools for code parsing and analysis."""
-        return [
-            Tool(
-                name="get_file_info",
-                func=CodeParserTools.get_file_info,
-                description="Get information about a file in the repository",
-            ),
-            Tool(
-                name="find_dependencies",
-                func=CodeParserTools.find_dependencies,
-                description="Find dependencies for a file in the repository",
-            ),
-            Tool(
-                name="find_references",
-                func=CodeParserTools.find_references,
-                description="Find references to a class or function in the repository",
-            ),
-        ]
+        return _bind_tools(_CODE_PARSER_TOOLS, handle)
     
     @staticmethod
     def get_file_info(parsed_data: Dict[str, Any], file_path: str) -> str:
@@ -122,7 +258,7 @@ class CodeParserTools:
         if not file_info:
             return f"File not found: {file_path}"
         
-        return json.dumps(file_info)
+        return _dumps(file_info, _MAX_TOOL_RESULT_BYTES)
     
     @staticmethod
     def find_dependencies(parsed_data: Dict[str, Any], file_path: str) -> str:
@@ -139,7 +275,7 @@ class CodeParserTools:
         dependencies = parsed_data.get("dependencies", {})
         file_dependencies = dependencies.get(file_path, [])
         
-        return json.dumps(file_dependencies)
+        return _dumps(file_dependencies, _MAX_TOOL_RESULT_BYTES)
     
     @staticmethod
     def find_references(parsed_data: Dict[str, Any], symbol: str) -> str:
@@ -153,53 +289,152 @@ class CodeParserTools:
         Returns:
             References as JSON string
         """
-        parsed_files = parsed_data.get("parsed_files", {})
-        references = []
+        references = CodeParserTools._ensure_symbol_index(parsed_data).get(sys.intern(symbol), [])
+        
+        return _dumps([{"file": file_path, "type": kind} for file_path, kind in references])
+    
+    @staticmethod
+    def _ensure_symbol_index(parsed_data: Dict[str, Any]) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Build (once) a reverse index from symbol names to their references.
         
-        for file_path, file_info in parsed_files.items():
-            # Check if symbol is defined in this file
-            classes = file_info.get("classes", [])
-            functions = file_info.get("functions", [])
+        Args:
+            parsed_data: Parsed repository data; the index is stored on it for reuse
             
-            if any(cls["name"] == symbol for cls in classes) or any(func["name"] == symbol for func in functions):
-                references.append({
-                    "file": file_path,
-                    "type": "definition",
-                })
+        Returns:
+            Dictionary mapping each symbol to (file, "definition" or "import")
+            pairs, in file order
+        """
+        index = parsed_data.get("_symbol_references")
+        if index is not None:
+            return index
+        
+        # Names are interned so a symbol shared by many files is stored once and
+        # lookups with an interned query compare by identity
+        index = {}
+        for file_path, file_info in parsed_data.get("parsed_files", {}).items():
+            # Symbols defined in this file
+            defined = {sys.intern(cls["name"]) for cls in file_info.get("classes", [])}
+            defined.update(sys.intern(func["name"]) for func in file_info.get("functions", []))
+            for name in defined:
+                index.setdefault(name, []).append((file_path, "definition"))
             
-            # Check if symbol is referenced in this file
-            if symbol in file_info.get("imports", []):
-                references.append({
-                    "file": file_path,
-                    "type": "import",
-                })
+            # Symbols referenced in this file
+            for name in {sys.intern(name) for name in file_info.get("imports", [])}:
+                index.setdefault(name, []).append((file_path, "import"))
         
-        return json.dumps(references)
+        parsed_data["_symbol_references"] = index
+        return index
+
+
+class MermaidFenceTracker:
+    """
+    Accumulates a streamed LLM response and detects when its Mermaid block is closed.
+    """
+    
+    OPENING = "```mermaid"
+    CLOSING = "```"
+    
+    def __init__(self):
+        """Initialize the tracker."""
+        self.text = ""
+        self._opening = -1
+        self._closing = -1
+    
+    def feed(self, delta: Optional[str]) -> bool:
+        """
+        Add a streamed chunk of text.
+        
+        Args:
+            delta: Text of the chunk (may be None for role/stop chunks)
+            
+        Returns:
+            True once the Mermaid block has been closed
+        """
+        if not delta:
+            return False
+        
+        # Only rescan the tail that could contain a fence split across chunks
+        search_from = max(0, len(self.text) - len(self.OPENING))
+        self.text += delta
+        
+        if self._opening == -1:
+            self._opening = self.text.find(self.OPENING, search_from)
+            if self._opening == -1:
+                return False
+        
+        body_start = self._opening + len(self.OPENING)
+        self._closing = self.text.find(self.CLOSING, max(body_start, search_from))
+        return self._closing != -1
+    
+    def body(self) -> str:
+        """
+        Return the Mermaid code seen so far, using the fence positions found while feeding.
+        
+        Returns:
+            Text inside the Mermaid fence, or the whole text when no fence was opened
+        """
+        if self._opening == -1:
+            return self.text
+        body_start = self._opening + len(self.OPENING)
+        if self._closing == -1:
+            return self.text[body_start:]
+        return self.text[body_start:self._closing]
 
 
 class DiagramTools:
     """Tools for diagram generation."""
     
     @staticmethod
-    def create_diagram_tools() -> List[Tool]:
+    def create_diagram_tools(handle: Optional[str] = None) -> List[Tool]:
         """Create tools for diagram generation."""
-        return [
-            Tool(
-                name="generate_architecture_diagram",
-                func=DiagramTools.generate_architecture_diagram,
-                description="Generate an architecture diagram for the repository",
-            ),
-            Tool(
-                name="generate_class_diagram",
-                func=DiagramTools.generate_class_diagram,
-                description="Generate a class diagram for specified classes",
-            ),
-            Tool(
-                name="generate_sequence_diagram",
-                func=DiagramTools.generate_sequence_diagram,
-                description="Generate a sequence diagram for a specific flow",
-            ),
-        ]
+        return _bind_tools(_DIAGRAM_TOOLS, handle)
+    
+    @staticmethod
+    def _fingerprint(parsed_data: Dict[str, Any]) -> str:
+        """
+        Compute (once) a digest of the parsed files and dependencies.
+        
+        Args:
+            parsed_data: Parsed repository data; the digest is stored on it for reuse
+            
+        Returns:
+            Hex digest identifying the diagram inputs
+        """
+        fingerprint = parsed_data.get("_fingerprint")
+        if fingerprint is None:
+            payload = json.dumps(
+                [parsed_data.get("parsed_files", {}), parsed_data.get("dependencies", {})],
+                sort_keys=True,
+                default=str,
+            )
+            fingerprint = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+            parsed_data["_fingerprint"] = fingerprint
+        return fingerprint
+    
+    @staticmethod
+    def _cached_diagram(kind: str, parsed_data: Dict[str, Any], format: str, build) -> str:
+        """
+        Return a cached diagram, building and storing it on a miss.
+        
+        Args:
+            kind: Diagram type
+            parsed_data: Parsed repository data
+            format: Diagram format ("mermaid" or "graphviz")
+            build: Callable producing the diagram code
+            
+        Returns:
+            Diagram code
+        """
+        key = (kind, format, DiagramTools._fingerprint(parsed_data))
+        diagram = _diagram_cache.get(key)
+        if diagram is None:
+            diagram = build()
+            if len(_diagram_cache) >= _DIAGRAM_CACHE_SIZE:
+                # Evict the oldest entry
+                _diagram_cache.pop(next(iter(_diagram_cache)))
+            _diagram_cache[key] = diagram
+        return diagram
     
     @staticmethod
     def generate_architecture_diagram(parsed_data: Dict[str, Any], format: str = "mermaid") -> str:
@@ -213,9 +448,10 @@ class DiagramTools:
         Returns:
             Diagram code
         """
-        from app.diagrams.generator import DiagramGenerator
-        generator = DiagramGenerator(format=format)
-        return generator.create_architecture_diagram(parsed_data)
+        return DiagramTools._cached_diagram(
+            "architecture", parsed_data, format,
+            lambda: DiagramGenerator(format=format).create_architecture_diagram(parsed_data)
+        )
     
     @staticmethod
     def generate_class_diagram(parsed_data: Dict[str, Any], class_names: List[str], format: str = "mermaid") -> str:
@@ -230,40 +466,51 @@ class DiagramTools:
         Returns:
             Diagram code
         """
-        from app.diagrams.generator import DiagramGenerator
         # For simplicity, we currently just generate the full class diagram
         # A more sophisticated implementation would filter to the specified classes
-        generator = DiagramGenerator(format=format)
-        return generator.create_class_diagram(parsed_data)
+        return DiagramTools._cached_diagram(
+            "class", parsed_data, format,
+            lambda: DiagramGenerator(format=format).create_class_diagram(parsed_data)
+        )
     
     @staticmethod
-    def generate_sequence_diagram(parsed_data: Dict[str, Any], description: str) -> str:
+    def _component_names(parsed_data: Dict[str, Any]) -> str:
         """
-        Generate a sequence diagram for a specific flow.
+        Collect (once) the potential actors and components for sequence diagrams.
+        
+        Args:
+            parsed_data: Parsed repository data; the names are stored on it for reuse
+            
+        Returns:
+            Comma separated class names
+        """
+        components = parsed_data.get("_component_names")
+        if components is None:
+            components = [
+                cls["name"]
+                for file_info in parsed_data.get("parsed_files", {}).values()
+                for cls in file_info.get("classes", [])
+            ]
+            parsed_data["_component_names"] = components
+        return ', '.join(components[:20])
+    
+    @staticmethod
+    def _build_sequence_diagram_prompt(parsed_data: Dict[str, Any], description: str) -> str:
+        """
+        Build the LLM prompt for a sequence diagram.
         
         Args:
             parsed_data: Parsed repository data
             description: Description of the flow to diagram
             
         Returns:
-            Mermaid sequence diagram code
+            Prompt text
         """
-        # This is a placeholder that would be implemented with LLM-driven sequence diagram generation
-        actors = []
-        components = []
-        
-        # Extract potential actors and components from the repository
-        parsed_files = parsed_data.get("parsed_files", {})
-        for file_info in parsed_files.values():
-            for cls in file_info.get("classes", []):
-                components.append(cls["name"])
-        
-        # Use Groq to generate a sequence diagram based on the components and description
-        prompt = f"""
+        return f"""
         Generate a Mermaid sequence diagram for the following scenario:
         {description}
         
-        Based on the available components: {', '.join(components[:20])}
+        Based on the available components: {DiagramTools._component_names(parsed_data)}
         
         The diagram should follow this format:
         ```mermaid
@@ -276,31 +523,305 @@ class DiagramTools:
         
         Generate only the diagram code, no explanations.
         """
+    
+    @staticmethod
+    def _build_sequence_diagram_batch_prompt(parsed_data: Dict[str, Any], descriptions: List[str]) -> str:
+        """
+        Build a single LLM prompt asking for one sequence diagram per flow.
+        
+        Args:
+            parsed_data: Parsed repository data
+            descriptions: Descriptions of the flows to diagram
+            
+        Returns:
+            Prompt text
+        """
+        flows = "\n".join(
+            f"        {number}. {description}"
+            for number, description in enumerate(descriptions, 1)
+        )
+        
+        return f"""
+        Generate one Mermaid sequence diagram per flow. Output each inside a fenced block numbered [FLOW i].
+        Flows:
+{flows}
+        
+        Based on the available components: {DiagramTools._component_names(parsed_data)}
+        
+        Each diagram should follow this format:
+        [FLOW 1]
+        ```mermaid
+        sequenceDiagram
+            Actor1->>Component1: Action
+            Component1-->>Actor1: Response
+        ```
+        
+        Generate only the diagram code, no explanations.
+        """
+    
+    @staticmethod
+    def _split_sequence_diagram_batch(response_text: str, count: int) -> List[str]:
+        """
+        Split a batched LLM response into one Mermaid diagram per flow.
+        
+        Args:
+            response_text: Raw LLM response
+            count: Number of flows that were requested
+            
+        Returns:
+            Mermaid sequence diagram code, one per flow
+        """
+        # Locate each [FLOW i] marker; a missing flow gets an error placeholder
+        starts = [response_text.find(f"[FLOW {number}]") for number in range(1, count + 1)]
+        found = sorted(start for start in starts if start != -1)
+        
+        diagrams = []
+        for number, start in enumerate(starts, 1):
+            if start == -1:
+                diagrams.append(DiagramTools._sequence_diagram_error(
+                    ValueError(f"no diagram returned for flow {number}")
+                ))
+                continue
+            following = [other for other in found if other > start]
+            section = response_text[start:following[0] if following else len(response_text)]
+            diagrams.append(DiagramTools._format_sequence_diagram(section.split("]", 1)[1]))
+        return diagrams
+    
+    @staticmethod
+    def _format_sequence_diagram(diagram_code: str) -> str:
+        """
+        Extract the Mermaid code from an LLM response and wrap it in a fence.
+        
+        Args:
+            diagram_code: Raw LLM response
+            
+        Returns:
+            Mermaid sequence diagram code
+        """
+        # Extract just the mermaid code
+        match = _MERMAID_FENCE_RE.search(diagram_code)
+        if match:
+            diagram_code = match.group(1)
+        
+        return DiagramTools._wrap_sequence_diagram(diagram_code)
+    
+    @staticmethod
+    def _wrap_sequence_diagram(body: str) -> str:
+        """Wrap extracted Mermaid code in a fence."""
+        return f"```mermaid\n{body.strip()}\n```"
+    
+    @staticmethod
+    def _sequence_diagram_error(error: Exception) -> str:
+        """Return a placeholder sequence diagram describing an error."""
+        return f"```mermaid\nsequenceDiagram\n    participant User\n    participant System\n    Note over User,System: Error generating diagram: {str(error)}\n```"
+    
+    @staticmethod
+    def generate_sequence_diagram(parsed_data: Dict[str, Any], description: str) -> str:
+        """
+        Generate a sequence diagram for a specific flow.
+        
+        Args:
+            parsed_data: Parsed repository data
+            description: Description of the flow to diagram
+            
+        Returns:
+            Mermaid sequence diagram code
+        """
+        # Use Groq to generate a sequence diagram based on the components and description
+        prompt = DiagramTools._build_sequence_diagram_prompt(parsed_data, description)
         
         try:
             response = groq_client.chat.completions.create(
-                model=os.environ.get("DEFAULT_MODEL", "llama3-70b-8192"),
+                model=_DEFAULT_MODEL,
                 temperature=0.2,
                 messages=[
-                    {"role": "system", "content": "You are a technical diagram generator that creates sequence diagrams based on code components."},
+                    {"role": "system", "content": SEQUENCE_DIAGRAM_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                stream=True
+            )
+            
+            # Stop reading as soon as the diagram fence closes
+            tracker = MermaidFenceTracker()
+            for chunk in response:
+                if tracker.feed(chunk.choices[0].delta.content if chunk.choices else None):
+                    response.close()
+                    break
+            
+            return DiagramTools._wrap_sequence_diagram(tracker.body())
+        except Exception as e:
+            return DiagramTools._sequence_diagram_error(e)
+    
+    @staticmethod
+    def generate_sequence_diagrams_batch(parsed_data: Dict[str, Any], descriptions: List[str]) -> List[str]:
+        """
+        Generate several sequence diagrams with a single LLM request.
+        
+        Args:
+            parsed_data: Parsed repository data
+            descriptions: Descriptions of the flows to diagram
+            
+        Returns:
+            Mermaid sequence diagram code, one per description
+        """
+        if not descriptions:
+            return []
+        
+        prompt = DiagramTools._build_sequence_diagram_batch_prompt(parsed_data, descriptions)
+        
+        try:
+            response = groq_client.chat.completions.create(
+                model=_DEFAULT_MODEL,
+                temperature=0.2,
+                messages=[
+                    {"role": "system", "content": SEQUENCE_DIAGRAM_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ]
             )
             
-            diagram_code = response.choices[0].message.content
+            return DiagramTools._split_sequence_diagram_batch(
+                response.choices[0].message.content or "", len(descriptions)
+            )
+        except Exception as e:
+            return [DiagramTools._sequence_diagram_error(e) for _ in descriptions]
+    
+    @staticmethod
+    async def agenerate_sequence_diagram(parsed_data: Dict[str, Any], description: str, client: groq.AsyncClient) -> str:
+        """
+        Generate a sequence diagram without blocking the event loop.
+        
+        Args:
+            parsed_data: Parsed repository data
+            description: Description of the flow to diagram
+            client: Async Groq client to send the request with
+            
+        Returns:
+            Mermaid sequence diagram code
+        """
+        prompt = DiagramTools._build_sequence_diagram_prompt(parsed_data, description)
+        
+        try:
+            response = await client.chat.completions.create(
+                model=_DEFAULT_MODEL,
+                temperature=0.2,
+                messages=[
+                    {"role": "system", "content": SEQUENCE_DIAGRAM_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                stream=True
+            )
             
-            # Extract just the mermaid code
-            if "```mermaid" in diagram_code:
-                diagram_code = diagram_code.split("```mermaid")[1]
-                if "```" in diagram_code:
-                    diagram_code = diagram_code.split("```")[0]
+            # Stop reading as soon as the diagram fence closes
+            tracker = MermaidFenceTracker()
+            async for chunk in response:
+                if tracker.feed(chunk.choices[0].delta.content if chunk.choices else None):
+                    await response.close()
+                    break
             
-            return f"```mermaid\n{diagram_code.strip()}\n```"
+            return DiagramTools._wrap_sequence_diagram(tracker.body())
         except Exception as e:
-            return f"```mermaid\nsequenceDiagram\n    participant User\n    participant System\n    Note over User,System: Error generating diagram: {str(e)}\n```"
+            return DiagramTools._sequence_diagram_error(e)
+    
+    @staticmethod
+    async def agenerate_sequence_diagrams(parsed_data: Dict[str, Any], descriptions: List[str]) -> List[str]:
+        """
+        Generate several sequence diagrams concurrently.
+        
+        Args:
+            parsed_data: Parsed repository data
+            descriptions: Descriptions of the flows to diagram
+            
+        Returns:
+            Mermaid sequence diagram code, one per description
+        """
+        # The async client's connections belong to the running event loop, so it
+        # is opened and closed here rather than shared at module level; its one
+        # pooled transport still carries every diagram request of this call
+        async with groq.AsyncClient(
+            api_key=_GROQ_API_KEY,
+            http_client=create_http_client(httpx.AsyncClient),
+        ) as client:
+            return list(await asyncio.gather(*[
+                DiagramTools.agenerate_sequence_diagram(parsed_data, description, client)
+                for description in descriptions
+            ]))
+
+
+# Agent tools, built once at import with their unbound (data, argument)
+# functions; each run gets copies bound to its handle through _bind_tools
+_GITHUB_TOOLS = (
+    Tool(
+        name="search_repository_files",
+        func=GithubTools.search_repository_files,
+        description="Search for files in a repository by name or extension",
+    ),
+    Tool(
+        name="read_repository_file",
+        func=GithubTools.read_repository_file,
+        description="Read the contents of a file in the repository",
+    ),
+)
+
+_CODE_PARSER_TOOLS = (
+    Tool(
+        name="get_file_info",
+        func=CodeParserTools.get_file_info,
+        description="Get information about a file in the repository",
+    ),
+    Tool(
+        name="find_dependencies",
+        func=CodeParserTools.find_dependencies,
+        description="Find dependencies for a file in the repository",
+    ),
+    Tool(
+        name="find_references",
+        func=CodeParserTools.find_references,
+        description="Find references to a class or function in the repository",
+    ),
+)
+
+_DIAGRAM_TOOLS = (
+    Tool(
+        name="generate_architecture_diagram",
+        func=DiagramTools.generate_architecture_diagram,
+        description="Generate an architecture diagram for the repository",
+    ),
+    Tool(
+        name="generate_class_diagram",
+        func=DiagramTools.generate_class_diagram,
+        description="Generate a class diagram for a comma separated list of class names",
+    ),
+    Tool(
+        name="generate_sequence_diagram",
+        func=DiagramTools.generate_sequence_diagram,
+        description="Generate a sequence diagram for a specific flow",
+    ),
+)
+
+
+_warmup_started = threading.Event()
+
+
+def _warm_groq_connection() -> None:
+    """
+    List the available models so the pooled connection is open before real calls.
+    
+    The models endpoint isn't billed and doesn't use completion quota, so the
+    warmup stays outside the shared rate limiter.
+    """
+    try:
+        groq_client.models.list()
+    except Exception:
+        # Warmup is best effort; the real call reports any error
+        pass
 
 
-def run_documentation_generation(parsed_data: Dict[str, Any], model: str = None, temperature: float = 0.2) -> Dict[str, Any]:
+def run_documentation_generation(
+    parsed_data: Dict[str, Any],
+    model: str = None,
+    temperature: float = 0.2,
+    sequence_flows: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
     Run the documentation generation process using CrewAI.
     
@@ -308,29 +829,78 @@ def run_documentation_generation(parsed_data: Dict[str, Any], model: str = None,
         parsed_data: Parsed repository data
         model: LLM model to use
         temperature: Temperature setting for LLM responses
+        sequence_flows: Descriptions of flows to draw sequence diagrams for
         
     Returns:
         Generated documentation and diagrams
     """
     # Use specified model or default from environment
-    model = model or os.environ.get("DEFAULT_MODEL", "llama3-70b-8192")
-    
-    # Create tools
-    github_tools = GithubTools.create_github_tools()
-    code_parser_tools = CodeParserTools.create_code_parser_tools()
-    diagram_tools = DiagramTools.create_diagram_tools()
-    
-    # Create crew
-    crew = DocsGeneratorCrew(
-        model=model,
-        temperature=temperature,
-        verbose=True,
-        github_tools=github_tools,
-        code_parser_tools=code_parser_tools,
-        diagram_tools=diagram_tools,
-    )
-    
-    # Run documentation generation
-    result = crew.run(parsed_data)
-    
-    return result 
\ No newline at end of file
+    model = model or _DEFAULT_MODEL
+    
+    # Register the data once so tool calls only carry a file path or symbol
+    handle = uuid.uuid4().hex
+    _STATE[handle] = parsed_data
+    
+    # Open the Groq connection in the background while the crew is set up
+    if not _warmup_started.is_set():
+        _warmup_started.set()
+        threading.Thread(target=_warm_groq_connection, daemon=True).start()
+    
+    try:
+        # Create crew; its tools are bound to this run's handle, so they find the
+        # data from whichever thread CrewAI calls them on
+        crew = DocsGeneratorCrew(
+            model=model,
+            temperature=temperature,
+            verbose=True,
+            github_tools=GithubTools.create_github_tools(handle),
+            code_parser_tools=CodeParserTools.create_code_parser_tools(handle),
+            diagram_tools=DiagramTools.create_diagram_tools(handle),
+        )
+        
+        # Run documentation generation
+        result = crew.run(parsed_data)
+    finally:
+        _STATE.pop(handle, None)
+    
+    # Sequence diagrams are independent LLM calls, so request them concurrently
+    if sequence_flows:
+        result["sequence_diagrams"] = asyncio.run(
+            DiagramTools.agenerate_sequence_diagrams(parsed_data, sequence_flows)
+        )
+    
+    return result 
+
+
+def _run_documentation_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one job dictionary from run_documentation_generation_many."""
+    return run_documentation_generation(**job)
+
+
+def run_documentation_generation_many(
+    jobs: List[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run several documentation generation jobs in separate processes.
+    
+    Parsing, searching and diagram building hold the GIL, so independent
+    repositories are spread across worker processes rather than threads.
+    
+    Args:
+        jobs: Keyword arguments for run_documentation_generation, one dictionary
+            per job (parsed_data, and optionally model, temperature, sequence_flows)
+        max_workers: Maximum number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        Generated documentation and diagrams, in the same order as jobs
+    """
+    if not jobs:
+        return []
+    
+    if len(jobs) == 1:
+        return [_run_documentation_job(jobs[0])]
+    
+    worker_count = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        return list(executor.map(_run_documentation_job, jobs))
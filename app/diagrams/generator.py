@@ -3,9 +3,29 @@ Diagram generation for AI Docs Generator.
 Supports Mermaid and Graphviz formats.
 """
 from typing import Dict, Any, List, Optional
+import heapq
 import os
 import re
 from collections import defaultdict
+from functools import lru_cache
+
+_NON_WORD_RE = re.compile(r'[^\w]')
+
+# Maps every ASCII character outside \w to "_"
+_ASCII_ID_TABLE = str.maketrans({
+    character: '_'
+    for character in map(chr, range(128))
+    if not (character.isalnum() or character == '_')
+})
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_id(name: str) -> str:
+    """Turn a path or module name into a diagram node ID."""
+    if name.isascii():
+        return name.translate(_ASCII_ID_TABLE)
+    # Non-ASCII word characters need the Unicode-aware pattern
+    return _NON_WORD_RE.sub('_', name)
 
 
 class DiagramGenerator:
@@ -25,64 +45,231 @@ class DiagramGenerator:
         self.format = format.lower()
         self.max_elements = max_elements
         
+        # Format-independent diagram models keyed by (kind, id(parsed_data))
+        self._models: Dict[tuple, tuple] = {}
+        
         if self.format not in ["mermaid", "graphviz"]:
             raise ValueError(f"Unsupported diagram format: {format}")
     
-    def _create_architecture_diagram_mermaid(self, parsed_data: Dict[str, Any]) -> str:
+    def _cached_model(self, kind: str, parsed_data: Dict[str, Any], build) -> Any:
         """
-        Create a Mermaid architecture diagram.
+        Return a diagram model, building it once per parsed data.
         
         Args:
+            kind: Diagram type
             parsed_data: Parsed repository data
+            build: Callable producing the model from parsed_data
             
         Returns:
-            Mermaid diagram code
+            Model shared by the Mermaid and Graphviz renderers
+        """
+        key = (kind, id(parsed_data))
+        cached = self._models.get(key)
+        # The parsed data is kept alongside the model so a reused id cannot match
+        if cached is None or cached[0] is not parsed_data:
+            cached = (parsed_data, build(parsed_data))
+            self._models[key] = cached
+        return cached[1]
+    
+    def _build_file_views(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Walk the parsed files once and split out what the diagram builders read.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Dictionary of parallel lists ("paths", "dirs") of the parsed files,
+            lookups from every parsed or dependency path to its module
+            ("dir_of"), "basenames" and "ids", and the (path, item) pairs of
+            all "classes" and "endpoints" in file order
+        """
+        paths = list(parsed_data['parsed_files'])
+        classes = []
+        endpoints = []
+        for file_path, file_info in parsed_data['parsed_files'].items():
+            classes.extend((file_path, cls) for cls in file_info.get('classes', []))
+            endpoints.extend((file_path, endpoint) for endpoint in file_info.get('endpoints', []))
+        
+        # Each distinct path goes through os.path and the sanitizer exactly once
+        all_paths = dict.fromkeys(paths)
+        for source, targets in parsed_data['dependencies'].items():
+            all_paths[source] = None
+            all_paths.update(dict.fromkeys(targets))
+        dir_of = {file_path: os.path.dirname(file_path) or "root" for file_path in all_paths}
+        
+        return {
+            "paths": paths,
+            "dirs": [dir_of[file_path] for file_path in paths],
+            "dir_of": dir_of,
+            "basenames": {file_path: os.path.basename(file_path) for file_path in all_paths},
+            "ids": {file_path: _sanitize_id(file_path) for file_path in all_paths},
+            "classes": classes,
+            "endpoints": endpoints,
+        }
+    
+    def _file_views(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the file views shared by every diagram built from parsed_data."""
+        return self._cached_model("views", parsed_data, self._build_file_views)
+    
+    def _build_architecture_model(self, parsed_data: Dict[str, Any]) -> tuple:
+        """
+        Group files into modules and collect the dependencies between modules.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Tuple of (files per module, list of (source, target) module edges)
         """
         # Extract main components and their relationships
-        files = parsed_data['parsed_files']
+        views = self._file_views(parsed_data)
         dependencies = parsed_data['dependencies']
         
         # Group files by directory for modules
         modules = defaultdict(list)
-        for file_path in files:
-            directory = os.path.dirname(file_path)
-            if not directory:
-                directory = "root"
+        for file_path, directory in zip(views["paths"], views["dirs"]):
             modules[directory].append(file_path)
         
         # Filter to stay within max_elements
         if len(modules) > self.max_elements:
-            # Sort by number of files
-            sorted_modules = sorted(modules.items(), key=lambda x: len(x[1]), reverse=True)
-            # Take top modules
-            modules = dict(sorted_modules[:self.max_elements])
+            # Keep the entries with the most files, without sorting them all
+            modules = dict(heapq.nlargest(self.max_elements, modules.items(), key=lambda x: len(x[1])))
+        
+        # Unique dependencies between modules, in order of first appearance
+        dir_of = views["dir_of"]
+        module_edges = list(dict.fromkeys(
+            (dir_of[source], dir_of[target])
+            for source, targets in dependencies.items()
+            for target in targets
+            if dir_of[source] != dir_of[target]
+        ))
+        
+        return modules, module_edges
+    
+    def _build_class_model(self, parsed_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect classes with their file and parent classes.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Dictionary mapping class names to their file and parent classes
+        """
+        # Extract classes and their relationships
+        classes = {}
+        for file_path, cls in self._file_views(parsed_data)["classes"]:
+            classes[cls['name']] = {
+                'file': file_path,
+                'parent_classes': cls.get('parent_classes', []),
+            }
+        
+        # Filter to stay within max_elements
+        if len(classes) > self.max_elements:
+            # Just take the first N classes
+            classes = dict(list(classes.items())[:self.max_elements])
+        
+        return classes
+    
+    def _build_function_model(self, parsed_data: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        List the named functions of every file that defines a class.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Dictionary mapping file paths to function names
+        """
+        files = parsed_data['parsed_files']
+        classes = self._cached_model("class", parsed_data, self._build_class_model)
+        
+        return {
+            file_path: [func['name'] for func in files[file_path].get('functions', []) if func.get('name', '')]
+            for file_path in {info['file'] for info in classes.values()}
+        }
+    
+    def _build_dependency_model(self, parsed_data: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Select the files with the most dependencies.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Dictionary mapping files to the files they depend on
+        """
+        dependencies = parsed_data['dependencies']
+        
+        # Filter to most important files and dependencies
+        if len(dependencies) > self.max_elements:
+            # Keep the entries with the most dependencies, without sorting them all
+            dependencies = dict(heapq.nlargest(self.max_elements, dependencies.items(), key=lambda x: len(x[1])))
+        
+        return dependencies
+    
+    def _build_api_model(self, parsed_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Collect API endpoints grouped by file.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Dictionary mapping files to their endpoints (empty when none were found)
+        """
+        # Collect all API endpoints
+        endpoints = [
+            {
+                'file': file_path,
+                'path': endpoint['path'],
+                'methods': endpoint['methods'],
+                'type': endpoint['type'],
+            }
+            for file_path, endpoint in self._file_views(parsed_data)["endpoints"]
+        ]
+        
+        # Filter to max_elements
+        if len(endpoints) > self.max_elements:
+            endpoints = endpoints[:self.max_elements]
+        
+        # Group endpoints by file
+        endpoints_by_file = defaultdict(list)
+        for endpoint in endpoints:
+            endpoints_by_file[endpoint['file']].append(endpoint)
+        
+        return endpoints_by_file
+    
+    def _create_architecture_diagram_mermaid(self, parsed_data: Dict[str, Any]) -> str:
+        """
+        Create a Mermaid architecture diagram.
+        
+        Args:
+            parsed_data: Parsed repository data
+            
+        Returns:
+            Mermaid diagram code
+        """
+        modules, module_edges = self._cached_model(
+            "architecture", parsed_data, self._build_architecture_model
+        )
         
         # Generate diagram
-        diagram = "```mermaid\ngraph TD\n"
+        parts = ["```mermaid\ngraph TD\n"]
         
         # Add modules as nodes
         for module, files in modules.items():
-            module_id = re.sub(r'[^\w]', '_', module)
+            module_id = _sanitize_id(module)
             file_count = len(files)
-            diagram += f"    {module_id}[{module}<br/>({file_count} files)]\n"
+            parts.append(f"    {module_id}[{module}<br/>({file_count} files)]\n")
         
         # Add dependencies between modules
-        module_dependencies = defaultdict(set)
-        for source, targets in dependencies.items():
-            source_module = os.path.dirname(source) or "root"
-            for target in targets:
-                target_module = os.path.dirname(target) or "root"
-                if source_module != target_module:
-                    module_dependencies[source_module].add(target_module)
-        
-        for source, targets in module_dependencies.items():
-            source_id = re.sub(r'[^\w]', '_', source)
-            for target in targets:
-                target_id = re.sub(r'[^\w]', '_', target)
-                diagram += f"    {source_id} --> {target_id}\n"
+        for source, target in module_edges:
+            parts.append(f"    {_sanitize_id(source)} --> {_sanitize_id(target)}\n")
         
-        diagram += "```"
-        return diagram
+        parts.append("```")
+        return "".join(parts)
     
     def _create_architecture_diagram_graphviz(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -94,53 +281,29 @@ class DiagramGenerator:
         Returns:
             Graphviz diagram code
         """
-        # Extract main components and their relationships
-        files = parsed_data['parsed_files']
-        dependencies = parsed_data['dependencies']
-        
-        # Group files by directory for modules
-        modules = defaultdict(list)
-        for file_path in files:
-            directory = os.path.dirname(file_path)
-            if not directory:
-                directory = "root"
-            modules[directory].append(file_path)
-        
-        # Filter to stay within max_elements
-        if len(modules) > self.max_elements:
-            # Sort by number of files
-            sorted_modules = sorted(modules.items(), key=lambda x: len(x[1]), reverse=True)
-            # Take top modules
-            modules = dict(sorted_modules[:self.max_elements])
+        modules, module_edges = self._cached_model(
+            "architecture", parsed_data, self._build_architecture_model
+        )
         
         # Generate diagram
-        diagram = "digraph G {\n"
-        diagram += "    rankdir=TB;\n"
-        diagram += "    node [shape=box, style=filled, fillcolor=lightblue];\n"
+        parts = [
+            "digraph G {\n",
+            "    rankdir=TB;\n",
+            "    node [shape=box, style=filled, fillcolor=lightblue];\n",
+        ]
         
         # Add modules as nodes
         for module, files in modules.items():
-            module_id = re.sub(r'[^\w]', '_', module)
+            module_id = _sanitize_id(module)
             file_count = len(files)
-            diagram += f'    {module_id} [label="{module}\\n({file_count} files)"];\n'
+            parts.append(f'    {module_id} [label="{module}\\n({file_count} files)"];\n')
         
         # Add dependencies between modules
-        module_dependencies = defaultdict(set)
-        for source, targets in dependencies.items():
-            source_module = os.path.dirname(source) or "root"
-            for target in targets:
-                target_module = os.path.dirname(target) or "root"
-                if source_module != target_module:
-                    module_dependencies[source_module].add(target_module)
+        for source, target in module_edges:
+            parts.append(f"    {_sanitize_id(source)} -> {_sanitize_id(target)};\n")
         
-        for source, targets in module_dependencies.items():
-            source_id = re.sub(r'[^\w]', '_', source)
-            for target in targets:
-                target_id = re.sub(r'[^\w]', '_', target)
-                diagram += f"    {source_id} -> {target_id};\n"
-        
-        diagram += "}"
-        return diagram
+        parts.append("}")
+        return "".join(parts)
     
     def create_architecture_diagram(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -167,52 +330,29 @@ class DiagramGenerator:
         Returns:
             Mermaid diagram code
         """
-        files = parsed_data['parsed_files']
-        
-        # Extract classes and their relationships
-        classes = {}
-        for file_path, file_info in files.items():
-            file_classes = file_info.get('classes', [])
-            for cls in file_classes:
-                class_name = cls['name']
-                classes[class_name] = {
-                    'file': file_path,
-                    'parent_classes': cls.get('parent_classes', []),
-                }
-        
-        # Filter to stay within max_elements
-        if len(classes) > self.max_elements:
-            # Just take the first N classes
-            classes = dict(list(classes.items())[:self.max_elements])
-        
-        # Generate diagram
-        diagram = "```mermaid\nclassDiagram\n"
-        
-        # Add inheritance relationships
+        classes = self._cached_model("class", parsed_data, self._build_class_model)
+        functions_by_file = self._cached_model("functions", parsed_data, self._build_function_model)
+        basenames = self._file_views(parsed_data)["basenames"]
+        class_names = set(classes)
+        
+        # Relationships and class blocks are collected in one pass over the classes
+        relations = []
+        blocks = []
         for class_name, info in classes.items():
+            # Add inheritance relationships
             for parent in info.get('parent_classes', []):
-                if parent in classes:  # Only include parents that we have in our filtered set
-                    diagram += f"    {parent} <|-- {class_name}\n"
-        
-        # Add classes
-        for class_name, info in classes.items():
-            file_path = info['file']
-            diagram += f"    class {class_name} {\n"
-            
-            # Add filename
-            diagram += f"        +{os.path.basename(file_path)}\n"
-                        
-            # Add functions from file
-            file_info = files[file_path]
-            if 'functions' in file_info:
-                for func in file_info['functions']:
-                    if len(func.get('name', '')) > 0:
-                        diagram += f"        +{func['name']}()\n"
+                if parent in class_names:  # Only include parents that we have in our filtered set
+                    relations.append(f"    {parent} <|-- {class_name}\n")
             
-            diagram += "    }\n"
+            # Add the class with its filename and the functions from its file
+            file_path = info['file']
+            blocks.append(f"    class {class_name} {{\n")
+            blocks.append(f"        +{basenames[file_path]}\n")
+            blocks.extend(f"        +{name}()\n" for name in functions_by_file[file_path])
+            blocks.append("    }\n")
         
-        diagram += "```"
-        return diagram
+        # Generate diagram
+        return "".join(["```mermaid\nclassDiagram\n", *relations, *blocks, "```"])
     
     def _create_class_diagram_graphviz(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -224,57 +364,39 @@ class DiagramGenerator:
         Returns:
             Graphviz diagram code
         """
-        files = parsed_data['parsed_files']
-        
-        # Extract classes and their relationships
-        classes = {}
-        for file_path, file_info in files.items():
-            file_classes = file_info.get('classes', [])
-            for cls in file_classes:
-                class_name = cls['name']
-                classes[class_name] = {
-                    'file': file_path,
-                    'parent_classes': cls.get('parent_classes', []),
-                }
-        
-        # Filter to stay within max_elements
-        if len(classes) > self.max_elements:
-            # Just take the first N classes
-            classes = dict(list(classes.items())[:self.max_elements])
-        
-        # Generate diagram
-        diagram = "digraph G {\n"
-        diagram += "    rankdir=BT;\n"  # Bottom to top for inheritance
-        diagram += "    node [shape=record, style=filled, fillcolor=lightblue];\n"
-        
-        # Add classes
+        classes = self._cached_model("class", parsed_data, self._build_class_model)
+        functions_by_file = self._cached_model("functions", parsed_data, self._build_function_model)
+        basenames = self._file_views(parsed_data)["basenames"]
+        class_names = set(classes)
+        
+        # Class nodes and relationships are collected in one pass over the classes
+        nodes = []
+        relations = []
         for class_name, info in classes.items():
             file_path = info['file']
-            file_basename = os.path.basename(file_path)
-            
-            # Get functions for this class from the file
-            functions = []
-            file_info = files[file_path]
-            if 'functions' in file_info:
-                for func in file_info['functions']:
-                    if len(func.get('name', '')) > 0:
-                        functions.append(func['name'] + "()")
+            functions = functions_by_file[file_path]
             
             # Create the class node with HTML-like label
-            diagram += f'    {class_name} [label="{{{{ {class_name} | + {file_basename} '
+            nodes.append(f'    {class_name} [label="{{{{ {class_name} | + {basenames[file_path]} ')
             if functions:
-                diagram += ' | '
-                diagram += '\\l+ '.join(functions) + '\\l'
-            diagram += '}}}}"];\n'
-        
-        # Add inheritance relationships
-        for class_name, info in classes.items():
+                nodes.append(' | ')
+                nodes.append('()\\l+ '.join(functions) + '()\\l')
+            nodes.append('}}}}"];\n')
+            
+            # Add inheritance relationships
             for parent in info.get('parent_classes', []):
-                if parent in classes:  # Only include parents that we have in our filtered set
-                    diagram += f"    {class_name} -> {parent} [arrowhead=empty];\n"
+                if parent in class_names:  # Only include parents that we have in our filtered set
+                    relations.append(f"    {class_name} -> {parent} [arrowhead=empty];\n")
         
-        diagram += "}"
-        return diagram
+        # Generate diagram
+        return "".join([
+            "digraph G {\n",
+            "    rankdir=BT;\n",  # Bottom to top for inheritance
+            "    node [shape=record, style=filled, fillcolor=lightblue];\n",
+            *nodes,
+            *relations,
+            "}",
+        ])
     
     def create_class_diagram(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -301,36 +423,32 @@ class DiagramGenerator:
         Returns:
             Mermaid diagram code
         """
-        dependencies = parsed_data['dependencies']
-        
-        # Filter to most important files and dependencies
-        if len(dependencies) > self.max_elements:
-            # Sort by number of dependencies
-            sorted_deps = sorted(dependencies.items(), key=lambda x: len(x[1]), reverse=True)
-            # Take top files
-            dependencies = dict(sorted_deps[:self.max_elements])
+        dependencies = self._cached_model("dependency", parsed_data, self._build_dependency_model)
+        views = self._file_views(parsed_data)
+        ids = views["ids"]
+        basenames = views["basenames"]
         
         # Generate diagram
-        diagram = "```mermaid\ngraph LR\n"
+        parts = ["```mermaid\ngraph LR\n"]
         
         # Add files as nodes
         added_nodes = set()
         for source, targets in dependencies.items():
-            source_id = re.sub(r'[^\w]', '_', source)
+            source_id = ids[source]
             if source_id not in added_nodes:
-                diagram += f"    {source_id}[{os.path.basename(source)}]\n"
+                parts.append(f"    {source_id}[{basenames[source]}]\n")
                 added_nodes.add(source_id)
             
             for target in targets:
-                target_id = re.sub(r'[^\w]', '_', target)
+                target_id = ids[target]
                 if target_id not in added_nodes:
-                    diagram += f"    {target_id}[{os.path.basename(target)}]\n"
+                    parts.append(f"    {target_id}[{basenames[target]}]\n")
                     added_nodes.add(target_id)
                 
-                diagram += f"    {source_id} --> {target_id}\n"
+                parts.append(f"    {source_id} --> {target_id}\n")
         
-        diagram += "```"
-        return diagram
+        parts.append("```")
+        return "".join(parts)
     
     def _create_dependency_diagram_graphviz(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -342,38 +460,36 @@ class DiagramGenerator:
         Returns:
             Graphviz diagram code
         """
-        dependencies = parsed_data['dependencies']
-        
-        # Filter to most important files and dependencies
-        if len(dependencies) > self.max_elements:
-            # Sort by number of dependencies
-            sorted_deps = sorted(dependencies.items(), key=lambda x: len(x[1]), reverse=True)
-            # Take top files
-            dependencies = dict(sorted_deps[:self.max_elements])
+        dependencies = self._cached_model("dependency", parsed_data, self._build_dependency_model)
+        views = self._file_views(parsed_data)
+        ids = views["ids"]
+        basenames = views["basenames"]
         
         # Generate diagram
-        diagram = "digraph G {\n"
-        diagram += "    rankdir=LR;\n"
-        diagram += "    node [shape=box, style=filled, fillcolor=lightblue];\n"
+        parts = [
+            "digraph G {\n",
+            "    rankdir=LR;\n",
+            "    node [shape=box, style=filled, fillcolor=lightblue];\n",
+        ]
         
         # Add files as nodes
         added_nodes = set()
         for source, targets in dependencies.items():
-            source_id = re.sub(r'[^\w]', '_', source)
+            source_id = ids[source]
             if source_id not in added_nodes:
-                diagram += f'    {source_id} [label="{os.path.basename(source)}"];\n'
+                parts.append(f'    {source_id} [label="{basenames[source]}"];\n')
                 added_nodes.add(source_id)
             
             for target in targets:
-                target_id = re.sub(r'[^\w]', '_', target)
+                target_id = ids[target]
                 if target_id not in added_nodes:
-                    diagram += f'    {target_id} [label="{os.path.basename(target)}"];\n'
+                    parts.append(f'    {target_id} [label="{basenames[target]}"];\n')
                     added_nodes.add(target_id)
                 
-                diagram += f"    {source_id} -> {target_id};\n"
+                parts.append(f"    {source_id} -> {target_id};\n")
         
-        diagram += "}"
-        return diagram
+        parts.append("}")
+        return "".join(parts)
     
     def create_dependency_diagram(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -400,51 +516,31 @@ class DiagramGenerator:
         Returns:
             Mermaid diagram code
         """
-        # Collect all API endpoints
-        endpoints = []
-        files = parsed_data['parsed_files']
-        
-        for file_path, file_info in files.items():
-            file_endpoints = file_info.get('endpoints', [])
-            for endpoint in file_endpoints:
-                endpoints.append({
-                    'file': file_path,
-                    'path': endpoint['path'],
-                    'methods': endpoint['methods'],
-                    'type': endpoint['type'],
-                })
-        
-        # Filter to max_elements
-        if len(endpoints) > self.max_elements:
-            endpoints = endpoints[:self.max_elements]
+        endpoints_by_file = self._cached_model("api", parsed_data, self._build_api_model)
+        views = self._file_views(parsed_data)
         
-        if not endpoints:
+        if not endpoints_by_file:
             return "```mermaid\ngraph TD\n    A[No API endpoints detected]\n```"
         
         # Generate diagram
-        diagram = "```mermaid\nclassDiagram\n"
-        
-        # Group endpoints by file
-        endpoints_by_file = defaultdict(list)
-        for endpoint in endpoints:
-            endpoints_by_file[endpoint['file']].append(endpoint)
+        parts = ["```mermaid\nclassDiagram\n"]
         
         # Add classes for files
         for file_path, file_endpoints in endpoints_by_file.items():
-            file_id = re.sub(r'[^\w]', '_', file_path)
-            file_name = os.path.basename(file_path)
+            file_id = views["ids"][file_path]
+            file_name = views["basenames"][file_path]
             
-            diagram += f"    class {file_id} {{\n"
-            diagram += f"        +{file_name}\n"
+            parts.append(f"    class {file_id} {{\n")
+            parts.append(f"        +{file_name}\n")
             
             for endpoint in file_endpoints:
                 methods = ', '.join(endpoint['methods'])
-                diagram += f"        +{methods} {endpoint['path']}\n"
+                parts.append(f"        +{methods} {endpoint['path']}\n")
             
-            diagram += "    }\n"
+            parts.append("    }\n")
         
-        diagram += "```"
-        return diagram
+        parts.append("```")
+        return "".join(parts)
     
     def _create_api_diagram_graphviz(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -456,41 +552,23 @@ class DiagramGenerator:
         Returns:
             Graphviz diagram code
         """
-        # Collect all API endpoints
-        endpoints = []
-        files = parsed_data['parsed_files']
-        
-        for file_path, file_info in files.items():
-            file_endpoints = file_info.get('endpoints', [])
-            for endpoint in file_endpoints:
-                endpoints.append({
-                    'file': file_path,
-                    'path': endpoint['path'],
-                    'methods': endpoint['methods'],
-                    'type': endpoint['type'],
-                })
-        
-        # Filter to max_elements
-        if len(endpoints) > self.max_elements:
-            endpoints = endpoints[:self.max_elements]
+        endpoints_by_file = self._cached_model("api", parsed_data, self._build_api_model)
+        views = self._file_views(parsed_data)
         
-        if not endpoints:
+        if not endpoints_by_file:
             return "digraph G {\n    A [label=\"No API endpoints detected\"];\n}"
         
         # Generate diagram
-        diagram = "digraph G {\n"
-        diagram += "    rankdir=TB;\n"
-        diagram += "    node [shape=record, style=filled, fillcolor=lightblue];\n"
-        
-        # Group endpoints by file
-        endpoints_by_file = defaultdict(list)
-        for endpoint in endpoints:
-            endpoints_by_file[endpoint['file']].append(endpoint)
+        parts = [
+            "digraph G {\n",
+            "    rankdir=TB;\n",
+            "    node [shape=record, style=filled, fillcolor=lightblue];\n",
+        ]
         
         # Add nodes for files
         for file_path, file_endpoints in endpoints_by_file.items():
-            file_id = re.sub(r'[^\w]', '_', file_path)
-            file_name = os.path.basename(file_path)
+            file_id = views["ids"][file_path]
+            file_name = views["basenames"][file_path]
             
             # Create the label with endpoints
             label = f"{file_name}|"
@@ -501,7 +579,7 @@ class DiagramGenerator:
             
             label += "\\l".join(endpoint_labels) + "\\l"
             
-            diagram += f'    {file_id} [label="{{ {label} }}"];\n'
+            parts.append(f'    {file_id} [label="{{ {label} }}"];\n')
         
         # Add relationships based on framework type
         framework_groups = defaultdict(list)
@@ -512,12 +590,12 @@ class DiagramGenerator:
         for framework, files in framework_groups.items():
             if len(files) > 1:
                 for i in range(len(files) - 1):
-                    source_id = re.sub(r'[^\w]', '_', files[i])
-                    target_id = re.sub(r'[^\w]', '_', files[i + 1])
-                    diagram += f"    {source_id} -> {target_id} [style=dashed, label=\"{framework}\"];\n"
+                    source_id = views["ids"][files[i]]
+                    target_id = views["ids"][files[i + 1]]
+                    parts.append(f"    {source_id} -> {target_id} [style=dashed, label=\"{framework}\"];\n")
         
-        diagram += "}"
-        return diagram
+        parts.append("}")
+        return "".join(parts)
     
     def create_api_diagram(self, parsed_data: Dict[str, Any]) -> str:
         """
@@ -542,14 +620,18 @@ class DiagramGenerator:
             parsed_data: Parsed repository data
             
         Returns:
-            Dictionary mapping diagram types to diagram code
+            Dictionary mapping diagram types to diagram code; the class and API
+            diagrams are left out when the repository has no classes or endpoints
         """
-        return {
-            "architecture": self.create_architecture_diagram(parsed_data),
-            "class": self.create_class_diagram(parsed_data),
-            "dependency": self.create_dependency_diagram(parsed_data),
-            "api": self.create_api_diagram(parsed_data),
-        }
+        views = self._file_views(parsed_data)
+        
+        diagrams = {"architecture": self.create_architecture_diagram(parsed_data)}
+        if views["classes"]:
+            diagrams["class"] = self.create_class_diagram(parsed_data)
+        diagrams["dependency"] = self.create_dependency_diagram(parsed_data)
+        if views["endpoints"]:
+            diagrams["api"] = self.create_api_diagram(parsed_data)
+        return diagrams
 
 
 def generate_diagrams(parsed_data: Dict[str, Any], format: str = "mermaid", max_elements: int = 100) -> Dict[str, str]:
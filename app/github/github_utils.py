@@ -4,9 +4,60 @@ GitHub repository fetcher utility.
 import streamlit as st
 import requests
 import os
-import base64
-from typing import Dict, List, Any
-from urllib.parse import urlparse
+import json
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import quote, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Directory listings fetched at the same time while walking a repository
+_MAX_FETCH_WORKERS = 16
+
+# Connections kept open to the GitHub hosts
+_POOL_SIZE = 32
+
+# Seconds to wait for a GitHub connection, and then for each read from it
+_REQUEST_TIMEOUT = (10, 30)
+
+# Response bodies by (token, URL, raw) with their ETag, revalidated with If-None-Match;
+# GitHub does not count 304 Not Modified replies against the rate limit. Bodies are
+# kept as bytes so every caller decodes its own copy and can't alter the cache.
+# Raw file bodies can be large, so the cache is bounded by their total size
+_ETAG_CACHE: "OrderedDict[Tuple[str, str, bool], Tuple[str, bytes]]" = OrderedDict()
+_ETAG_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_etag_cache_bytes = 0
+_etag_cache_lock = threading.Lock()
+
+
+def _store_etag_response(key: Tuple[str, str, bool], etag: str, body: bytes) -> None:
+    """
+    Cache a response body under its ETag, evicting the least recently used bodies.
+    
+    Args:
+        key: (token, URL, raw) the body was requested with
+        etag: ETag header of the response
+        body: Response body
+    """
+    global _etag_cache_bytes
+    
+    with _etag_cache_lock:
+        previous = _ETAG_CACHE.pop(key, None)
+        if previous:
+            _etag_cache_bytes -= len(previous[1])
+        
+        # A body larger than the whole cache would only evict everything else
+        if len(body) > _ETAG_CACHE_MAX_BYTES:
+            return
+        
+        _ETAG_CACHE[key] = (etag, body)
+        _etag_cache_bytes += len(body)
+        while _etag_cache_bytes > _ETAG_CACHE_MAX_BYTES:
+            _, (_, evicted) = _ETAG_CACHE.popitem(last=False)
+            _etag_cache_bytes -= len(evicted)
+
 
 class GithubRepositoryFetcher:
     """
@@ -19,6 +70,55 @@ class GithubRepositoryFetcher:
         self.headers = {}
         if self.github_token:
             self.headers = {"Authorization": f"token {self.github_token}"}
+        
+        # One keep-alive session so connections to the API are reused across requests
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/vnd.github+json", **self.headers})
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=_POOL_SIZE,
+            pool_maxsize=_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        ))
+    
+    def _cached_get(self, api_url: str, error_message: str, raw: bool = False) -> Any:
+        """
+        GET a GitHub API URL, reusing the cached body when it has not changed.
+        
+        Args:
+            api_url: URL to request
+            error_message: Prefix of the exception raised for error responses
+            raw: Request the raw file body instead of the JSON representation
+            
+        Returns:
+            Newly parsed JSON response, or the response bytes when raw is set
+        """
+        key = (self.github_token, api_url, raw)
+        with _etag_cache_lock:
+            cached = _ETAG_CACHE.get(key)
+        
+        headers = {"Accept": "application/vnd.github.raw"} if raw else {}
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        response = self.session.get(api_url, headers=headers or None, timeout=_REQUEST_TIMEOUT)
+        
+        if response.status_code == 304 and cached:
+            with _etag_cache_lock:
+                if key in _ETAG_CACHE:
+                    _ETAG_CACHE.move_to_end(key)
+            return cached[1] if raw else json.loads(cached[1])
+        
+        if response.status_code != 200:
+            raise Exception(f"{error_message}: {response.status_code} - {response.text}")
+        
+        # Directories are still described in JSON when the raw body is requested
+        if raw and "json" in response.headers.get("Content-Type", ""):
+            raise Exception(f"{error_message}: path does not point to a file")
+        
+        body = response.content
+        etag = response.headers.get("ETag")
+        if etag:
+            _store_etag_response(key, etag, body)
+        return body if raw else json.loads(body)
     
     def parse_github_url(self, url: str) -> Dict[str, str]:
         """
@@ -56,12 +156,7 @@ class GithubRepositoryFetcher:
         repo = repo_info["repo"]
         
         api_url = f"https://api.github.com/repos/{owner}/{repo}"
-        response = requests.get(api_url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to fetch repository: {response.status_code} - {response.text}")
-        
-        repo_data = response.json()
+        repo_data = self._cached_get(api_url, "Failed to fetch repository")
         
         return {
             "name": repo_data["name"],
@@ -91,12 +186,7 @@ class GithubRepositoryFetcher:
         repo = repo_info["repo"]
         
         api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-        response = requests.get(api_url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to fetch repository contents: {response.status_code} - {response.text}")
-        
-        contents = response.json()
+        contents = self._cached_get(api_url, "Failed to fetch repository contents")
         
         if not isinstance(contents, list):
             # Handle single file response
@@ -104,38 +194,36 @@ class GithubRepositoryFetcher:
         
         return contents
     
-    def fetch_file_content(self, repo_info: Dict[str, str], path: str) -> str:
+    def fetch_file_bytes(self, repo_info: Dict[str, str], path: str) -> bytes:
         """
-        Fetch file content from GitHub API.
+        Fetch the raw bytes of a file from GitHub API.
         
         Args:
             repo_info: Dictionary containing owner and repo name
             path: Path to the file within the repository
             
         Returns:
-            File content
+            File content as bytes
         """
         owner = repo_info["owner"]
         repo = repo_info["repo"]
         
+        # The raw media type returns the file body itself, without JSON or base64
         api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
-        response = requests.get(api_url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise Exception(f"Failed to fetch file content: {response.status_code} - {response.text}")
-        
-        file_data = response.json()
-        
-        if file_data.get("type") != "file":
-            raise Exception(f"Path does not point to a file: {path}")
-        
-        content = file_data.get("content", "")
-        encoding = file_data.get("encoding", "base64")
-        
-        if encoding == "base64":
-            content = base64.b64decode(content).decode("utf-8")
+        return self._cached_get(api_url, "Failed to fetch file content", raw=True)
+    
+    def fetch_file_content(self, repo_info: Dict[str, str], path: str) -> str:
+        """
+        Fetch file content from GitHub API.
         
-        return content
+        Args:
+            repo_info: Dictionary containing owner and repo name
+            path: Path to the file within the repository
+            
+        Returns:
+            File content
+        """
+        return self.fetch_file_bytes(repo_info, path).decode("utf-8", errors="replace")
     
     def fetch_repository(self, url: str) -> List[Dict[str, Any]]:
         """
@@ -168,6 +256,43 @@ class GithubRepositoryFetcher:
             st.error(f"Error fetching repository: {str(e)}")
             return []
     
+    def fetch_repository_tree(self, repo_info: Dict[str, str], ref: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch every file in a repository with a single Git Trees API call.
+        
+        Args:
+            repo_info: Dictionary containing owner and repo name
+            ref: Branch, tag or commit to list (defaults to the default branch)
+            
+        Returns:
+            List of file information dictionaries, or None if GitHub truncated the tree
+        """
+        owner = repo_info["owner"]
+        repo = repo_info["repo"]
+        
+        if ref is None:
+            ref = repo_info.get("default_branch") or self.fetch_repository_metadata(repo_info)["default_branch"]
+        
+        api_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{quote(ref, safe='')}?recursive=1"
+        tree_data = self._cached_get(api_url, "Failed to fetch repository tree")
+        
+        if tree_data.get("truncated"):
+            return None
+        
+        return [
+            {
+                "name": item["path"].rsplit("/", 1)[-1],
+                "path": item["path"],
+                "size": item.get("size", 0),
+                "sha": item["sha"],
+                "type": "file",
+                "download_url": f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{quote(item['path'])}",
+                "repo_info": repo_info
+            }
+            for item in tree_data.get("tree", [])
+            if item["type"] == "blob"
+        ]
+    
     def get_file_contents_recursive(self, repo_info: Dict[str, str], path: str = "") -> List[Dict[str, Any]]:
         """
         Recursively fetch all files in a repository.
@@ -176,23 +301,67 @@ class GithubRepositoryFetcher:
             repo_info: Dictionary containing owner and repo name
             path: Path within the repository to start fetching from
             
+        Returns:
+            List of file information dictionaries
+        """
+        # The whole tree usually comes back in one request
+        files = self.fetch_repository_tree(repo_info)
+        if files is not None:
+            if not path:
+                return files
+            prefix = path.rstrip("/") + "/"
+            return [file for file in files if file["path"].startswith(prefix)]
+        
+        # Very large trees are truncated by GitHub; walk the directories instead
+        listings = {path: self.fetch_repository_contents(repo_info, path)}
+        
+        # Each listing is one API round-trip, so fetch subdirectories in parallel
+        with ThreadPoolExecutor(max_workers=_MAX_FETCH_WORKERS) as executor:
+            futures = {
+                executor.submit(self.fetch_repository_contents, repo_info, item["path"]): item["path"]
+                for item in listings[path] if item["type"] == "dir"
+            }
+            while futures:
+                future = next(as_completed(futures))
+                dir_path = futures.pop(future)
+                listings[dir_path] = future.result()
+                for item in listings[dir_path]:
+                    if item["type"] == "dir":
+                        futures[executor.submit(self.fetch_repository_contents, repo_info, item["path"])] = item["path"]
+        
+        return self._collect_files(repo_info, listings, path)
+    
+    def _collect_files(self, repo_info: Dict[str, str], listings: Dict[str, List[Dict[str, Any]]], path: str) -> List[Dict[str, Any]]:
+        """
+        Flatten fetched directory listings into files, in depth-first order.
+        
+        Args:
+            repo_info: Dictionary containing owner and repo name
+            listings: Directory contents keyed by directory path
+            path: Directory to start from
+            
         Returns:
             List of file information dictionaries
         """
         all_files = []
-        contents = self.fetch_repository_contents(repo_info, path)
         
-        for item in contents:
-            if item["type"] == "file":
+        # Explicit stack of listing iterators, so deep trees cannot hit the recursion limit
+        stack = deque([iter(listings[path])])
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif item["type"] == "file":
                 all_files.append({
                     "name": item["name"],
                     "path": item["path"],
                     "size": item["size"],
+                    "sha": item["sha"],
                     "type": "file",
                     "download_url": item["download_url"],
                     "repo_info": repo_info
                 })
             elif item["type"] == "dir":
-                all_files.extend(self.get_file_contents_recursive(repo_info, item["path"]))
+                stack.append(iter(listings[item["path"]]))
         
         return all_files 
\ No newline at end of file
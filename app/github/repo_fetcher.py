@@ -1,13 +1,223 @@
 """
 GitHub repository fetcher for AI Docs Generator.
 """
+import asyncio
 import os
+import shutil
+import subprocess
+import tarfile
 import tempfile
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 import re
-import git
+import httpx
+import requests
 from github import Github, Repository, GithubException
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# github.com/owner/repo[.git][/...] and the SSH form github.com:owner/repo.git
+_GITHUB_URL_RE = re.compile(r"github\.com[/:]([^/]+)/([^/?#]+?)(?:\.git)?(?:[/?#].*)?$")
+
+# Repository metadata by (token, "owner/repo"), as (fetch time, metadata)
+_METADATA_CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+_METADATA_CACHE_TTL = 900  # seconds
+_metadata_cache_lock = threading.Lock()
+
+# GraphQL v4 requests only the fields kept in the metadata, and aliases let
+# one query cover several repositories
+_GRAPHQL_URL = "https://api.github.com/graphql"
+_GRAPHQL_REPOSITORY_FIELDS = (
+    "fragment Metadata on Repository { name nameWithOwner description url "
+    "defaultBranchRef { name } stargazerCount forkCount primaryLanguage { name } diskUsage }"
+)
+
+# Files that are never read: assets by extension, and anything over the size cap
+_BINARY_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".pdf",
+    ".zip", ".tar", ".gz", ".whl", ".so", ".dylib", ".dll", ".exe",
+    ".woff", ".woff2", ".ttf", ".mp4", ".webm", ".mp3",
+})
+_MAX_READ_BYTES = 1024 * 1024
+_BINARY_PLACEHOLDER = "[Binary file not shown]"
+
+# Bytes found in text files; like file(1), a sample with more than 30% other
+# bytes is treated as binary
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+_TEXT_SAMPLE_BYTES = 4096
+
+
+@lru_cache(maxsize=None)
+def _get_github_client(token: str) -> Github:
+    """
+    Return a shared PyGithub client so its connection pool outlives fetchers.
+    
+    Retries back off on secondary rate limits (429) and transient 5xx errors.
+    
+    Args:
+        token: GitHub API token, or "" for anonymous access
+        
+    Returns:
+        Github client for the token
+    """
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+    return Github(token or None, retry=retry, per_page=100, pool_size=20)
+
+
+@lru_cache(maxsize=None)
+def _get_graphql_client() -> httpx.Client:
+    """Return a shared httpx client for GraphQL, using HTTP/2 when h2 is installed."""
+    try:
+        return httpx.Client(http2=True, timeout=30.0)
+    except ImportError:
+        # HTTP/2 support needs the optional h2 dependency (httpx[http2])
+        return httpx.Client(timeout=30.0)
+
+
+@lru_cache(maxsize=None)
+def _get_download_session() -> requests.Session:
+    """Return a shared keep-alive session for archive downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def _has_glob(pattern: str) -> bool:
+    """Check whether a pattern contains glob wildcards."""
+    return any(character in pattern for character in "*?[")
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate a glob pattern into a regular expression with Path.match semantics.
+    
+    Wildcards do not cross "/", and the caller anchors the result at the end of
+    the path so that relative patterns match the trailing path components.
+    
+    Args:
+        pattern: Glob pattern
+        
+    Returns:
+        Regular expression source
+    """
+    parts = []
+    index, length = 0, len(pattern)
+    while index < length:
+        character = pattern[index]
+        index += 1
+        if character == "*":
+            parts.append("[^/]*")
+        elif character == "?":
+            parts.append("[^/]")
+        elif character == "[":
+            # Character class; a leading "!" negates it and a "]" right after
+            # the opening bracket is literal, as in fnmatch
+            start = index + 1 if pattern[index:index + 1] == "!" else index
+            start += 1 if pattern[start:start + 1] == "]" else 0
+            end = pattern.find("]", start)
+            if end == -1:
+                parts.append(re.escape(character))
+                continue
+            body = pattern[index:end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            parts.append(f"[{body}]")
+            index = end + 1
+        else:
+            parts.append(re.escape(character))
+    return "".join(parts)
+
+
+def _looks_text(data: bytes) -> bool:
+    """Check whether the start of a file looks like text rather than binary data."""
+    sample = data[:_TEXT_SAMPLE_BYTES]
+    if not sample:
+        return True
+    if b"\0" in sample:
+        return False
+    return len(sample.translate(None, _TEXT_BYTES)) <= len(sample) * 0.3
+
+
+class LazyFileTree(Mapping):
+    """
+    Mapping of repository paths to file entries whose content is read on access.
+    
+    Until a file is accessed only its path, size on disk and extension are held
+    in memory, so enumerating paths costs no reads at all. Each file is read at
+    most once; later lookups return the same entry.
+    """
+    
+    def __init__(self, fetcher: "RepoFetcher", repo_path: str, entries: Dict[str, Tuple[int, str]]):
+        """
+        Initialize the file tree.
+        
+        Args:
+            fetcher: Fetcher used to read files
+            repo_path: Path to the cloned repository
+            entries: Mapping of file path to (size on disk, extension)
+        """
+        self._fetcher = fetcher
+        self._repo_path = repo_path
+        self._entries = entries
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+    
+    def __getitem__(self, file_path: str) -> Dict[str, Any]:
+        entry = self._loaded.get(file_path)
+        if entry is None:
+            size_on_disk, extension = self._entries[file_path]
+            content = self._fetcher.read_file(self._repo_path, file_path, size=size_on_disk)
+            entry = self._loaded[file_path] = {
+                "path": file_path,
+                "content": content,
+                "size": len(content),
+                "extension": extension,
+            }
+        return entry
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._entries
+    
+    def size_on_disk(self, file_path: str) -> int:
+        """Get the size of a file in bytes without reading it."""
+        return self._entries[file_path][0]
+    
+    def materialize(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read every file into a plain dictionary.
+        
+        Returns:
+            Dictionary of file path to file entry, including content
+        """
+        # Reads block on disk I/O, so overlap them in a thread pool
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_tree = dict(zip(self._entries, executor.map(self.__getitem__, self._entries)))
+        
+        # Identical files (licenses, vendored copies, generated code) share one
+        # string instead of holding a copy each
+        content_pool: Dict[str, str] = {}
+        for entry in file_tree.values():
+            entry["content"] = content_pool.setdefault(entry["content"], entry["content"])
+        
+        return file_tree
 
 
 class RepoFetcher:
@@ -23,7 +233,7 @@ class RepoFetcher:
             github_token: GitHub API token (optional but recommended for higher rate limits)
         """
         self.github_token = github_token or os.environ.get("GITHUB_TOKEN", "")
-        self.github = Github(self.github_token) if self.github_token else Github()
+        self.github = _get_github_client(self.github_token)
         self.clone_path = None
     
     def _parse_github_url(self, url: str) -> Tuple[str, str]:
@@ -39,21 +249,11 @@ class RepoFetcher:
         Raises:
             ValueError: If URL is not a valid GitHub repository URL
         """
-        # Handle multiple URL formats
-        patterns = [
-            r"github\.com/([^/]+)/([^/]+)/?.*",  # github.com/owner/repo
-            r"github\.com:([^/]+)/([^/]+)\.git",  # github.com:owner/repo.git (SSH)
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                owner, repo_name = match.groups()
-                # Remove .git suffix if present
-                repo_name = repo_name.replace(".git", "")
-                return owner, repo_name
+        match = _GITHUB_URL_RE.search(url)
+        if not match:
+            raise ValueError(f"Invalid GitHub URL: {url}")
         
-        raise ValueError(f"Invalid GitHub URL: {url}")
+        return match.group(1), match.group(2)
     
     def fetch_repository_metadata(self, url: str) -> Dict[str, Any]:
         """
@@ -68,9 +268,128 @@ class RepoFetcher:
         Raises:
             ValueError: If repository cannot be found or accessed
         """
+        return self.fetch_repositories_metadata([url])[0]
+    
+    def fetch_repositories_metadata(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch metadata for several repositories, in one request where possible.
+        
+        With a token, every repository missing from the cache is fetched by a
+        single GraphQL query; GitHub's GraphQL API needs authentication, so
+        without one each repository is fetched through the REST API.
+        
+        Args:
+            urls: GitHub repository URLs
+            
+        Returns:
+            List of metadata dictionaries, in the order of urls
+            
+        Raises:
+            ValueError: If a repository cannot be found or accessed
+        """
+        keys = [(self.github_token, "/".join(self._parse_github_url(url))) for url in urls]
+        
+        results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        now = time.monotonic()
+        with _metadata_cache_lock:
+            for key in keys:
+                cached = _METADATA_CACHE.get(key)
+                if cached and now - cached[0] < _METADATA_CACHE_TTL:
+                    results[key] = cached[1]
+        
+        missing = list(dict.fromkeys(key for key in keys if key not in results))
+        if missing:
+            names = [key[1] for key in missing]
+            if self.github_token:
+                fetched = self._query_repositories_metadata(names)
+            else:
+                fetched = [self._get_repository_metadata(name) for name in names]
+            
+            with _metadata_cache_lock:
+                # Drop expired entries so the cache only holds recently used repositories
+                now = time.monotonic()
+                for stale_key in [k for k, (fetched_at, _) in _METADATA_CACHE.items() if now - fetched_at >= _METADATA_CACHE_TTL]:
+                    del _METADATA_CACHE[stale_key]
+                for key, metadata in zip(missing, fetched):
+                    _METADATA_CACHE[key] = (now, metadata)
+                    results[key] = metadata
+        
+        return [dict(results[key]) for key in keys]
+    
+    def _query_repositories_metadata(self, names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch metadata for repositories with one GraphQL query.
+        
+        Args:
+            names: Repository names as "owner/repo"
+            
+        Returns:
+            List of metadata dictionaries, in the order of names
+            
+        Raises:
+            ValueError: If a repository cannot be found or accessed
+        """
+        variables = {}
+        parameters = []
+        selections = []
+        for index, name in enumerate(names):
+            variables[f"o{index}"], variables[f"n{index}"] = name.split("/", 1)
+            parameters.append(f"$o{index}: String!, $n{index}: String!")
+            selections.append(f"r{index}: repository(owner: $o{index}, name: $n{index}) {{ ...Metadata }}")
+        query = f"query({', '.join(parameters)}) {{ {' '.join(selections)} }} {_GRAPHQL_REPOSITORY_FIELDS}"
+        
+        try:
+            response = _get_graphql_client().post(
+                _GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                headers={"Authorization": f"bearer {self.github_token}"},
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise ValueError(f"Error fetching repository: {e}")
+        
+        data = payload.get("data") or {}
+        metadata_list = []
+        for index, name in enumerate(names):
+            repo = data.get(f"r{index}")
+            if repo is None:
+                errors = "; ".join(error.get("message", "") for error in payload.get("errors", []))
+                raise ValueError(f"Error fetching repository: {errors or name + ' not found'}")
+            
+            owner, repo_name = name.split("/", 1)
+            metadata_list.append({
+                "name": repo["name"],
+                "full_name": repo["nameWithOwner"],
+                "description": repo["description"],
+                "url": repo["url"],
+                "default_branch": (repo["defaultBranchRef"] or {}).get("name"),
+                "stars": repo["stargazerCount"],
+                "forks": repo["forkCount"],
+                "language": (repo["primaryLanguage"] or {}).get("name"),
+                "owner": owner,
+                "repo_name": repo_name,
+                "size_kb": repo["diskUsage"],
+            })
+        
+        return metadata_list
+    
+    def _get_repository_metadata(self, name: str) -> Dict[str, Any]:
+        """
+        Fetch metadata for one repository through the REST API.
+        
+        Args:
+            name: Repository name as "owner/repo"
+            
+        Returns:
+            Dictionary containing repository metadata
+            
+        Raises:
+            ValueError: If repository cannot be found or accessed
+        """
+        owner, repo_name = name.split("/", 1)
         try:
-            owner, repo_name = self._parse_github_url(url)
-            repo = self.github.get_repo(f"{owner}/{repo_name}")
+            repo = self.github.get_repo(name)
             
             return {
                 "name": repo.name,
@@ -88,10 +407,54 @@ class RepoFetcher:
         except GithubException as e:
             raise ValueError(f"Error fetching repository: {e}")
     
+    def download_tarball(self, url: str, branch: Optional[str], path: str) -> None:
+        """
+        Download a repository snapshot from codeload and extract it as it arrives.
+        
+        Only regular files are written; links and anything resolving outside
+        path are skipped.
+        
+        Args:
+            url: GitHub repository URL
+            branch: Branch to download (defaults to the default branch)
+            path: Empty directory to extract into
+            
+        Raises:
+            ValueError: If the snapshot cannot be downloaded
+        """
+        owner, repo_name = self._parse_github_url(url)
+        archive_url = f"https://codeload.github.com/{owner}/{repo_name}/tar.gz/{branch or 'HEAD'}"
+        headers = {"Authorization": f"token {self.github_token}"} if self.github_token else {}
+        root = os.path.realpath(path)
+        
+        try:
+            with _get_download_session().get(archive_url, headers=headers, stream=True, timeout=(10, 60)) as response:
+                if response.status_code != 200:
+                    raise ValueError(f"Failed to download repository archive: {response.status_code}")
+                
+                with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                    for member in archive:
+                        if not member.isfile() or "/" not in member.name:
+                            continue
+                        
+                        # Members are nested under a single "{repo}-{ref}/" directory
+                        target = os.path.realpath(os.path.join(root, member.name.split("/", 1)[1]))
+                        if not target.startswith(root + os.sep):
+                            continue
+                        
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        with archive.extractfile(member) as source, open(target, "wb") as destination:
+                            shutil.copyfileobj(source, destination)
+        except (requests.RequestException, tarfile.TarError, OSError) as e:
+            raise ValueError(f"Failed to download repository archive: {e}")
+    
     def clone_repository(self, url: str, branch: Optional[str] = None) -> str:
         """
         Clone a GitHub repository to a temporary directory.
         
+        The files are fetched as a single tarball when possible; git is only
+        run if the download fails, e.g. for private repositories it cannot reach.
+        
         Args:
             url: GitHub repository URL
             branch: Branch to clone (defaults to the default branch)
@@ -106,19 +469,33 @@ class RepoFetcher:
             # Create a temporary directory
             self.clone_path = tempfile.mkdtemp(prefix="ai_docs_generator_")
             
-            # Get metadata to determine default branch if needed
-            metadata = self.fetch_repository_metadata(url)
-            branch = branch or metadata["default_branch"]
+            try:
+                self.download_tarball(url, branch, self.clone_path)
+                return self.clone_path
+            except ValueError:
+                # git needs an empty directory, so drop any partial extraction
+                shutil.rmtree(self.clone_path, ignore_errors=True)
+                self.clone_path = tempfile.mkdtemp(prefix="ai_docs_generator_")
+            
+            # Shallow, single-branch clone without tags or history; blobs are
+            # only fetched for the checked out tree. Without a branch git uses
+            # the remote HEAD, so no API call is needed to find the default
+            command = ["git", "clone", "--depth=1", "--single-branch", "--no-tags", "--filter=blob:none"]
+            if branch:
+                command += ["--branch", branch]
+            command += [url, self.clone_path]
             
-            # Clone the repository
-            git.Repo.clone_from(
-                url,
-                self.clone_path,
-                branch=branch,
-                depth=1  # Shallow clone for faster download
+            subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                text=True,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
             )
             
             return self.clone_path
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Error cloning repository: {e.stderr.strip() or e}")
         except Exception as e:
             raise ValueError(f"Error cloning repository: {e}")
     
@@ -133,91 +510,151 @@ class RepoFetcher:
         Returns:
             List of file paths relative to repo_path
         """
+        return [file_path for file_path, _ in self._scan_files(repo_path, ignore_patterns)]
+    
+    def _scan_files(self, repo_path: str, ignore_patterns: Optional[List[str]] = None) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        Walk the repository, yielding files that are not ignored.
+        
+        Args:
+            repo_path: Path to the cloned repository
+            ignore_patterns: List of glob patterns to ignore
+            
+        Returns:
+            Iterator of (path relative to repo_path, directory entry)
+        """
         ignore_patterns = ignore_patterns or [
             ".git/*", "node_modules/*", "__pycache__/*", "*.pyc",
             "*.log", "*.lock", ".DS_Store", "venv/*", "env/*",
             "dist/*", "build/*", "*.min.js", "*.min.css"
         ]
         
-        all_files = []
-        repo_path = Path(repo_path)
+        # Sort the patterns by the cheapest check that implements them
+        ignored_dirs = set()
+        ignored_names = set()
+        ignored_suffixes = []
+        glob_patterns = []
+        for pattern in ignore_patterns:
+            if pattern.endswith("/*") and not _has_glob(pattern[:-2]) and "/" not in pattern[:-2]:
+                # "name/*": prune the whole directory
+                ignored_dirs.add(pattern[:-2])
+            elif pattern.startswith("*") and not _has_glob(pattern[1:]) and "/" not in pattern:
+                ignored_suffixes.append(pattern[1:])
+            elif not _has_glob(pattern) and "/" not in pattern:
+                ignored_names.add(pattern)
+            else:
+                glob_patterns.append(pattern)
+        ignored_suffixes = tuple(ignored_suffixes)
+        # Remaining globs are matched against the path by one compiled union
+        glob_regex = None
+        if glob_patterns:
+            union = "|".join(f"(?:{_glob_to_regex(pattern)})" for pattern in glob_patterns)
+            glob_regex = re.compile(f"(?:^|/)(?:{union})\\Z")
         
-        for root, _, files in os.walk(repo_path):
-            rel_root = Path(root).relative_to(repo_path)
-            for file in files:
-                file_path = str(rel_root / file)
-                
-                # Skip files matching ignore patterns
-                if any(Path(file_path).match(pattern) for pattern in ignore_patterns):
-                    continue
-                
-                all_files.append(file_path)
-        
-        return all_files
+        pending = [(repo_path, "")]
+        while pending:
+            directory, rel_dir = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir():
+                        # Ignored directories are skipped without being listed;
+                        # like os.walk, symlinked directories are not followed
+                        if name not in ignored_dirs and not entry.is_symlink():
+                            pending.append((entry.path, f"{rel_dir}{name}/"))
+                        continue
+                    
+                    # Skip files matching ignore patterns
+                    if name in ignored_names or name.endswith(ignored_suffixes):
+                        continue
+                    file_path = rel_dir + name
+                    if glob_regex is not None and glob_regex.search(file_path):
+                        continue
+                    
+                    yield file_path, entry
     
-    def read_file(self, repo_path: str, file_path: str) -> str:
+    def read_file(self, repo_path: str, file_path: str, size: Optional[int] = None) -> str:
         """
         Read a file from the repository.
         
+        Binary assets and files over _MAX_READ_BYTES are not opened at all.
+        
         Args:
             repo_path: Path to the cloned repository
             file_path: Path to the file, relative to repo_path
+            size: Size of the file in bytes, if already known from a stat
             
         Returns:
             File contents as a string
             
         Raises:
             FileNotFoundError: If file cannot be found
-            UnicodeDecodeError: If file cannot be decoded as text
         """
         full_path = os.path.join(repo_path, file_path)
         
-        try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # Try with a more lenient encoding for binary files
-            try:
-                with open(full_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except:
-                return "[Binary file not shown]"
+        if os.path.splitext(file_path)[1].lower() in _BINARY_EXTENSIONS:
+            return _BINARY_PLACEHOLDER
+        if size is None:
+            size = os.path.getsize(full_path)
+        if size > _MAX_READ_BYTES:
+            return _BINARY_PLACEHOLDER
+        
+        # One read and one decode; invalid UTF-8 sequences become U+FFFD
+        data = Path(full_path).read_bytes()
+        if not _looks_text(data):
+            return _BINARY_PLACEHOLDER
+        content = data.decode("utf-8", errors="replace")
+        if "\r" in content:
+            # Match the newline translation of text-mode reads
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
     
-    def get_repository_structure(self, repo_path: str) -> Dict[str, Any]:
+    def get_repository_structure(self, repo_path: str) -> LazyFileTree:
         """
         Get a complete representation of the repository structure.
         
+        Each file's content is read the first time its entry is accessed and kept
+        afterwards, so the clone must still exist at that point; callers that
+        outlive the clone, like fetch_repository, use materialize() to get a plain
+        dictionary with everything read up front.
+        
         Args:
             repo_path: Path to the cloned repository
             
         Returns:
-            Dictionary containing repository structure and file contents
+            Mapping of file path to file entry, including content
         """
-        file_list = self.get_file_list(repo_path)
-        
-        # Build file tree
-        file_tree = {}
-        for file_path in file_list:
-            content = self.read_file(repo_path, file_path)
-            file_tree[file_path] = {
-                "path": file_path,
-                "content": content,
-                "size": len(content),
-                "extension": os.path.splitext(file_path)[1][1:] if os.path.splitext(file_path)[1] else "",
-            }
+        entries = {
+            file_path: (entry.stat().st_size, os.path.splitext(entry.name)[1][1:])
+            for file_path, entry in self._scan_files(repo_path)
+        }
         
-        return file_tree
+        return LazyFileTree(self, repo_path, entries)
     
     def cleanup(self):
-        """Clean up temporary files."""
+        """
+        Clean up temporary files.
+        
+        Removing a large checkout can take seconds, so it runs on a background
+        thread; the thread is not a daemon, so the directory is still removed
+        if the process is exiting.
+        """
         if self.clone_path and os.path.exists(self.clone_path):
-            import shutil
-            shutil.rmtree(self.clone_path, ignore_errors=True)
+            threading.Thread(
+                target=shutil.rmtree,
+                args=(self.clone_path,),
+                kwargs={"ignore_errors": True},
+                name="repo-cleanup",
+            ).start()
+        self.clone_path = None
 
 
-def fetch_repository(url: str) -> Dict[str, Any]:
+async def afetch_repository(url: str) -> Dict[str, Any]:
     """
-    Fetch a GitHub repository for documentation generation.
+    Fetch a GitHub repository for documentation generation, overlapping I/O.
+    
+    The metadata request and the download run concurrently; neither needs
+    the other, since the download defaults to the remote HEAD.
     
     Args:
         url: GitHub repository URL
@@ -228,14 +665,20 @@ def fetch_repository(url: str) -> Dict[str, Any]:
     fetcher = RepoFetcher()
     
     try:
-        # Get repository metadata
-        metadata = fetcher.fetch_repository_metadata(url)
-        
-        # Clone the repository
-        repo_path = fetcher.clone_repository(url)
+        # Wait for both even if one fails, so cleanup sees the final clone path
+        metadata, repo_path = await asyncio.gather(
+            asyncio.to_thread(fetcher.fetch_repository_metadata, url),
+            asyncio.to_thread(fetcher.clone_repository, url),
+            return_exceptions=True,
+        )
+        for result in (metadata, repo_path):
+            if isinstance(result, BaseException):
+                raise result
         
-        # Get repository structure
-        file_tree = fetcher.get_repository_structure(repo_path)
+        # Read the files now, before the clone is removed below
+        file_tree = await asyncio.to_thread(
+            lambda: fetcher.get_repository_structure(repo_path).materialize()
+        )
         
         return {
             "metadata": metadata,
@@ -246,4 +689,17 @@ def fetch_repository(url: str) -> Dict[str, Any]:
         print(f"Error fetching repository: {e}")
         return None
     finally:
-        fetcher.cleanup() 
\ No newline at end of file
+        fetcher.cleanup()
+
+
+def fetch_repository(url: str) -> Dict[str, Any]:
+    """
+    Fetch a GitHub repository for documentation generation.
+    
+    Args:
+        url: GitHub repository URL
+        
+    Returns:
+        Dictionary containing repository data
+    """
+    return asyncio.run(afetch_repository(url))
@@ -5,8 +5,8 @@ import streamlit as st
 import os
 from dotenv import load_dotenv
 import groq
-import time
-from app.agents.crew_definition import DocsGeneratorCrew
+import hashlib
+from contextlib import nullcontext
 from app.ui.chat_interface import chat_interface
 from app.github.github_utils import GithubRepositoryFetcher
 from app.utils.file_browser import FileBrowser
@@ -21,15 +21,214 @@ if groq_api_key:
 else:
     st.error("GROQ_API_KEY not found in environment variables")
 
-def generate_documentation(repo_url, selected_files, model_name, temperature):
+def get_crew(model_name, temperature, verbose=True):
+    """
+    Build a DocsGeneratorCrew once per session and settings.
+    
+    DocsGeneratorCrew.run mutates the crew's tasks and agents, so a crew is
+    never shared between sessions; it is kept in st.session_state instead.
+    Only the crew for the latest settings is kept, so moving the temperature
+    slider or switching models does not pile up crews in the session.
+    
+    Args:
+        model_name: LLM model to use
+        temperature: Temperature setting for LLM responses
+        verbose: Whether to enable verbose logging
+        
+    Returns:
+        DocsGeneratorCrew instance owned by the current session
+    """
+    key = (model_name, temperature, verbose)
+    if st.session_state.get("crew_key") != key:
+        # Imported lazily so reruns that don't generate documentation skip loading CrewAI
+        from app.agents.crew_definition import DocsGeneratorCrew
+        
+        st.session_state.crew = DocsGeneratorCrew(
+            model=model_name,
+            temperature=temperature,
+            verbose=verbose
+        )
+        st.session_state.crew_key = key
+    return st.session_state.crew
+
+def profiler_context(enabled):
+    """
+    Return a context manager that profiles the wrapped code when enabled.
+    
+    Args:
+        enabled: Whether profiling was requested
+        
+    Returns:
+        A streamlit-profiler Profiler, or a no-op context manager
+    """
+    if not enabled:
+        return nullcontext()
+    
+    try:
+        from streamlit_profiler import Profiler
+    except ImportError:
+        st.warning("Install streamlit-profiler to profile documentation runs.")
+        return nullcontext()
+    
+    return Profiler()
+
+def _file_set_digest(selected_files):
+    """
+    Hash the selected paths together with their blob SHAs, when known.
+    
+    Args:
+        selected_files: List of selected file paths
+        
+    Returns:
+        Hex SHA-256 digest that changes when the selection or file contents change
+    """
+    shas = {
+        item.get("path"): item.get("sha", "")
+        for item in st.session_state.get("repo_files") or []
+        if isinstance(item, dict)
+    }
+    digest = hashlib.sha256()
+    for path in sorted(selected_files):
+        digest.update(f"{path}\0{shas.get(path, '')}\n".encode())
+    return digest.hexdigest()
+
+# Documentation text that marks a crew run as failed rather than finished
+_FAILED_RESULT_PREFIXES = (
+    "Error generating documentation",
+    "Error with Groq API",
+    "Agent reached its limits",
+)
+
+def _is_failed_result(result):
+    """
+    Check whether a crew result reports an error instead of documentation.
+    
+    Args:
+        result: Dictionary returned by DocsGeneratorCrew.run
+        
+    Returns:
+        True if the documentation is an error or agent-limit message
+    """
+    documentation = str(result.get("documentation", "")).lstrip()
+    return documentation.startswith(_FAILED_RESULT_PREFIXES)
+
+def _run_crew(crew, repo_url, selected_files, profile=False):
+    """
+    Run the crew for the selected files.
+    
+    Args:
+        crew: DocsGeneratorCrew of the current session (see get_crew)
+        repo_url: GitHub repository URL
+        selected_files: List of files to include in documentation
+        profile: Whether to render a profile of the crew run
+        
+    Returns:
+        Generated documentation and diagrams
+        
+    Raises:
+        RuntimeError: If the crew returned an error instead of documentation
+    """
+    # Prepare repository data
+    repository_data = {
+        "url": repo_url,
+        "files": selected_files
+    }
+    
+    with profiler_context(profile):
+        result = crew.run(repository_data)
+    
+    # DocsGeneratorCrew.run reports failures in the result; raise so they aren't cached
+    if _is_failed_result(result):
+        raise RuntimeError(result["documentation"])
+    return result
+
+def _run_fallback(repo_url, selected_files, model_name, temperature):
+    """
+    Generate documentation with a single streamed Groq call.
+    
+    Args:
+        repo_url: GitHub repository URL
+        selected_files: List of files to include in documentation
+        model_name: LLM model to use
+        temperature: Temperature setting for LLM responses
+        
+    Returns:
+        Generated documentation, without diagrams, plan or analysis
+    """
+    # Basic prompt for documentation
+    prompt = f"""
+    Generate documentation for the following GitHub repository: {repo_url}
+    
+    Files to include:
+    {', '.join(selected_files)}
+    
+    Please include:
+    1. Overview of the project
+    2. Key components and their interactions
+    3. API documentation (if applicable)
+    4. Usage examples
+    """
+    
+    stream = groq_client.chat.completions.create(
+        model=model_name,
+        messages=[
+            {"role": "system", "content": "You are a technical documentation expert."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=temperature,
+        stream=True,
+    )
+    
+    # Show tokens as they arrive; write_stream returns the full text
+    documentation = st.write_stream(
+        chunk.choices[0].delta.content or "" for chunk in stream
+    )
+    
+    return {
+        "documentation": documentation,
+        "diagrams": "No diagrams available in fallback mode.",
+        "plan": "No plan available in fallback mode.",
+        "analysis": "No detailed analysis available in fallback mode."
+    }
+
+# The caller's spinner covers the run, so the cache shows none of its own
+@st.cache_data(ttl=86400, max_entries=64, show_spinner=False)
+def _generate_documentation_cached(_crew, repo_url, selected_files, file_set_digest, model_name, temperature):
+    """
+    Cached crew run, keyed by its arguments.
+    
+    Only the crew run is cached: it renders nothing, and failed runs raise,
+    which st.cache_data never stores. The cache is shared by every session,
+    so the calling session passes in its own crew; st.cache_data leaves the
+    underscore-prefixed _crew out of the key.
+    
+    Args:
+        _crew: DocsGeneratorCrew of the calling session, built for model_name and temperature
+        repo_url: GitHub repository URL
+        selected_files: Tuple of files to include in documentation
+        file_set_digest: Digest of the selected files (see _file_set_digest)
+        model_name: LLM model to use
+        temperature: Temperature setting for LLM responses
+        
+    Returns:
+        Generated documentation and diagrams
+    """
+    return _run_crew(_crew, repo_url, list(selected_files))
+
+def generate_documentation(repo_url, selected_files, model_name, temperature, profile=False):
     """
     Generate documentation using CrewAI or fallback to direct API calls.
     
+    Successful crew runs are cached for a day per repository, file set, model
+    and temperature; profiling runs and st.session_state.force_refresh bypass
+    the cache. Fallback results are never cached.
+    
     Args:
         repo_url: GitHub repository URL
         selected_files: List of files to include in documentation
         model_name: LLM model to use
         temperature: Temperature setting for LLM responses
+        profile: Whether to render a profile of the crew run
         
     Returns:
         Generated documentation and diagrams
@@ -45,65 +244,34 @@ def generate_documentation(repo_url, selected_files, model_name, temperature):
         }
     
     try:
-        # Create crew
-        crew = DocsGeneratorCrew(
-            model=model_name,
-            temperature=temperature,
-            verbose=True
-        )
+        # Get this session's crew for these settings
+        crew = get_crew(model_name, temperature, verbose=True)
         
-        # Prepare repository data
-        repository_data = {
-            "url": repo_url,
-            "files": selected_files
-        }
+        if profile or st.session_state.get("force_refresh"):
+            return _run_crew(crew, repo_url, selected_files, profile=profile)
         
-        # Run the crew
-        st.info("Generating documentation with CrewAI... This may take a few minutes.")
-        result = crew.run(repository_data)
-        return result
+        return _generate_documentation_cached(
+            crew,
+            repo_url,
+            tuple(selected_files),
+            _file_set_digest(selected_files),
+            model_name,
+            temperature,
+        )
     except Exception as e:
         st.error(f"Error with CrewAI: {str(e)}")
         st.info("Falling back to direct documentation generation...")
-        
-        # Fallback to direct documentation generation using Groq API
-        try:
-            # Basic prompt for documentation
-            prompt = f"""
-            Generate documentation for the following GitHub repository: {repo_url}
-            
-            Files to include:
-            {', '.join(selected_files)}
-            
-            Please include:
-            1. Overview of the project
-            2. Key components and their interactions
-            3. API documentation (if applicable)
-            4. Usage examples
-            """
-            
-            response = groq_client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": "You are a technical documentation expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-            )
-            
-            return {
-                "documentation": response.choices[0].message.content,
-                "diagrams": "No diagrams available in fallback mode.",
-                "plan": "No plan available in fallback mode.",
-                "analysis": "No detailed analysis available in fallback mode."
-            }
-        except Exception as fallback_error:
-            return {
-                "documentation": f"Error generating documentation: {str(fallback_error)}",
-                "diagrams": "Error generating diagrams.",
-                "plan": "Error generating plan.",
-                "analysis": "Error generating analysis."
-            }
+    
+    # Fallback to direct documentation generation using Groq API
+    try:
+        return _run_fallback(repo_url, selected_files, model_name, temperature)
+    except Exception as fallback_error:
+        return {
+            "documentation": f"Error generating documentation: {str(fallback_error)}",
+            "diagrams": "Error generating diagrams.",
+            "plan": "Error generating plan.",
+            "analysis": "Error generating analysis."
+        }
 
 def main():
     """Main application function."""
@@ -166,17 +334,22 @@ def main():
             key="model_selectbox"
         )
         temperature = st.slider("Temperature", 0.0, 1.0, 0.2, 0.1, key="temperature_slider")
+        profile_run = st.checkbox("Profile", value=False, key="profile_checkbox",
+                                  help="Show a profile of the documentation run (requires streamlit-profiler)")
+        st.checkbox("Force refresh", value=False, key="force_refresh",
+                    help="Regenerate even if documentation for these settings is cached")
         
         # Generate documentation button
         if st.button("Generate Documentation", key="generate_docs_btn"):
-            selected_files = st.session_state.get("selected_file_paths", [])
+            selected_files = sorted(st.session_state.get("selected_file_paths", ()))
             if repo_url and selected_files:
                 with st.spinner("Generating documentation... This may take a few minutes."):
                     result = generate_documentation(
                         repo_url, 
                         selected_files,
                         model_name,
-                        temperature
+                        temperature,
+                        profile=profile_run
                     )
                     
                     st.session_state.documentation = result["documentation"]
@@ -1,19 +1,93 @@
 """
 Code parser for AI Docs Generator.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import ast
+import hashlib
+import json
 import os
-from collections import defaultdict
+import tempfile
+import warnings
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 import re
 
+try:
+    import tree_sitter_languages
+except ImportError:  # Optional: JavaScript/TypeScript fall back to the regex patterns
+    tree_sitter_languages = None
+
+# Languages parsed with tree-sitter, mapped to the grammar that parses them
+_TREE_SITTER_GRAMMARS = {
+    "JavaScript": "javascript",
+    "JavaScript (React)": "javascript",
+    "TypeScript": "typescript",
+    "TypeScript (React)": "tsx",
+}
+
+# tree-sitter nodes whose name is a function, and the value types that make a
+# variable or object property one
+_TS_FUNCTION_NODES = frozenset({"function_declaration", "generator_function_declaration", "method_definition"})
+_TS_FUNCTION_VALUES = frozenset({"arrow_function", "function", "function_expression"})
+
+# Bump when parsing logic changes so stale cached results are not reused
+_PARSE_CACHE_VERSION = 3
+# Parse results are private to the user, so they live under the user's cache dir
+_DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")) / "un-messy" / "parse"
+
+# Total size the parse cache may grow to before the least recently used entries go
+_PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Binary content is recognised by a NUL character near the start of the file
+_BINARY_SAMPLE_CHARS = 8192
+
+# Average line length above which a file is treated as minified
+_MINIFIED_LINE_LENGTH = 2000
+
+# Below this many files, starting worker processes costs more than it saves
+_PARALLEL_PARSE_MIN_FILES = 32
+_PARALLEL_PARSE_CHUNKSIZE = 16
+
+# Parser of the current worker process, set up by _init_parse_worker
+_worker_parser = None
+
+
+@lru_cache(maxsize=None)
+def _get_tree_sitter_parser(grammar: str):
+    """Return a shared tree-sitter parser for a grammar."""
+    return tree_sitter_languages.get_parser(grammar)
+
+
+def _node_text(node) -> str:
+    """Get the source text of a tree-sitter node."""
+    return node.text.decode("utf-8", errors="replace")
+
+
+def _string_value(node) -> Optional[str]:
+    """Get the value of a tree-sitter string literal node, or None for other nodes."""
+    if node is None or node.type != "string":
+        return None
+    return "".join(_node_text(child) for child in node.children if child.type == "string_fragment")
+
 
 class CodeParser:
     """
     Parses code files to extract structure and relationships.
     """
     
-    def __init__(self):
-        """Initialize the code parser."""
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the code parser.
+        
+        Args:
+            cache_dir: Directory for cached parse results (defaults to a
+                directory under the user's cache dir)
+        """
+        self._cache_dir = Path(cache_dir) if cache_dir else _DEFAULT_CACHE_DIR
+        
         # File extension to language mapping
         self.language_map = {
             "py": "Python",
@@ -44,41 +118,76 @@ class CodeParser:
             "ps1": "PowerShell",
         }
         
+        # File extension to file type mapping; anything else is source or test code
+        self._ext_to_type = {
+            ".md": "documentation",
+            ".txt": "documentation",
+            ".json": "config",
+            ".yaml": "config",
+            ".yml": "config",
+            ".xml": "config",
+            ".toml": "config",
+            ".html": "frontend",
+            ".css": "frontend",
+            ".scss": "frontend",
+            ".less": "frontend",
+        }
+        
+        # Patterns are compiled once here, since the parse methods run them over every file
         # Patterns for detecting imports and dependencies
         self.import_patterns = {
             "Python": [
-                r"import\s+([a-zA-Z0-9_.,\s]+)",
-                r"from\s+([a-zA-Z0-9_.]+)\s+import\s+([a-zA-Z0-9_.,\s*]+)",
+                re.compile(r"import\s+([a-zA-Z0-9_.,\s]+)"),
+                re.compile(r"from\s+([a-zA-Z0-9_.]+)\s+import\s+([a-zA-Z0-9_.,\s*]+)"),
             ],
             "JavaScript": [
-                r"import\s+.*?from\s+['\"]([^'\"]+)['\"]",
-                r"require\s*\(\s*['\"]([^'\"]+)['\"]",
-                r"import\s+['\"]([^'\"]+)['\"]",
+                re.compile(r"import\s+.*?from\s+['\"]([^'\"]+)['\"]"),
+                re.compile(r"require\s*\(\s*['\"]([^'\"]+)['\"]"),
+                re.compile(r"import\s+['\"]([^'\"]+)['\"]"),
             ],
             "TypeScript": [
-                r"import\s+.*?from\s+['\"]([^'\"]+)['\"]",
-                r"require\s*\(\s*['\"]([^'\"]+)['\"]",
-                r"import\s+['\"]([^'\"]+)['\"]",
+                re.compile(r"import\s+.*?from\s+['\"]([^'\"]+)['\"]"),
+                re.compile(r"require\s*\(\s*['\"]([^'\"]+)['\"]"),
+                re.compile(r"import\s+['\"]([^'\"]+)['\"]"),
             ],
             "Java": [
-                r"import\s+([a-zA-Z0-9_.]+\*?);",
+                re.compile(r"import\s+([a-zA-Z0-9_.]+\*?);"),
             ],
         }
         
         # Patterns for detecting classes and functions
         self.class_patterns = {
-            "Python": r"class\s+([a-zA-Z0-9_]+)(?:\(([a-zA-Z0-9_.,\s]+)\))?:",
-            "JavaScript": r"class\s+([a-zA-Z0-9_]+)(?:\s+extends\s+([a-zA-Z0-9_]+))?",
-            "TypeScript": r"(?:export\s+)?class\s+([a-zA-Z0-9_]+)(?:\s+extends\s+([a-zA-Z0-9_]+))?(?:\s+implements\s+([a-zA-Z0-9_,\s]+))?",
-            "Java": r"(?:public|private|protected)?\s*(?:static)?\s*class\s+([a-zA-Z0-9_]+)(?:\s+extends\s+([a-zA-Z0-9_]+))?(?:\s+implements\s+([a-zA-Z0-9_,\s]+))?",
+            "Python": re.compile(r"class\s+([a-zA-Z0-9_]+)(?:\(([a-zA-Z0-9_.,\s]+)\))?:"),
+            "JavaScript": re.compile(r"class\s+([a-zA-Z0-9_]+)(?:\s+extends\s+([a-zA-Z0-9_]+))?"),
+            "TypeScript": re.compile(r"(?:export\s+)?class\s+([a-zA-Z0-9_]+)(?:\s+extends\s+([a-zA-Z0-9_]+))?(?:\s+implements\s+([a-zA-Z0-9_,\s]+))?"),
+            "Java": re.compile(r"(?:public|private|protected)?\s*(?:static)?\s*class\s+([a-zA-Z0-9_]+)(?:\s+extends\s+([a-zA-Z0-9_]+))?(?:\s+implements\s+([a-zA-Z0-9_,\s]+))?"),
         }
         
         self.function_patterns = {
-            "Python": r"def\s+([a-zA-Z0-9_]+)\s*\(",
-            "JavaScript": r"(?:function\s+([a-zA-Z0-9_]+)\s*\(|(?:const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>|([a-zA-Z0-9_]+)\s*:\s*(?:async\s*)?\([^)]*\)\s*=>)",
-            "TypeScript": r"(?:function\s+([a-zA-Z0-9_]+)\s*\(|(?:const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>|([a-zA-Z0-9_]+)\s*(?::\s*[a-zA-Z0-9_<>[\],\s|]+)?\s*\([^)]*\))",
-            "Java": r"(?:public|private|protected)?\s*(?:static)?\s*(?:[a-zA-Z0-9_<>[\],\s]+)\s+([a-zA-Z0-9_]+)\s*\(",
+            "Python": re.compile(r"def\s+([a-zA-Z0-9_]+)\s*\("),
+            # Parameter lists are capped so an unclosed "(" cannot make every
+            # candidate scan to the end of the file
+            "JavaScript": re.compile(r"(?:function\s+([a-zA-Z0-9_]+)\s*\(|(?:const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\([^)]{0,200}\)\s*=>|([a-zA-Z0-9_]+)\s*:\s*(?:async\s*)?\([^)]{0,200}\)\s*=>)"),
+            "TypeScript": re.compile(r"(?:function\s+([a-zA-Z0-9_]+)\s*\(|(?:const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*(?:async\s*)?\([^)]{0,200}\)\s*=>|([a-zA-Z0-9_]+)\s*(?::\s*[a-zA-Z0-9_<>[\],\s|]+)?\s*\([^)]{0,200}\))"),
+            # Modifiers are letters and spaces, so the type character class already covers them
+            "Java": re.compile(r"[a-zA-Z0-9_<>[\],\s]+\s+([a-zA-Z0-9_]+)\s*\("),
         }
+        
+        # Route decorators/calls for API endpoint extraction
+        self._flask_route_re = re.compile(r"@(?:[a-zA-Z0-9_]+\.)?route\(['\"]([^'\"]+)['\"](?:,\s*methods=\[([^\]]+)\])?")
+        self._express_route_re = re.compile(r"(?:app|router)\.([a-z]+)\s*\(['\"]([^'\"]+)['\"]")
+    
+    def _language_for_ext(self, file_path: str) -> Optional[str]:
+        """
+        Look up the language of a file from its extension alone.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Language name, or None if the extension is not recognised
+        """
+        return self.language_map.get(os.path.splitext(file_path)[1][1:].lower())
     
     def detect_language(self, file_path: str, content: str) -> str:
         """
@@ -91,11 +200,10 @@ class CodeParser:
         Returns:
             Detected language
         """
-        extension = os.path.splitext(file_path)[1][1:].lower()
-        
         # Check if extension is in our map
-        if extension in self.language_map:
-            return self.language_map[extension]
+        language = self._language_for_ext(file_path)
+        if language:
+            return language
         
         # Try to guess based on content for files without clear extensions
         if "def " in content and "import " in content:
@@ -122,7 +230,7 @@ class CodeParser:
         
         if language in self.import_patterns:
             for pattern in self.import_patterns[language]:
-                for match in re.finditer(pattern, content):
+                for match in pattern.finditer(content):
                     if match.groups():
                         imports.append(match.group(1).strip())
         
@@ -143,7 +251,7 @@ class CodeParser:
         
         if language in self.class_patterns:
             pattern = self.class_patterns[language]
-            for match in re.finditer(pattern, content):
+            for match in pattern.finditer(content):
                 class_info = {
                     "name": match.group(1),
                     "parent_classes": [],
@@ -173,7 +281,7 @@ class CodeParser:
         
         if language in self.function_patterns:
             pattern = self.function_patterns[language]
-            for match in re.finditer(pattern, content):
+            for match in pattern.finditer(content):
                 # Use the first non-None capturing group as the function name
                 for group in match.groups():
                     if group:
@@ -204,8 +312,7 @@ class CodeParser:
         # Extract Flask routes (Python)
         if language == "Python":
             # Look for @app.route or @blueprint.route decorators
-            route_pattern = r"@(?:[a-zA-Z0-9_]+\.)?route\(['\"]([^'\"]+)['\"](?:,\s*methods=\[([^\]]+)\])?"
-            for match in re.finditer(route_pattern, content):
+            for match in self._flask_route_re.finditer(content):
                 route_path = match.group(1)
                 methods = []
                 if match.group(2):
@@ -221,8 +328,7 @@ class CodeParser:
         # Extract Express routes (JavaScript/TypeScript)
         if language in ["JavaScript", "TypeScript"]:
             # Look for app.get/post/put/delete patterns
-            route_pattern = r"(?:app|router)\.([a-z]+)\s*\(['\"]([^'\"]+)['\"]"
-            for match in re.finditer(route_pattern, content):
+            for match in self._express_route_re.finditer(content):
                 method = match.group(1).upper()
                 route_path = match.group(2)
                 
@@ -234,6 +340,313 @@ class CodeParser:
         
         return endpoints
     
+    def _parse_python_ast(self, content: str) -> Optional[Dict[str, List[Any]]]:
+        """
+        Extract imports, classes, functions and Flask routes in one AST walk.
+        
+        Args:
+            content: File content
+            
+        Returns:
+            Dictionary of imports, classes, functions and endpoints, or None if
+            the content is not valid Python
+        """
+        try:
+            with warnings.catch_warnings():
+                # Invalid escape sequences in the parsed file are not our concern
+                warnings.simplefilter("ignore")
+                tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return None
+        
+        imports = []
+        classes = []
+        functions = []
+        endpoints = []
+        
+        # Pre-order walk, so results keep source order
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+            
+            if isinstance(node, ast.Import):
+                imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                # The module, then the imported names, which may themselves be modules
+                if node.module:
+                    imports.append(node.module)
+                imports.extend(alias.name for alias in node.names if alias.name != "*")
+            elif isinstance(node, ast.ClassDef):
+                classes.append({
+                    "name": node.name,
+                    "parent_classes": [ast.unparse(base) for base in node.bases],
+                })
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.append({
+                    "name": node.name,
+                })
+                endpoints.extend(self._flask_routes(node))
+        
+        return {
+            "imports": imports,
+            "classes": classes,
+            "functions": functions,
+            "endpoints": endpoints,
+        }
+    
+    @staticmethod
+    def _flask_routes(function: ast.AST) -> List[Dict[str, Any]]:
+        """
+        Get the Flask routes declared by a function's @route decorators.
+        
+        Args:
+            function: Function definition node
+            
+        Returns:
+            List of API endpoint information
+        """
+        endpoints = []
+        for decorator in function.decorator_list:
+            if not isinstance(decorator, ast.Call) or not decorator.args:
+                continue
+            target = decorator.func
+            name = target.attr if isinstance(target, ast.Attribute) else getattr(target, "id", None)
+            path = decorator.args[0]
+            if name != "route" or not isinstance(path, ast.Constant) or not isinstance(path.value, str):
+                continue
+            
+            methods = []
+            for keyword in decorator.keywords:
+                if keyword.arg == "methods" and isinstance(keyword.value, (ast.List, ast.Tuple)):
+                    methods = [
+                        element.value for element in keyword.value.elts
+                        if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                    ]
+            
+            endpoints.append({
+                "path": path.value,
+                "methods": methods if methods else ["GET"],
+                "type": "Flask",
+            })
+        return endpoints
+    
+    def _parse_tree_sitter(self, content: str, language: str) -> Optional[Dict[str, List[Any]]]:
+        """
+        Extract imports, classes, functions and Express routes in one tree-sitter walk.
+        
+        Args:
+            content: File content
+            language: Programming language
+            
+        Returns:
+            Dictionary of imports, classes, functions and endpoints, or None if
+            tree-sitter is not installed
+        """
+        if tree_sitter_languages is None:
+            return None
+        
+        tree = _get_tree_sitter_parser(_TREE_SITTER_GRAMMARS[language]).parse(content.encode("utf-8"))
+        
+        imports = []
+        classes = []
+        functions = []
+        endpoints = []
+        
+        # Pre-order walk, so results keep source order
+        stack = [tree.root_node]
+        while stack:
+            node = stack.pop()
+            stack.extend(reversed(node.children))
+            node_type = node.type
+            
+            if node_type == "import_statement":
+                source = _string_value(node.child_by_field_name("source"))
+                if source is not None:
+                    imports.append(source)
+            elif node_type == "call_expression":
+                function = node.child_by_field_name("function")
+                arguments = node.child_by_field_name("arguments")
+                first_argument = arguments.named_children[0] if arguments and arguments.named_children else None
+                argument = _string_value(first_argument)
+                if function is None or argument is None:
+                    continue
+                
+                if function.type == "identifier" and _node_text(function) == "require":
+                    imports.append(argument)
+                elif function.type == "member_expression":
+                    receiver = function.child_by_field_name("object")
+                    method = function.child_by_field_name("property")
+                    method_name = _node_text(method) if method else ""
+                    if receiver and _node_text(receiver) in ("app", "router") and method_name.isalpha() and method_name.islower():
+                        endpoints.append({
+                            "path": argument,
+                            "methods": [method_name.upper()],
+                            "type": "Express",
+                        })
+            elif node_type in ("class_declaration", "abstract_class_declaration"):
+                name = node.child_by_field_name("name")
+                if name is None:
+                    continue
+                parent_classes = []
+                for child in node.children:
+                    if child.type == "class_heritage":
+                        # JavaScript puts the parent directly under class_heritage,
+                        # TypeScript under an extends_clause
+                        extends = next((c for c in child.children if c.type == "extends_clause"), None)
+                        parent = extends.child_by_field_name("value") if extends else next(iter(child.named_children), None)
+                        if parent is not None:
+                            parent_classes.append(_node_text(parent))
+                classes.append({
+                    "name": _node_text(name),
+                    "parent_classes": parent_classes,
+                })
+            elif node_type in _TS_FUNCTION_NODES:
+                name = node.child_by_field_name("name")
+                if name is not None:
+                    functions.append({"name": _node_text(name)})
+            elif node_type in ("variable_declarator", "pair"):
+                name = node.child_by_field_name("name" if node_type == "variable_declarator" else "key")
+                value = node.child_by_field_name("value")
+                if name is not None and value is not None and value.type in _TS_FUNCTION_VALUES:
+                    functions.append({"name": _node_text(name)})
+        
+        return {
+            "imports": imports,
+            "classes": classes,
+            "functions": functions,
+            "endpoints": endpoints,
+        }
+    
+    def _parse_structure(self, content: str, language: str) -> Dict[str, List[Any]]:
+        """
+        Extract imports, classes, functions and API endpoints from code.
+        
+        Args:
+            content: File content
+            language: Programming language
+            
+        Returns:
+            Dictionary of imports, classes, functions and endpoints
+        """
+        # Parse the file with a real parser where one is available, so a single
+        # pass finds everything; other languages use the regex patterns
+        structure = None
+        if language == "Python":
+            structure = self._parse_python_ast(content)
+        elif language in _TREE_SITTER_GRAMMARS:
+            structure = self._parse_tree_sitter(content, language)
+        
+        if structure is None:
+            structure = self.parse_all(content, language)
+        return structure
+    
+    def parse_all(self, content: str, language: str) -> Dict[str, List[Any]]:
+        """
+        Run the regex patterns for imports, classes, functions and API endpoints.
+        
+        Every pattern contains a keyword, so a scan is skipped when its keyword
+        does not occur in the file; the substring check costs far less than a
+        regex scan and gives the same result. Minified files only get the
+        import and endpoint scans.
+        
+        Args:
+            content: File content
+            language: Programming language
+            
+        Returns:
+            Dictionary of imports, classes, functions and endpoints
+        """
+        has_imports = "import" in content or "require" in content
+        has_routes = "route" in content or "app." in content or "router." in content
+        
+        # Class and function patterns backtrack badly on minified code, where
+        # their matches would not be meaningful anyway
+        minified = len(content) > _MINIFIED_LINE_LENGTH * (content.count("\n") + 1)
+        has_classes = not minified and "class" in content
+        has_functions = not minified and (language != "Python" or "def" in content)
+        
+        return {
+            "imports": self.parse_imports(content, language) if has_imports else [],
+            "classes": self.parse_classes(content, language) if has_classes else [],
+            "functions": self.parse_functions(content, language) if has_functions else [],
+            "endpoints": self.extract_api_endpoints(content, language) if has_routes else [],
+        }
+    
+    def _cached_structure(self, content: str, language: str) -> Dict[str, List[Any]]:
+        """
+        Extract the structure of code, reusing the result of an earlier parse of the same content.
+        
+        Results are stored on disk keyed by a hash of the content, language and
+        parser version, so unchanged files are not parsed again across runs.
+        
+        Args:
+            content: File content
+            language: Programming language
+            
+        Returns:
+            Dictionary of imports, classes, functions and endpoints
+        """
+        key = hashlib.blake2b(digest_size=16)
+        key.update(f"{_PARSE_CACHE_VERSION}:{language}:{tree_sitter_languages is not None}\0".encode())
+        key.update(content.encode("utf-8", errors="replace"))
+        cache_path = self._cache_dir / f"{key.hexdigest()}.json"
+        
+        try:
+            structure = json.loads(cache_path.read_bytes())
+            # Refresh the modification time so eviction keeps recently used entries
+            os.utime(cache_path)
+            return structure
+        except (OSError, ValueError):
+            pass
+        
+        structure = self._parse_structure(content, language)
+        
+        # Write to a temporary file and rename it, so readers never see a partial entry
+        try:
+            self._cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(json.dumps(structure).encode())
+                os.replace(temp_path, cache_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            # The cache is an optimisation; parsing still succeeded
+            pass
+        
+        return structure
+    
+    def _prune_cache(self, max_bytes: int = _PARSE_CACHE_MAX_BYTES) -> None:
+        """
+        Delete the least recently used cache entries until the cache fits in max_bytes.
+        
+        Args:
+            max_bytes: Largest total size of the cached parse results
+        """
+        try:
+            with os.scandir(self._cache_dir) as scan:
+                entries = [
+                    (stat.st_mtime, stat.st_size, entry.path)
+                    for entry in scan
+                    if entry.name.endswith(".json")
+                    for stat in (entry.stat(),)
+                ]
+        except OSError:
+            return
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+    
     def parse_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """
         Parse a single file to extract its structure and content.
@@ -245,44 +658,37 @@ class CodeParser:
         Returns:
             Dictionary containing parsed information
         """
-        language = self.detect_language(file_path, content)
+        language = self._language_for_ext(file_path) or self.detect_language(file_path, content)
         
-        # Skip parsing binary files or files with unknown language
-        if content == "[Binary file not shown]" or language == "Unknown":
+        # Skip parsing binary files or files with unknown language; binary
+        # content that was not replaced by the placeholder is caught by a NUL
+        is_binary = content == "[Binary file not shown]" or "\x00" in content[:_BINARY_SAMPLE_CHARS]
+        if is_binary or language == "Unknown":
             return {
                 "path": file_path,
                 "language": language,
                 "summary": "Binary file or unknown format",
-                "type": "binary" if content == "[Binary file not shown]" else "unknown",
+                "type": "binary" if is_binary else "unknown",
             }
         
-        # Parse the file
-        imports = self.parse_imports(content, language)
-        classes = self.parse_classes(content, language)
-        functions = self.parse_functions(content, language)
-        endpoints = self.extract_api_endpoints(content, language)
+        structure = self._cached_structure(content, language)
         
         # Determine file type based on content
-        file_type = "source"
-        if any(file_path.endswith(ext) for ext in [".md", ".txt"]):
-            file_type = "documentation"
-        elif any(file_path.endswith(ext) for ext in [".json", ".yaml", ".yml", ".xml", ".toml"]):
-            file_type = "config"
-        elif any(file_path.endswith(ext) for ext in [".html", ".css", ".scss", ".less"]):
-            file_type = "frontend"
-        elif "test" in file_path.lower() or file_path.endswith("spec.js") or file_path.endswith("spec.ts"):
-            file_type = "test"
+        file_type = self._ext_to_type.get(os.path.splitext(file_path)[1].lower())
+        if file_type is None:
+            is_test = "test" in file_path.lower() or file_path.endswith(("spec.js", "spec.ts"))
+            file_type = "test" if is_test else "source"
         
         # Extract file summary
-        loc = len(content.split('\n'))
+        loc = content.count('\n') + 1
         
         return {
             "path": file_path,
             "language": language,
-            "imports": imports,
-            "classes": classes,
-            "functions": functions,
-            "endpoints": endpoints,
+            "imports": structure["imports"],
+            "classes": structure["classes"],
+            "functions": structure["functions"],
+            "endpoints": structure["endpoints"],
             "loc": loc,
             "type": file_type,
         }
@@ -297,8 +703,10 @@ class CodeParser:
         Returns:
             Dictionary mapping files to their dependencies
         """
-        # Map from module/package names to files
+        # Map from full module paths to files, and from shorter dotted
+        # suffixes to every file that ends with them
         module_to_file = {}
+        suffix_to_files = defaultdict(set)
         
         # First pass: map modules to files
         for file_path, file_info in parsed_files.items():
@@ -306,13 +714,12 @@ class CodeParser:
             if file_info['language'] == "Python":
                 # Convert path to module notation
                 module_path = os.path.splitext(file_path)[0].replace('/', '.')
+                module_to_file[module_path] = file_path
                 module_parts = module_path.split('.')
                 
-                # Register all possible import paths for this file
-                for i in range(len(module_parts)):
-                    module_name = '.'.join(module_parts[i:])
-                    if module_name:
-                        module_to_file[module_name] = file_path
+                # Register the shorter import paths for this file
+                for i in range(1, len(module_parts)):
+                    suffix_to_files['.'.join(module_parts[i:])].add(file_path)
             
             # For JavaScript/TypeScript, use path-based mapping
             elif file_info['language'] in ["JavaScript", "TypeScript"]:
@@ -325,8 +732,13 @@ class CodeParser:
         
         for file_path, file_info in parsed_files.items():
             for imported in file_info.get('imports', []):
-                # Try to find the file that provides this import
+                # Try to find the file that provides this import; a suffix
+                # shared by several files (a/utils.py and b/utils.py) is skipped
                 target_file = module_to_file.get(imported)
+                if target_file is None:
+                    candidates = suffix_to_files.get(imported, ())
+                    if len(candidates) == 1:
+                        (target_file,) = candidates
                 
                 if target_file and target_file != file_path:  # Avoid self-dependencies
                     dependencies[file_path].append(target_file)
@@ -350,23 +762,35 @@ class CodeParser:
         if selected_files:
             files = {path: info for path, info in files.items() if path in selected_files}
         
-        # Parse each file
+        # Parse each file; parsing is CPU-bound and independent per file, so
+        # larger repositories are spread over worker processes
+        items = [(file_path, file_info['content']) for file_path, file_info in files.items()]
+        parallel = len(items) >= _PARALLEL_PARSE_MIN_FILES
+        
         parsed_files = {}
-        for file_path, file_info in files.items():
-            parsed_files[file_path] = self.parse_file(file_path, file_info['content'])
+        language_count = Counter()
+        file_type_count = Counter()
+        total_loc = 0
         
-        # Build dependency graph
-        dependencies = self.build_dependency_graph(parsed_files)
+        pool = ProcessPoolExecutor(initializer=_init_parse_worker, initargs=(str(self._cache_dir),)) if parallel else nullcontext()
+        with pool as executor:
+            if parallel:
+                results = executor.map(_parse_one, items, chunksize=_PARALLEL_PARSE_CHUNKSIZE)
+            else:
+                results = ((file_path, self.parse_file(file_path, content)) for file_path, content in items)
+            
+            # Collect statistics as results arrive
+            for file_path, file_info in results:
+                parsed_files[file_path] = file_info
+                language_count[file_info['language']] += 1
+                file_type_count[file_info['type']] += 1
+                total_loc += file_info.get('loc', 0)
         
-        # Collect statistics
-        language_count = defaultdict(int)
-        file_type_count = defaultdict(int)
-        total_loc = 0
+        # Keep the on-disk parse cache bounded now that this run's entries are written
+        self._prune_cache()
         
-        for file_info in parsed_files.values():
-            language_count[file_info['language']] += 1
-            file_type_count[file_info['type']] += 1
-            total_loc += file_info.get('loc', 0)
+        # Build dependency graph
+        dependencies = self.build_dependency_graph(parsed_files)
         
         return {
             "metadata": repository['metadata'],
@@ -382,6 +806,18 @@ class CodeParser:
         }
 
 
+def _init_parse_worker(cache_dir: str) -> None:
+    """Create the parser used by a parse_repository worker process."""
+    global _worker_parser
+    _worker_parser = CodeParser(cache_dir)
+
+
+def _parse_one(item: Tuple[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """Parse one (file path, content) pair in a worker process."""
+    file_path, content = item
+    return file_path, _worker_parser.parse_file(file_path, content)
+
+
 def parse_repository(repository: Dict[str, Any], selected_files: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Parse a repository for documentation generation.
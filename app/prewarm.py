@@ -0,0 +1,51 @@
+"""
+Background imports of modules the app loads on its first run or first use.
+"""
+import importlib
+import sys
+import threading
+
+# Modules app.main loads on the first page render (the file browser pulls in
+# pandas) or on the first documentation run (CrewAI, via get_crew)
+_PREWARM_MODULES = (
+    "app.utils.file_browser",
+    "app.agents.crew_definition",
+)
+
+
+def use_pysqlite3() -> None:
+    """
+    Make ``import sqlite3`` load pysqlite3, whose SQLite is new enough for ChromaDB.
+    
+    Does nothing if pysqlite3 is not installed or the swap was already made.
+    """
+    if getattr(sys.modules.get("sqlite3"), "__name__", None) == "pysqlite3":
+        return
+    try:
+        __import__("pysqlite3")
+    except ImportError:
+        return
+    sys.modules["sqlite3"] = sys.modules.pop("pysqlite3")
+
+
+def _prewarm() -> None:
+    """Import each prewarm module, ignoring any that fail to load."""
+    for name in _PREWARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            # The module is imported again where it is used, which reports the error
+            pass
+
+
+def start_prewarm() -> None:
+    """
+    Start importing the prewarm modules on a daemon thread.
+    
+    Only useful in the process that goes on to run the Streamlit server,
+    since the imports are shared through sys.modules.
+    """
+    # CrewAI loads ChromaDB, which binds sqlite3 on import, so the swap app.py
+    # makes has to happen before the prewarm imports it
+    use_pysqlite3()
+    threading.Thread(target=_prewarm, name="prewarm", daemon=True).start()
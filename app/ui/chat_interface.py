@@ -9,9 +9,22 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource(show_spinner=False)
+def _get_groq_client(api_key):
+    """
+    Build a Groq client once and reuse it, so its connection pool stays warm between messages.
+    
+    Args:
+        api_key: Groq API key
+        
+    Returns:
+        Cached Groq client
+    """
+    return groq.Client(api_key=api_key)
+
 def ask_llm(prompt, context="", model_name="llama3-70b-8192", temperature=0.2):
     """
-    Ask a question to the LLM.
+    Ask a question to the LLM, yielding the response as it is generated.
     
     Args:
         prompt: User's question
@@ -19,16 +32,17 @@ def ask_llm(prompt, context="", model_name="llama3-70b-8192", temperature=0.2):
         model_name: LLM model to use
         temperature: Temperature setting for LLM responses
         
-    Returns:
-        LLM response
+    Yields:
+        Chunks of the LLM response
     """
     try:
         # Initialize Groq client
         groq_api_key = os.environ.get("GROQ_API_KEY")
         if not groq_api_key:
-            return "Error: GROQ_API_KEY not found in environment variables"
+            yield "Error: GROQ_API_KEY not found in environment variables"
+            return
         
-        groq_client = groq.Client(api_key=groq_api_key)
+        groq_client = _get_groq_client(groq_api_key)
         
         # Create system message with context if provided
         system_message = """You are a helpful AI assistant specialized in explaining code and documentation.
@@ -38,18 +52,22 @@ def ask_llm(prompt, context="", model_name="llama3-70b-8192", temperature=0.2):
             system_message += f"\n\nContext about the codebase:\n{context}"
         
         # Call the Groq API
-        response = groq_client.chat.completions.create(
+        stream = groq_client.chat.completions.create(
             model=model_name,
             messages=[
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": prompt}
             ],
             temperature=temperature,
+            stream=True,
         )
         
-        return response.choices[0].message.content
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
     except Exception as e:
-        return f"Error with Groq API: {str(e)}"
+        yield f"Error with Groq API: {str(e)}"
 
 def chat_interface():
     """
@@ -89,20 +107,19 @@ def chat_interface():
         if "analysis" in st.session_state and st.session_state.analysis:
             context += f"Analysis:\n{st.session_state.analysis}\n\n"
         
-        # Display assistant thinking
+        # Stream the assistant's answer as it is generated
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                model_name = "llama3-70b-8192"  # Default model
-                if "model_name" in st.session_state:
-                    model_name = st.session_state.model_name
-                
-                response = ask_llm(
-                    user_input, 
-                    context=context,
-                    model_name=model_name,
-                    temperature=0.2
-                )
-                st.write(response)
+            model_name = "llama3-70b-8192"  # Default model
+            if "model_name" in st.session_state:
+                model_name = st.session_state.model_name
+            
+            # write_stream returns the full text for the chat history
+            response = st.write_stream(ask_llm(
+                user_input, 
+                context=context,
+                model_name=model_name,
+                temperature=0.2
+            ))
         
         # Add assistant response to chat history
         st.session_state.chat_messages.append({"role": "assistant", "content": response}) 
\ No newline at end of file
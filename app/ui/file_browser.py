@@ -2,34 +2,59 @@
 File browser UI component.
 """
 import streamlit as st
+import pandas as pd
 import os
-from typing import Dict, Any, List
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple
 import re
 
+# Icons and languages by lowercase file extension
+_ICON_BY_EXT = {
+    ".py": "🐍",  # Python
+    **dict.fromkeys([".js", ".jsx", ".ts", ".tsx"], "⚛️"),  # JavaScript/TypeScript
+    **dict.fromkeys([".html", ".htm"], "🌐"),  # HTML
+    **dict.fromkeys([".css", ".scss", ".sass", ".less"], "🎨"),  # CSS
+    **dict.fromkeys([".json", ".yaml", ".yml", ".toml", ".xml"], "📋"),  # Config files
+    **dict.fromkeys([".md", ".txt", ".rst"], "📝"),  # Documentation
+    **dict.fromkeys([".jpg", ".jpeg", ".png", ".gif", ".svg"], "🖼️"),  # Images
+}
+_DEFAULT_ICON = "📄"
 
-def group_files_by_directory(files: Dict[str, Any]) -> Dict[str, List[str]]:
+_LANG_BY_EXT = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".jsx": "React",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript React",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".md": "Markdown",
+    ".json": "JSON",
+    ".yaml": "YAML",
+    ".yml": "YAML",
+}
+_DEFAULT_LANGUAGE = "Plain Text"
+
+
+@st.cache_data(show_spinner=False)
+def group_files_by_directory(file_paths: Tuple[str, ...]) -> Dict[str, List[str]]:
     """
     Group files by directory.
     
+    Cached, so reruns of the same repository (every widget interaction) reuse
+    the grouping.
+    
     Args:
-        files: Dictionary mapping file paths to file info
+        file_paths: Tuple of file paths
         
     Returns:
         Dictionary mapping directories to lists of file paths
     """
-    directories = {}
-    
-    for file_path in files:
-        directory = os.path.dirname(file_path)
-        if not directory:
-            directory = "root"
-        
-        if directory not in directories:
-            directories[directory] = []
-        
-        directories[directory].append(file_path)
+    directories = defaultdict(list)
+    for file_path in file_paths:
+        directories[os.path.dirname(file_path) or "root"].append(file_path)
     
-    return directories
+    return dict(directories)
 
 
 def determine_file_icon(file_path: str) -> str:
@@ -42,25 +67,7 @@ def determine_file_icon(file_path: str) -> str:
     Returns:
         Icon string
     """
-    extension = os.path.splitext(file_path)[1].lower()
-    
-    # Map extensions to icons
-    if extension in ['.py']:
-        return "🐍"  # Python
-    elif extension in ['.js', '.jsx', '.ts', '.tsx']:
-        return "⚛️"  # JavaScript/TypeScript
-    elif extension in ['.html', '.htm']:
-        return "🌐"  # HTML
-    elif extension in ['.css', '.scss', '.sass', '.less']:
-        return "🎨"  # CSS
-    elif extension in ['.json', '.yaml', '.yml', '.toml', '.xml']:
-        return "📋"  # Config files
-    elif extension in ['.md', '.txt', '.rst']:
-        return "📝"  # Documentation
-    elif extension in ['.jpg', '.jpeg', '.png', '.gif', '.svg']:
-        return "🖼️"  # Images
-    else:
-        return "📄"  # Default file icon
+    return _ICON_BY_EXT.get(os.path.splitext(file_path)[1].lower(), _DEFAULT_ICON)
 
 
 def get_file_language(file_path: str) -> str:
@@ -73,31 +80,7 @@ def get_file_language(file_path: str) -> str:
     Returns:
         Programming language
     """
-    extension = os.path.splitext(file_path)[1].lower()
-    
-    # Map extensions to languages
-    if extension == '.py':
-        return "Python"
-    elif extension == '.js':
-        return "JavaScript"
-    elif extension == '.jsx':
-        return "React"
-    elif extension == '.ts':
-        return "TypeScript"
-    elif extension == '.tsx':
-        return "TypeScript React"
-    elif extension == '.html':
-        return "HTML"
-    elif extension == '.css':
-        return "CSS"
-    elif extension == '.md':
-        return "Markdown"
-    elif extension == '.json':
-        return "JSON"
-    elif extension == '.yaml' or extension == '.yml':
-        return "YAML"
-    else:
-        return "Plain Text"
+    return _LANG_BY_EXT.get(os.path.splitext(file_path)[1].lower(), _DEFAULT_LANGUAGE)
 
 
 def file_browser(repository: Dict[str, Any]) -> List[str]:
@@ -120,7 +103,7 @@ def file_browser(repository: Dict[str, Any]) -> List[str]:
     files = repository['files']
     
     # Group files by directory
-    directories = group_files_by_directory(files)
+    directories = group_files_by_directory(tuple(files))
     
     # Sort directories
     sorted_directories = sorted(directories.keys())
@@ -165,37 +148,56 @@ def file_browser(repository: Dict[str, Any]) -> List[str]:
     elif deselect_all:
         st.session_state.selected_files = []
     
-    # Display files by directory
-    selected_files = []
-    
+    # Reset the grid when a button replaced the selection
+    if "file_editor_version" not in st.session_state:
+        st.session_state.file_editor_version = 0
+    if select_all or deselect_all:
+        st.session_state.file_editor_version += 1
+    
+    # One data_editor holds every checkbox, so reruns cost the same however many
+    # files there are. Its rows are built from a snapshot of the selection taken
+    # when the grid was created, since rebuilding them from the live selection
+    # would change the data under the widget and drop the user's latest edit.
+    editor_key = f"file_selection_{st.session_state.file_editor_version}_{search_query}"
+    if st.session_state.get("file_editor_key") != editor_key:
+        st.session_state.file_editor_key = editor_key
+        st.session_state.file_editor_base = set(st.session_state.selected_files)
+    base_selection = st.session_state.file_editor_base
+    
+    rows = []
     for directory in sorted_directories:
-        # Directory expander
-        with st.expander(f"📂 {directory} ({len(directories[directory])} files)", expanded=directory == "root"):
-            # Sort files in this directory
-            sorted_files = sorted(directories[directory])
+        for file_path in sorted(directories[directory]):
+            file_name = os.path.basename(file_path)
+            extension = os.path.splitext(file_name)[1].lower()
+            
+            # File size in KB
+            file_size = files[file_path]['size'] / 1024
             
-            # Display files with checkboxes
-            for file_path in sorted_files:
-                file_name = os.path.basename(file_path)
-                icon = determine_file_icon(file_path)
-                language = get_file_language(file_path)
-                
-                # File size in KB
-                file_size = files[file_path]['size'] / 1024
-                size_str = f"{file_size:.1f} KB" if file_size < 1024 else f"{file_size/1024:.1f} MB"
-                
-                # Checkbox label with file info
-                label = f"{icon} {file_name} ({language}, {size_str})"
-                
-                # Checkbox for file selection
-                is_selected = st.checkbox(
-                    label, 
-                    value=file_path in st.session_state.selected_files,
-                    key=f"file_{file_path}"
-                )
-                
-                if is_selected:
-                    selected_files.append(file_path)
+            rows.append({
+                "Selected": file_path in base_selection,
+                "File": f"{_ICON_BY_EXT.get(extension, _DEFAULT_ICON)} {file_name}",
+                "Directory": directory,
+                "Language": _LANG_BY_EXT.get(extension, _DEFAULT_LANGUAGE),
+                "Size": f"{file_size:.1f} KB" if file_size < 1024 else f"{file_size/1024:.1f} MB",
+                "Path": file_path,
+            })
+    
+    edited = st.data_editor(
+        pd.DataFrame(rows, columns=["Selected", "File", "Directory", "Language", "Size", "Path"]),
+        key=editor_key,
+        column_config={
+            "Selected": st.column_config.CheckboxColumn("Selected"),
+            "Path": None,
+        },
+        disabled=["File", "Directory", "Language", "Size"],
+        hide_index=True,
+        use_container_width=True,
+    )
+    
+    # Files hidden by the search keep their selection
+    shown = set(edited["Path"])
+    selected_files = [path for path in st.session_state.selected_files if path not in shown]
+    selected_files.extend(edited.loc[edited["Selected"], "Path"].tolist())
     
     # Update session state
     st.session_state.selected_files = selected_files
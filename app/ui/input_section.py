@@ -5,6 +5,9 @@ import streamlit as st
 import re
 from typing import Optional
 
+# GitHub repository URL; groups are the owner and repository name
+_GITHUB_URL_RE = re.compile(r"https?://(?:www\.)?github\.com/([a-zA-Z0-9_-]+)/([a-zA-Z0-9_-]+)")
+
 
 def validate_github_url(url: str) -> bool:
     """
@@ -21,8 +24,7 @@ def validate_github_url(url: str) -> bool:
         return False
     
     # Check if URL matches GitHub pattern
-    github_pattern = r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+"
-    return bool(re.match(github_pattern, url))
+    return bool(_GITHUB_URL_RE.match(url))
 
 
 def repo_input_section() -> Optional[str]:
@@ -82,7 +84,8 @@ def repo_input_section() -> Optional[str]:
             st.session_state.ignore_patterns = None
     
     # Validate input and return URL
-    if github_url and validate_github_url(github_url):
+    match = _GITHUB_URL_RE.match(github_url) if github_url else None
+    if match:
         # Store branch in session state if specified
         if branch:
             st.session_state.branch = branch
@@ -92,10 +95,8 @@ def repo_input_section() -> Optional[str]:
         # Store max files in session state
         st.session_state.max_files = max_files
         
-        # Extract and store repository name for later reference
-        match = re.search(r"github\.com/[a-zA-Z0-9_-]+/([a-zA-Z0-9_-]+)", github_url)
-        if match:
-            st.session_state.repository_name = match.group(1)
+        # Store repository name for later reference
+        st.session_state.repository_name = match.group(2)
         
         return github_url
     elif uploaded_file:
@@ -1,19 +1,240 @@
 """
 Output section UI component.
 """
+import hashlib
+import io
+import json
+import re
 import streamlit as st
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+try:
+    import markdown
+except ImportError:  # Optional: without it Streamlit renders the Markdown itself
+    markdown = None
+
+# Diagram views, mapped to their key in the diagrams dict and a label for messages
+_DIAGRAM_VIEWS = {
+    "Architecture": ("architecture", "architecture"),
+    "Class Hierarchy": ("class", "class"),
+    "Dependencies": ("dependency", "dependency"),
+    "API": ("api", "API"),
+}
+
+_MARKDOWN_EXTENSIONS = ["fenced_code", "tables"]
+
+# Blocks that continue a list must stay with it so numbering is not restarted
+_LIST_ITEM_RE = re.compile(r"\s*(?:[-*+]|\d+[.)])\s")
+
+
+def _split_blocks(content: str) -> List[str]:
+    """
+    Split Markdown into top-level blocks on blank lines.
+    
+    Blank lines inside fenced code do not split, and indented or list-item
+    blocks following a list stay attached to it.
+    
+    Args:
+        content: Markdown content
+        
+    Returns:
+        List of Markdown blocks
+    """
+    blocks = []
+    current = []
+    in_fence = False
+    
+    for line in content.split("\n"):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        
+        if in_fence or line.strip():
+            current.append(line)
+            continue
+        
+        if current:
+            block = "\n".join(current)
+            continues_list = blocks and _LIST_ITEM_RE.match(blocks[-1]) and (
+                block[0].isspace() or _LIST_ITEM_RE.match(block)
+            )
+            if continues_list:
+                blocks[-1] += "\n\n" + block
+            else:
+                blocks.append(block)
+            current = []
+    
+    if current:
+        blocks.append("\n".join(current))
+    
+    return blocks
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _md_to_html(content: str) -> str:
+    """
+    Convert a Markdown block to HTML, cached by content across reruns.
+    
+    Args:
+        content: Markdown content
+        
+    Returns:
+        Rendered HTML
+    """
+    return markdown.markdown(content, extensions=_MARKDOWN_EXTENSIONS)
 
 
 def render_markdown(content: str) -> None:
     """
     Render markdown content with proper formatting.
     
+    Completed blocks are converted through the cache, so a document that grows
+    or is re-rendered only converts its last block again.
+    
     Args:
         content: Markdown content to render
     """
-    st.markdown(content)
+    if markdown is None:
+        st.markdown(content)
+        return
+    
+    blocks = _split_blocks(content)
+    if not blocks:
+        return
+    
+    # The last block may still be growing, so it is not worth a cache entry
+    html = [_md_to_html(block) for block in blocks[:-1]]
+    html.append(markdown.markdown(blocks[-1], extensions=_MARKDOWN_EXTENSIONS))
+    st.markdown("\n".join(html), unsafe_allow_html=True)
+
+
+def _dict_to_md(documentation: Dict[str, Any]) -> str:
+    """
+    Write structured documentation out as a Markdown document.
+    
+    Args:
+        documentation: Documentation with overview and/or sections
+        
+    Returns:
+        Markdown text
+    """
+    out = io.StringIO()
+    
+    if "overview" in documentation:
+        out.write(f"# Overview\n\n{documentation['overview']}\n\n")
+    
+    sections = documentation.get("sections")
+    if isinstance(sections, dict):
+        for title, content in sections.items():
+            out.write(f"## {title}\n\n{content}\n\n")
+    elif isinstance(sections, list):
+        for section in sections:
+            if isinstance(section, dict) and "title" in section and "content" in section:
+                out.write(f"## {section['title']}\n\n{section['content']}\n\n")
+    
+    if "overview" not in documentation and "sections" not in documentation:
+        # No known structure, so keep everything as JSON
+        out.write(f"```json\n{json.dumps(documentation, indent=2, default=str)}\n```\n")
+    
+    return out.getvalue()
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _serialize_doc(documentation: Any) -> str:
+    """
+    Serialize documentation for download, cached so reruns skip the work.
+    
+    Args:
+        documentation: Generated documentation
+        
+    Returns:
+        Markdown text
+    """
+    if isinstance(documentation, dict):
+        return _dict_to_md(documentation)
+    return str(documentation)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _serialize_diagrams(diagrams: Dict[str, str]) -> str:
+    """
+    Combine diagrams into a single Markdown file, cached so reruns skip the work.
+    
+    Args:
+        diagrams: Generated diagrams
+        
+    Returns:
+        Markdown text
+    """
+    return "\n\n".join(f"# {name.capitalize()} Diagram\n\n{code}" for name, code in diagrams.items())
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _mermaid_source(diagram_code: str) -> str:
+    """
+    Extract just the Mermaid code from a fenced Mermaid diagram.
+    
+    Args:
+        diagram_code: Diagram code wrapped in a mermaid code fence
+        
+    Returns:
+        Mermaid code without the fences
+    """
+    return diagram_code.replace("```mermaid", "").replace("```", "").strip()
+
+
+def _documentation_signature(documentation: Dict[str, Any]) -> str:
+    """
+    Digest documentation so caches can be keyed without hashing its structure.
+    
+    Args:
+        documentation: Generated documentation
+        
+    Returns:
+        Hex digest of the documentation
+    """
+    return hashlib.blake2b(repr(documentation).encode(), digest_size=8).hexdigest()
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _section_html(doc_sig: str, _documentation: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Convert the overview and every section of structured documentation to HTML.
+    
+    Args:
+        doc_sig: Digest of the documentation, used as the cache key
+        _documentation: Documentation with overview and/or sections (not hashed)
+        
+    Returns:
+        Dictionary mapping each Markdown body to its HTML
+    """
+    bodies = [_documentation.get("overview")]
+    sections = _documentation.get("sections")
+    if isinstance(sections, dict):
+        bodies.extend(sections.values())
+    elif isinstance(sections, list):
+        bodies.extend(section.get("content") for section in sections if isinstance(section, dict))
+    
+    return {
+        body: "\n".join(_md_to_html(block) for block in _split_blocks(body))
+        for body in bodies
+        if isinstance(body, str)
+    }
+
+
+def _render_section(content: Any, section_html: Dict[str, str]) -> None:
+    """
+    Render a documentation section from its prebuilt HTML when available.
+    
+    Args:
+        content: Markdown content of the section
+        section_html: Prebuilt HTML keyed by Markdown content
+    """
+    html = section_html.get(content) if isinstance(content, str) else None
+    if html is None:
+        render_markdown(content)
+    else:
+        st.markdown(html, unsafe_allow_html=True)
 
 
 def render_diagram(diagram_code: str) -> None:
@@ -23,19 +244,62 @@ def render_diagram(diagram_code: str) -> None:
     Args:
         diagram_code: Diagram code in Mermaid or Graphviz format
     """
-    if diagram_code.startswith("```mermaid"):
-        # Extract just the mermaid code
-        diagram_code = diagram_code.replace("```mermaid", "").replace("```", "").strip()
-        st.markdown(f"```mermaid\n{diagram_code}\n```")
-    elif "digraph G" in diagram_code:
+    # The format is known from the first few characters, however large the diagram
+    head = diagram_code[:32].lstrip()
+    
+    if head.startswith("```mermaid"):
+        st.markdown(f"```mermaid\n{_mermaid_source(diagram_code)}\n```")
+    elif head.startswith(("digraph", "strict digraph")):
         # Graphviz diagram
-        from graphviz import Source
         st.graphviz_chart(diagram_code)
     else:
         # Just render as code
         st.code(diagram_code)
 
 
+@st.fragment
+def render_diagrams(diagrams: Dict[str, str]) -> None:
+    """
+    Render the selected diagram; switching diagrams reruns only this fragment.
+    
+    Args:
+        diagrams: Generated diagrams
+    """
+    # st.tabs renders every tab on each rerun, so a selector is used to
+    # render only the diagram being viewed
+    view = st.radio(
+        "Diagram type",
+        list(_DIAGRAM_VIEWS),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="diagram_view",
+    )
+    diagram_key, label = _DIAGRAM_VIEWS[view]
+    
+    if diagram_key in diagrams:
+        render_diagram(diagrams[diagram_key])
+    else:
+        st.info(f"No {label} diagram generated.")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _sorted_counts(counts: Tuple[Tuple[str, int], ...], value_name: str, index_name: str) -> pd.Series:
+    """
+    Build a chart series from counts, sorted descending.
+    
+    Args:
+        counts: Pairs of label and count
+        value_name: Name of the count values
+        index_name: Name of the labels
+        
+    Returns:
+        Series of counts indexed by label
+    """
+    series = pd.Series(dict(counts), name=value_name).sort_values(ascending=False)
+    series.index.name = index_name
+    return series
+
+
 def render_statistics(statistics: Dict[str, Any]) -> None:
     """
     Render repository statistics.
@@ -58,37 +322,23 @@ def render_statistics(statistics: Dict[str, Any]) -> None:
     
     with col3:
         languages = statistics.get("languages", {})
-        primary_language = max(languages.items(), key=lambda x: x[1])[0] if languages else "Unknown"
+        primary_language = max(languages, key=languages.get) if languages else "Unknown"
         st.metric("Primary Language", primary_language)
     
     # Languages breakdown
     if languages:
         st.subheader("Languages")
         
-        # Convert to DataFrame for display
-        language_data = [{"Language": lang, "Files": count} for lang, count in languages.items()]
-        language_df = pd.DataFrame(language_data)
-        
-        # Sort by file count descending
-        language_df = language_df.sort_values("Files", ascending=False).reset_index(drop=True)
-        
-        # Display as chart
-        st.bar_chart(language_df.set_index("Language"))
+        # Display as chart, sorted by file count descending
+        st.bar_chart(_sorted_counts(tuple(languages.items()), "Files", "Language"))
     
     # File types breakdown
     file_types = statistics.get("file_types", {})
     if file_types:
         st.subheader("File Types")
         
-        # Convert to DataFrame for display
-        file_type_data = [{"Type": ftype, "Count": count} for ftype, count in file_types.items()]
-        file_type_df = pd.DataFrame(file_type_data)
-        
-        # Sort by count descending
-        file_type_df = file_type_df.sort_values("Count", ascending=False).reset_index(drop=True)
-        
-        # Display as chart
-        st.bar_chart(file_type_df.set_index("Type"))
+        # Display as chart, sorted by count descending
+        st.bar_chart(_sorted_counts(tuple(file_types.items()), "Count", "Type"))
 
 
 def output_section(documentation: Dict[str, Any], diagrams: Dict[str, str]) -> None:
@@ -111,42 +361,7 @@ def output_section(documentation: Dict[str, Any], diagrams: Dict[str, str]) -> N
     # Display diagrams
     if diagrams:
         st.header("Diagrams")
-        
-        # Create tabs for different diagram types
-        diagram_tabs = st.tabs([
-            "Architecture", 
-            "Class Hierarchy", 
-            "Dependencies", 
-            "API"
-        ])
-        
-        # Architecture diagram
-        with diagram_tabs[0]:
-            if "architecture" in diagrams:
-                render_diagram(diagrams["architecture"])
-            else:
-                st.info("No architecture diagram generated.")
-        
-        # Class diagram
-        with diagram_tabs[1]:
-            if "class" in diagrams:
-                render_diagram(diagrams["class"])
-            else:
-                st.info("No class diagram generated.")
-        
-        # Dependency diagram
-        with diagram_tabs[2]:
-            if "dependency" in diagrams:
-                render_diagram(diagrams["dependency"])
-            else:
-                st.info("No dependency diagram generated.")
-        
-        # API diagram
-        with diagram_tabs[3]:
-            if "api" in diagrams:
-                render_diagram(diagrams["api"])
-            else:
-                st.info("No API diagram generated.")
+        render_diagrams(diagrams)
     
     # Display documentation
     st.header("Documentation")
@@ -158,10 +373,16 @@ def output_section(documentation: Dict[str, Any], diagrams: Dict[str, str]) -> N
     elif isinstance(documentation, dict):
         # If documentation has sections, create tabs
         if "overview" in documentation or "sections" in documentation:
+            # Every section is converted in one call cached by a digest of the
+            # documentation, so reruns skip hashing each block again
+            section_html = {}
+            if markdown is not None:
+                section_html = _section_html(_documentation_signature(documentation), documentation)
+            
             # Display overview first
             if "overview" in documentation:
                 st.subheader("Overview")
-                render_markdown(documentation["overview"])
+                _render_section(documentation["overview"], section_html)
             
             # Display sections
             if "sections" in documentation:
@@ -174,16 +395,16 @@ def output_section(documentation: Dict[str, Any], diagrams: Dict[str, str]) -> N
                     
                     for i, title in enumerate(section_titles):
                         with section_tabs[i]:
-                            render_markdown(sections[title])
+                            _render_section(sections[title], section_html)
                 elif isinstance(sections, list):
                     # If sections is a list, display each section with its title
                     for section in sections:
                         if isinstance(section, dict) and "title" in section and "content" in section:
                             st.subheader(section["title"])
-                            render_markdown(section["content"])
+                            _render_section(section["content"], section_html)
         else:
-            # If no specific structure, just render the documentation
-            render_markdown(str(documentation))
+            # If no specific structure, show the raw data in the JSON viewer
+            st.json(documentation, expanded=False)
     else:
         st.warning("No documentation generated.")
     
@@ -195,17 +416,16 @@ def output_section(documentation: Dict[str, Any], diagrams: Dict[str, str]) -> N
     with col1:
         st.download_button(
             "Download Documentation (Markdown)",
-            data=str(documentation),
+            data=_serialize_doc(documentation),
             file_name="documentation.md",
             mime="text/markdown",
         )
     
     with col2:
         # Combine diagrams into a single file
-        diagrams_text = "\n\n".join([f"# {name.capitalize()} Diagram\n\n{code}" for name, code in diagrams.items()])
         st.download_button(
             "Download Diagrams",
-            data=diagrams_text,
+            data=_serialize_diagrams(diagrams),
             file_name="diagrams.md",
             mime="text/markdown",
         ) 
\ No newline at end of file
@@ -1,9 +1,118 @@
 """
 File browser utility for displaying and selecting repository files.
 """
+import hashlib
+import os
 import streamlit as st
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from typing import List, Dict, Any
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from app.github.github_utils import GithubRepositoryFetcher
+
+# Expanded directories at one level are listed concurrently by this many threads
+_DIRECTORY_FETCH_WORKERS = 8
+
+# Extensions of files listed as code files
+_CODE_EXTENSIONS = frozenset({
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".html", ".css", ".scss", ".java",
+    ".c", ".cpp", ".h", ".hpp", ".cs", ".php", ".rb", ".go", ".rs", ".sh",
+    ".swift", ".kt", ".kts", ".scala", ".dart", ".ex", ".exs", ".erl", ".fs",
+    ".fsx", ".lua", ".pl", ".pm", ".sql", ".r", ".json", ".yml", ".yaml",
+    ".toml", ".md", ".markdown", ".dockerfile", ".vue",
+})
+
+# Syntax highlighting language for each extension
+_LANGUAGE_BY_EXT = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "jsx",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".java": "java",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".php": "php",
+    ".rb": "ruby",
+    ".go": "go",
+    ".rs": "rust",
+    ".sh": "bash",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".kts": "kotlin",
+    ".scala": "scala",
+    ".dart": "dart",
+    ".ex": "elixir",
+    ".exs": "elixir",
+    ".erl": "erlang",
+    ".fs": "fsharp",
+    ".fsx": "fsharp",
+    ".lua": "lua",
+    ".pl": "perl",
+    ".pm": "perl",
+    ".sql": "sql",
+    ".r": "r",
+    ".json": "json",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".toml": "toml",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".dockerfile": "dockerfile",
+    ".vue": "vue",
+}
+
+
+@lru_cache(maxsize=1)
+def _get_fetcher() -> GithubRepositoryFetcher:
+    """
+    Get the fetcher shared by all file browser requests.
+    
+    Returns:
+        GithubRepositoryFetcher whose session keeps connections to GitHub alive
+    """
+    return GithubRepositoryFetcher()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_contents(owner: str, repo: str, path: str) -> List[Dict[str, Any]]:
+    """
+    Fetch the contents of a repository directory, cached across reruns.
+    
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        path: Directory path within the repository
+        
+    Returns:
+        List of repository contents
+    """
+    return _get_fetcher().fetch_repository_contents({"owner": owner, "repo": repo}, path)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_file_content(owner: str, repo: str, path: str) -> str:
+    """
+    Fetch the content of a repository file, cached across reruns.
+    
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        path: Path to the file within the repository
+        
+    Returns:
+        File content
+    """
+    return _get_fetcher().fetch_file_content({"owner": owner, "repo": repo}, path)
+
 
 class FileBrowser:
     """
@@ -14,18 +123,24 @@ class FileBrowser:
         """Initialize the file browser."""
         # Initialize selection tracking
         if "selected_file_paths" not in st.session_state:
-            st.session_state.selected_file_paths = []
+            st.session_state.selected_file_paths = set()
             
         # Initialize button action flags
         if "select_all_clicked" not in st.session_state:
             st.session_state.select_all_clicked = False
         if "deselect_all_clicked" not in st.session_state:
             st.session_state.deselect_all_clicked = False
+        
+        # File grids are recreated when a button replaces the selection
+        if "file_browser_version" not in st.session_state:
+            st.session_state.file_browser_version = 0
+        if "file_browser_bases" not in st.session_state:
+            st.session_state.file_browser_bases = {}
     
     def _make_stable_key(self, prefix: str, path: str) -> str:
         """
         Create a stable key for UI elements based on prefix and path.
-        Using hash to avoid characters that might cause issues in keys.
+        Using a digest to avoid characters that might cause issues in keys.
         
         Args:
             prefix: Prefix for the key
@@ -34,24 +149,31 @@ class FileBrowser:
         Returns:
             A stable unique key
         """
-        # Use hash to create a stable identifier from the path
-        # This ensures keys remain consistent between renders
-        path_hash = str(hash(path) % 10000000)
+        # Unlike hash(), the digest is the same in every process, and it is
+        # wide enough that distinct paths do not collide
+        path_hash = hashlib.blake2b(path.encode(), digest_size=6).hexdigest()
         return f"{prefix}_{path_hash}"
     
     def _handle_select_all(self):
         """Handle the 'Select All' button click."""
         st.session_state.select_all_clicked = True
+        st.session_state.file_browser_version += 1
+        st.session_state.file_browser_bases = {}
         
     def _handle_deselect_all(self):
         """Handle the 'Deselect All' button click."""
         st.session_state.deselect_all_clicked = True
-        st.session_state.selected_file_paths = []
+        st.session_state.selected_file_paths = set()
+        st.session_state.file_browser_version += 1
+        st.session_state.file_browser_bases = {}
     
     def display_file_browser(self, files: List[Dict[str, Any]], indent_level: int = 0) -> List[str]:
         """
         Display a file browser with checkboxes for selecting files.
         
+        The root level runs as a fragment, so selecting files reruns only the
+        browser rather than the whole app.
+        
         Args:
             files: List of file information dictionaries
             indent_level: Level of indentation for display (used for subdirectories)
@@ -59,6 +181,39 @@ class FileBrowser:
         Returns:
             List of selected file paths
         """
+        if indent_level == 0:
+            self._display_root(files)
+        else:
+            self._display_level(files, indent_level)
+        
+        return sorted(st.session_state.selected_file_paths)
+    
+    @st.fragment
+    def _display_root(self, files: List[Dict[str, Any]]) -> None:
+        """
+        Display the root level of the file browser.
+        
+        Args:
+            files: List of file information dictionaries
+        """
+        self._display_level(files, 0)
+    
+    def _display_level(self, files: List[Dict[str, Any]], indent_level: int) -> None:
+        """
+        Display one level of the file browser and any expanded directories.
+        
+        Args:
+            files: List of file information dictionaries
+            indent_level: Level of indentation for display (used for subdirectories)
+        """
+        # Group files by type in one pass
+        dirs, code_files, other_files = [], [], []
+        for f in files:
+            if f.get("type") == "dir":
+                dirs.append(f)
+            elif f.get("type") == "file":
+                (code_files if self._is_code_file(f.get("name", "")) else other_files).append(f)
+        
         # Process select all/deselect all logic before rendering any UI
         if indent_level == 0:
             # Reset flags after handling them
@@ -66,19 +221,10 @@ class FileBrowser:
                 st.session_state.deselect_all_clicked = False
                 # No need to clear selected_file_paths again, already done in handler
                 
-            code_files = [f for f in files if f.get("type") == "file" and self._is_code_file(f.get("name", ""))]
             if st.session_state.select_all_clicked:
                 st.session_state.select_all_clicked = False
                 # Pre-select all code files for this render cycle
-                for file in code_files:
-                    file_path = file.get("path", "")
-                    if file_path not in st.session_state.selected_file_paths:
-                        st.session_state.selected_file_paths.append(file_path)
-        
-        # Group files by type
-        dirs = [f for f in files if f.get("type") == "dir"]
-        code_files = [f for f in files if f.get("type") == "file" and self._is_code_file(f.get("name", ""))]
-        other_files = [f for f in files if f.get("type") == "file" and not self._is_code_file(f.get("name", ""))]
+                st.session_state.selected_file_paths.update(file.get("path", "") for file in code_files)
         
         # Sort files by name
         dirs.sort(key=lambda x: x.get("name", "").lower())
@@ -92,6 +238,13 @@ class FileBrowser:
         if dirs and indent_level == 0:
             st.markdown("##### Directories")
         
+        # Checkbox values from the last interaction are already in session
+        # state, so every expanded directory can be listed before rendering
+        prefetched = self._prefetch_directories([
+            directory for directory in dirs
+            if st.session_state.get(self._make_stable_key("dir", directory.get("path", "")))
+        ])
+        
         for directory in dirs:
             dir_path = directory.get("path", "")
             dir_name = directory.get('name', '')
@@ -107,15 +260,13 @@ class FileBrowser:
                 repo_info = directory.get("repo_info", {})
                 path = directory.get("path", "")
                 
-                # Import here to avoid circular imports
-                from app.github.github_utils import GithubRepositoryFetcher
-                
-                # Create a new GithubRepositoryFetcher instance
-                fetcher = GithubRepositoryFetcher()
-                
                 try:
                     # Fetch subdirectory contents
-                    subdirectory_files = fetcher.fetch_repository_contents(repo_info, path)
+                    subdirectory_files = prefetched.get(path)
+                    if subdirectory_files is None:
+                        subdirectory_files = _cached_contents(repo_info["owner"], repo_info["repo"], path)
+                    elif isinstance(subdirectory_files, Exception):
+                        raise subdirectory_files
                     
                     # Process subdirectory files
                     for item in subdirectory_files:
@@ -126,7 +277,7 @@ class FileBrowser:
                     st.markdown(f"**{indent}└─ Contents of {dir_name}:**")
                     
                     # Recursively display subdirectory contents with increased indentation
-                    self.display_file_browser(
+                    self._display_level(
                         subdirectory_files, 
                         indent_level=indent_level + 1
                     )
@@ -134,76 +285,18 @@ class FileBrowser:
                 except Exception as e:
                     st.error(f"Error fetching subdirectory: {str(e)}")
         
-        # Display code files
-        if code_files:
+        # Display files in one data_editor per level, so reruns cost one
+        # widget however many files there are
+        if code_files or other_files:
             if indent_level == 0:
-                st.markdown("##### Code Files")
+                st.markdown("##### Files")
+            self._render_file_grid(code_files, other_files)
             
-            for file in code_files:
-                file_path = file.get("path", "")
-                file_name = file.get('name', '')
-                
-                # Create a stable key for this file
-                file_key = self._make_stable_key("file", file_path)
-                
-                # Use indentation in the label to show hierarchy
-                file_label = f"{indent}📄 {file_name}"
-                
-                # Check if file is already selected (for initialization of checkbox)
-                default_value = file_path in st.session_state.selected_file_paths
-                
-                # Display checkbox and update selected files based on interaction
-                is_selected = st.checkbox(file_label, value=default_value, key=file_key)
-                
-                # Update our list of selected files
-                if is_selected and file_path not in st.session_state.selected_file_paths:
-                    st.session_state.selected_file_paths.append(file_path)
-                elif not is_selected and file_path in st.session_state.selected_file_paths:
-                    st.session_state.selected_file_paths.remove(file_path)
-                
-                # Display file preview if small enough and at root level
-                if file.get("size", 0) < 20000 and indent_level == 0 and is_selected:  
-                    preview_key = self._make_stable_key("preview", file_path)
-                    with st.expander(f"Preview: {file_name}", expanded=False):
-                        try:
-                            # Import here to avoid circular imports
-                            from app.github.github_utils import GithubRepositoryFetcher
-                            
-                            # Create a new GithubRepositoryFetcher instance
-                            fetcher = GithubRepositoryFetcher()
-                            
-                            # Fetch file content
-                            content = fetcher.fetch_file_content(file.get("repo_info", {}), file_path)
-                            st.code(content, language=self._get_language(file_name))
-                        except Exception as e:
-                            st.error(f"Error fetching file content: {str(e)}")
-        
-        # Display other files
-        if other_files:
+            # Display file previews for small selected code files at root level
             if indent_level == 0:
-                st.markdown("##### Other Files")
-            
-            for file in other_files:
-                file_path = file.get("path", "")
-                file_name = file.get('name', '')
-                
-                # Create a stable key for this file
-                file_key = self._make_stable_key("file", file_path)
-                
-                # Use indentation in the label to show hierarchy
-                file_label = f"{indent}📄 {file_name}"
-                
-                # Check if file is already selected (for initialization of checkbox)
-                default_value = file_path in st.session_state.selected_file_paths
-                
-                # Display checkbox and update selected files based on interaction
-                is_selected = st.checkbox(file_label, value=default_value, key=file_key)
-                
-                # Update our list of selected files
-                if is_selected and file_path not in st.session_state.selected_file_paths:
-                    st.session_state.selected_file_paths.append(file_path)
-                elif not is_selected and file_path in st.session_state.selected_file_paths:
-                    st.session_state.selected_file_paths.remove(file_path)
+                for file in code_files:
+                    if file.get("size", 0) < 20000 and file.get("path", "") in st.session_state.selected_file_paths:
+                        self._render_preview(file)
         
         # File selection options - only show at root level
         if files and indent_level == 0:
@@ -231,11 +324,106 @@ class FileBrowser:
             
             # Display selected files count
             st.markdown(f"**Selected: {len(st.session_state.selected_file_paths)} files**")
+    
+    def _render_preview(self, file: Dict[str, Any]) -> None:
+        """
+        Display a collapsed preview of a file's content.
         
-        # Return the selected files
-        return st.session_state.selected_file_paths
+        Args:
+            file: File information dictionary
+        """
+        file_name = file.get("name", "")
+        with st.expander(f"Preview: {file_name}", expanded=False):
+            try:
+                # Fetch file content
+                repo_info = file.get("repo_info", {})
+                content = _cached_file_content(repo_info["owner"], repo_info["repo"], file.get("path", ""))
+                st.code(content, language=self._get_language(file_name))
+            except Exception as e:
+                st.error(f"Error fetching file content: {str(e)}")
     
-    def _is_code_file(self, filename: str) -> bool:
+    def _prefetch_directories(self, directories: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        List several directories concurrently.
+        
+        Args:
+            directories: Directory information dictionaries
+            
+        Returns:
+            Dictionary mapping each directory path to its contents, or to the
+            exception raised while fetching them
+        """
+        def fetch(directory):
+            repo_info = directory.get("repo_info", {})
+            try:
+                return _cached_contents(repo_info["owner"], repo_info["repo"], directory.get("path", ""))
+            except Exception as e:
+                return e
+        
+        if len(directories) < 2:
+            return {directory.get("path", ""): fetch(directory) for directory in directories}
+        
+        # Workers share the script context so the cache can be used from them
+        with ThreadPoolExecutor(
+            max_workers=min(_DIRECTORY_FETCH_WORKERS, len(directories)),
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx()),
+        ) as executor:
+            results = list(executor.map(fetch, directories))
+        
+        return {directory.get("path", ""): result for directory, result in zip(directories, results)}
+    
+    def _render_file_grid(self, code_files: List[Dict[str, Any]], other_files: List[Dict[str, Any]]) -> None:
+        """
+        Display files as one selectable grid and update the selected files.
+        
+        Args:
+            code_files: Code files to list first
+            other_files: Remaining files to list after the code files
+        """
+        first_path = (code_files or other_files)[0].get("path", "")
+        editor_key = f"{self._make_stable_key('files', os.path.dirname(first_path))}_{st.session_state.file_browser_version}"
+        
+        # Rows are built from a snapshot of the selection taken when the grid
+        # was created, since rebuilding them from the live selection would
+        # change the data under the widget and drop the user's latest edit
+        bases = st.session_state.file_browser_bases
+        if editor_key not in bases:
+            bases[editor_key] = set(st.session_state.selected_file_paths)
+        base_selection = bases[editor_key]
+        
+        rows = [
+            {
+                "Selected": file.get("path", "") in base_selection,
+                "File": f"📄 {file.get('name', '')}",
+                "Type": file_type,
+                "Path": file.get("path", ""),
+            }
+            for files, file_type in ((code_files, "Code"), (other_files, "Other"))
+            for file in files
+        ]
+        
+        edited = st.data_editor(
+            pd.DataFrame(rows, columns=["Selected", "File", "Type", "Path"]),
+            key=editor_key,
+            column_config={
+                "Selected": st.column_config.CheckboxColumn("Selected"),
+                "Path": None,
+            },
+            disabled=["File", "Type"],
+            hide_index=True,
+            use_container_width=True,
+        )
+        
+        # Files listed in other grids keep their selection
+        shown = set(edited["Path"])
+        selected_file_paths = st.session_state.selected_file_paths - shown
+        selected_file_paths.update(edited.loc[edited["Selected"], "Path"])
+        st.session_state.selected_file_paths = selected_file_paths
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_code_file(filename: str) -> bool:
         """
         Check if a file is a code file based on its extension.
         
@@ -245,17 +433,11 @@ class FileBrowser:
         Returns:
             True if the file is a code file, False otherwise
         """
-        code_extensions = [
-            ".py", ".js", ".jsx", ".ts", ".tsx", ".html", ".css", ".scss", ".java", 
-            ".c", ".cpp", ".h", ".hpp", ".cs", ".php", ".rb", ".go", ".rs", ".sh", 
-            ".swift", ".kt", ".kts", ".scala", ".dart", ".ex", ".exs", ".erl", ".fs", 
-            ".fsx", ".lua", ".pl", ".pm", ".sql", ".r", ".json", ".yml", ".yaml", 
-            ".toml", ".md", ".markdown", ".dockerfile", ".vue"
-        ]
-        
-        return any(filename.lower().endswith(ext) for ext in code_extensions)
+        return os.path.splitext(filename)[1].lower() in _CODE_EXTENSIONS
     
-    def _get_language(self, filename: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_language(filename: str) -> str:
         """
         Get the language of a file based on its extension for syntax highlighting.
         
@@ -265,53 +447,4 @@ class FileBrowser:
         Returns:
             Language string for syntax highlighting
         """
-        extension_to_language = {
-            ".py": "python",
-            ".js": "javascript",
-            ".jsx": "jsx",
-            ".ts": "typescript",
-            ".tsx": "tsx",
-            ".html": "html",
-            ".css": "css",
-            ".scss": "scss",
-            ".java": "java",
-            ".c": "c",
-            ".cpp": "cpp",
-            ".h": "c",
-            ".hpp": "cpp",
-            ".cs": "csharp",
-            ".php": "php",
-            ".rb": "ruby",
-            ".go": "go",
-            ".rs": "rust",
-            ".sh": "bash",
-            ".swift": "swift",
-            ".kt": "kotlin",
-            ".kts": "kotlin",
-            ".scala": "scala",
-            ".dart": "dart",
-            ".ex": "elixir",
-            ".exs": "elixir",
-            ".erl": "erlang",
-            ".fs": "fsharp",
-            ".fsx": "fsharp",
-            ".lua": "lua",
-            ".pl": "perl",
-            ".pm": "perl",
-            ".sql": "sql",
-            ".r": "r",
-            ".json": "json",
-            ".yml": "yaml",
-            ".yaml": "yaml",
-            ".toml": "toml",
-            ".md": "markdown",
-            ".markdown": "markdown",
-            ".dockerfile": "dockerfile",
-            ".vue": "vue"
-        }
-        
-        for ext, lang in extension_to_language.items():
-            if filename.lower().endswith(ext):
-                return lang
-        
-        return "text" 
\ No newline at end of file
+        return _LANGUAGE_BY_EXT.get(os.path.splitext(filename)[1].lower(), "text")
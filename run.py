@@ -7,8 +7,8 @@ configuration and environment variables.
 """
 import os
 import sys
-import subprocess
 from dotenv import load_dotenv
+from app.prewarm import start_prewarm
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,6 +17,9 @@ def main():
     """Run the Streamlit application."""
     print("Starting AI Docs Generator...")
     
+    # Load the heavy app modules while the environment is checked and the server starts
+    start_prewarm()
+    
     # Get Streamlit server port from environment or use default
     port = os.environ.get("STREAMLIT_SERVER_PORT", "8501")
     
@@ -47,10 +50,13 @@ def main():
         "--server.headless", "false",
     ]
     
+    # Run Streamlit in this process, so signals reach it directly, no idle parent
+    # is left running and the app script finds the prewarmed modules already loaded
+    sys.stdout.flush()
+    sys.argv = cmd
     try:
-        subprocess.run(cmd)
-    except KeyboardInterrupt:
-        print("\nStopping AI Docs Generator...")
+        from streamlit.web import cli as stcli
+        sys.exit(stcli.main())
     except Exception as e:
         print(f"Error running Streamlit: {e}")
         sys.exit(1)
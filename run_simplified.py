@@ -7,14 +7,17 @@ Compatible with Python 3.9.1.
 """
 import os
 import sys
-import subprocess
 from dotenv import load_dotenv
+from app.prewarm import start_prewarm
 
 # Load environment variables
 load_dotenv()
 
 def main():
     """Run the Streamlit application."""
+    # Load the heavy app modules while the environment is checked and the server starts
+    start_prewarm()
+    
     try:
         # Check required environment variables
         required_vars = ["GROQ_API_KEY", "GITHUB_TOKEN"]
@@ -33,18 +36,21 @@ def main():
         # Run the Streamlit app
         port = os.environ.get("STREAMLIT_SERVER_PORT", "8501")
         print(f"🚀 Starting Streamlit server on port {port}...")
-        subprocess.run(
-            [
-                "streamlit", 
-                "run", 
-                "app.py", 
-                "--server.port", 
-                port, 
-                "--server.headless", 
-                "true"
-            ],
-            check=True
-        )
+        sys.stdout.flush()
+        
+        # Run Streamlit in this process, so the app script finds the prewarmed
+        # modules already loaded; nothing after this line runs on success
+        sys.argv = [
+            "streamlit", 
+            "run", 
+            "app.py", 
+            "--server.port", 
+            port, 
+            "--server.headless", 
+            "true"
+        ]
+        from streamlit.web import cli as stcli
+        sys.exit(stcli.main())
     except KeyboardInterrupt:
         print("\n👋 Shutting down gracefully...")
         sys.exit(0)
@@ -2,39 +2,60 @@
 """
 Script to run all tests for the AI Docs Generator project.
 """
+import importlib.util
 import os
 import sys
-import unittest
 import pytest
 
+try:
+    import xdist
+except ImportError:  # Optional: without pytest-xdist the tests run in one process
+    xdist = None
+
 def run_tests():
-    """Run all unit tests using unittest."""
+    """Run all tests using pytest, spread across every CPU core when pytest-xdist is installed."""
     print("Running tests...")
-    # Add the project root to the path
+    # Add the project root to the path, including for xdist worker processes
     root_dir = os.path.dirname(os.path.abspath(__file__))
     sys.path.insert(0, root_dir)
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [root_dir, os.environ.get("PYTHONPATH")]))
     
-    # Discover and run tests
-    loader = unittest.TestLoader()
-    start_dir = os.path.join(root_dir, 'tests')
-    suite = loader.discover(start_dir)
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    args = ['--import-mode=importlib', os.path.join(root_dir, 'tests')]
+    if xdist is not None:
+        # Each test module's module-scoped fixtures are built on one worker only
+        args[:0] = ['-n', str(os.cpu_count() or 1), '--dist=loadfile']
+    if os.environ.get("CI"):
+        # Nothing reads the cache back in CI, so skip writing it
+        args[:0] = ['-p', 'no:cacheprovider']
     
-    return 0 if result.wasSuccessful() else 1
+    return pytest.main(args)
 
 def run_pytest():
-    """Run all tests using pytest."""
+    """Run all tests using pytest in one process, stopping at the first failure."""
     print("Running tests with pytest...")
     root_dir = os.path.dirname(os.path.abspath(__file__))
     sys.path.insert(0, root_dir)
     
     return pytest.main(['-xvs', 'tests'])
 
+def run_profile():
+    """Run all tests in one process under cProfile, writing prof/combined.prof and prof/combined.svg."""
+    print("Running tests under the profiler...")
+    root_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, root_dir)
+    
+    if importlib.util.find_spec("pytest_profiling") is None:
+        print("Install pytest-profiling (see tests/requirements.txt) to profile the tests.")
+        return 1
+    
+    # The call graph SVG also needs gprof2dot and Graphviz's dot on the PATH
+    return pytest.main(['--profile-svg', os.path.join(root_dir, 'tests')])
+
 if __name__ == '__main__':
     # Check if pytest is preferred
     if len(sys.argv) > 1 and sys.argv[1] == '--pytest':
         sys.exit(run_pytest())
+    elif len(sys.argv) > 1 and sys.argv[1] == '--profile':
+        sys.exit(run_profile())
     else:
         sys.exit(run_tests()) 
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Shared fixtures for the AI Docs Generator tests.
+"""
+import importlib.util
+from types import SimpleNamespace
+
+import pytest
+
+from app.github.repo_fetcher import RepoFetcher
+from app.parsers.code_parser import CodeParser
+
+
+def pytest_addoption(parser):
+    """Add the option that enables tests against the real GitHub."""
+    parser.addoption("--run-remote", action="store_true", default=False,
+                     help="also run tests marked remote, which reach github.com")
+
+
+def pytest_configure(config):
+    """Register the local and remote markers."""
+    config.addinivalue_line("markers", "local: fast tests with every external call mocked")
+    config.addinivalue_line("markers", "remote: tests that reach github.com")
+    config.addinivalue_line("markers", "real_fs: tests allowed to create directories and run processes")
+    config.addinivalue_line("markers", "requires_benchmark: benchmarks, skipped without pytest-benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip remote tests unless --run-remote was given, and benchmarks without the plugin."""
+    run_remote = config.getoption("--run-remote")
+    # Benchmarks need the pytest-benchmark plugin; compare runs against a saved
+    # baseline with --benchmark-compare --benchmark-compare-fail=mean:5%
+    has_benchmark = importlib.util.find_spec("pytest_benchmark") is not None
+    
+    skip_remote = pytest.mark.skip(reason="needs --run-remote")
+    skip_benchmark = pytest.mark.skip(reason="pytest-benchmark is not installed")
+    for item in items:
+        if not run_remote and "remote" in item.keywords:
+            item.add_marker(skip_remote)
+        if not has_benchmark and "requires_benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def _safe_fs(request, monkeypatch, tmp_path_factory):
+    """
+    Keep tests from running git or leaving directories behind, unless marked real_fs.
+    
+    os.makedirs does nothing, and tempfile.mkdtemp returns a fresh directory
+    under pytest's own temporary directory, which pytest cleans up.
+    """
+    if "real_fs" in request.keywords:
+        return
+    
+    monkeypatch.setattr("os.makedirs", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        "tempfile.mkdtemp",
+        lambda suffix=None, prefix=None, dir=None: str(tmp_path_factory.mktemp(prefix or "mkdtemp")),
+    )
+    monkeypatch.setattr(
+        "app.github.repo_fetcher.subprocess.run",
+        lambda *args, **kwargs: SimpleNamespace(returncode=0, stdout=b"", stderr=b""),
+    )
+
+
+@pytest.fixture(scope="module")
+def repo_fetcher():
+    """RepoFetcher shared by the tests in a module."""
+    return RepoFetcher()
+
+
+@pytest.fixture(scope="session")
+def code_parser(tmp_path_factory):
+    """CodeParser shared by every test, so its patterns are compiled once."""
+    # Parse results go to a temporary cache instead of the user's cache dir
+    return CodeParser(cache_dir=str(tmp_path_factory.mktemp("parse_cache")))
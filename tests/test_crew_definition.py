@@ -0,0 +1,21 @@
+"""
+Unit tests for the result handling of the documentation crew.
+"""
+import pytest
+
+# The crew definition needs CrewAI and LangChain installed
+crew_definition = pytest.importorskip("app.agents.crew_definition")
+
+# Everything these tests call out to is mocked
+pytestmark = pytest.mark.local
+
+
+@pytest.mark.parametrize("result,expected", [
+    ("text", {"documentation": "text"}),
+    ({"planning_task": {"output": "p"}, "doc_task": "d", "other": "x"}, {"plan": "p", "documentation": "d"}),
+    (["p", "a", "g", "d"], {"plan": "p", "analysis": "a", "diagrams": "g", "documentation": "d"}),
+    (["only"], {"documentation": "only"}),
+])
+def test_task_outputs(result, expected):
+    """Every CrewAI result shape is normalized to outputs keyed by kind."""
+    assert crew_definition._task_outputs(result) == expected
@@ -1,137 +1,310 @@
 """
 Unit tests for GitHub repository fetcher functionality.
 """
-import os
-import unittest
-from unittest.mock import patch, MagicMock
+import io
+import json
+import tarfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
-from app.github.repo_fetcher import RepoFetcher
-
-
-class TestRepoFetcher(unittest.TestCase):
-    """Test cases for RepoFetcher class."""
-
-    def setUp(self):
-        """Set up test environment."""
-        self.repo_fetcher = RepoFetcher()
-        self.test_url = "https://github.com/username/repo"
-        
-    def test_parse_github_url_valid(self):
-        """Test parsing valid GitHub URLs."""
-        owner, repo = self.repo_fetcher.parse_github_url(self.test_url)
-        self.assertEqual(owner, "username")
-        self.assertEqual(repo, "repo")
-        
-        # Test with trailing slash
-        owner, repo = self.repo_fetcher.parse_github_url(self.test_url + "/")
-        self.assertEqual(owner, "username")
-        self.assertEqual(repo, "repo")
-        
-        # Test with .git extension
-        owner, repo = self.repo_fetcher.parse_github_url(self.test_url + ".git")
-        self.assertEqual(owner, "username")
-        self.assertEqual(repo, "repo")
-
-    def test_parse_github_url_invalid(self):
-        """Test parsing invalid GitHub URLs."""
-        invalid_urls = [
-            "https://gitlab.com/username/repo",
-            "https://github.com",
-            "https://github.com/username",
-            "invalid_url",
-        ]
-        
-        for url in invalid_urls:
-            with self.assertRaises(ValueError):
-                self.repo_fetcher.parse_github_url(url)
-    
-    @patch('app.github.repo_fetcher.requests.get')
-    def test_fetch_repo_metadata(self, mock_get):
-        """Test fetching repository metadata."""
-        # Mock the API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "name": "repo",
-            "description": "Test repository",
-            "stargazers_count": 100,
-            "forks_count": 20,
-            "language": "Python",
-            "created_at": "2023-01-01T00:00:00Z",
-            "updated_at": "2023-12-31T00:00:00Z",
-            "owner": {
-                "login": "username",
-                "avatar_url": "https://github.com/avatar.png"
-            }
-        }
-        mock_get.return_value = mock_response
-        
-        metadata = self.repo_fetcher.fetch_repo_metadata("username", "repo")
-        
-        self.assertEqual(metadata["name"], "repo")
-        self.assertEqual(metadata["description"], "Test repository")
-        self.assertEqual(metadata["stars"], 100)
-        self.assertEqual(metadata["forks"], 20)
-        self.assertEqual(metadata["language"], "Python")
-        self.assertEqual(metadata["owner"], "username")
-        
-        # Assert that requests.get was called with the correct URL
-        mock_get.assert_called_once_with(
-            "https://api.github.com/repos/username/repo",
-            headers=self.repo_fetcher.headers
-        )
-    
-    @patch('app.github.repo_fetcher.subprocess.run')
-    def test_clone_repository(self, mock_run):
-        """Test cloning a repository."""
-        # Mock the subprocess.run response
-        mock_process = MagicMock()
-        mock_process.returncode = 0
-        mock_run.return_value = mock_process
-        
-        # Patch os.path.exists to always return False (directory doesn't exist)
-        with patch('os.path.exists', return_value=False):
-            # Patch os.makedirs to avoid actually creating directories
-            with patch('os.makedirs'):
-                result = self.repo_fetcher.clone_repository("username", "repo")
-                
-                self.assertTrue(result)
-                
-                # Assert that git clone was called with the correct arguments
-                mock_run.assert_called_once()
-                args, kwargs = mock_run.call_args
-                self.assertEqual(args[0][0], "git")
-                self.assertEqual(args[0][1], "clone")
-                self.assertEqual(args[0][2], "https://github.com/username/repo.git")
-    
-    @patch('os.walk')
-    def test_get_file_structure(self, mock_walk):
-        """Test getting file structure from a repository."""
-        # Mock the os.walk response
-        mock_walk.return_value = [
-            ('/tmp/repo', ['dir1', 'dir2'], ['file1.py', 'file2.py']),
-            ('/tmp/repo/dir1', [], ['file3.py']),
-            ('/tmp/repo/dir2', [], ['file4.py'])
-        ]
-        
-        # Patch the os.path.getsize to always return 1024
-        with patch('os.path.getsize', return_value=1024):
-            with patch('os.path.isdir', return_value=True):
-                structure = self.repo_fetcher.get_file_structure("/tmp/repo")
-                
-                # Check that the structure contains the expected files and directories
-                self.assertEqual(len(structure), 6)  # 4 files + 2 directories
-                
-                # Check that each file has the correct properties
-                for item in structure:
-                    if item["type"] == "file":
-                        self.assertIn("size", item)
-                        self.assertIn("path", item)
-                    elif item["type"] == "directory":
-                        self.assertIn("path", item)
-
-
-if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+from app.github.repo_fetcher import LazyFileTree
+
+# Everything these tests call out to is mocked
+pytestmark = pytest.mark.local
+
+TEST_URL = "https://github.com/username/repo"
+
+# Read-only PyGithub Repository attributes shared by the mocked tests
+_REPO_ATTRIBUTES = {
+    "name": "repo",
+    "full_name": "username/repo",
+    "description": "Test repository",
+    "html_url": TEST_URL,
+    "default_branch": "main",
+    "stargazers_count": 100,
+    "forks_count": 20,
+    "language": "Python",
+    "size": 42,
+}
+
+# Files of the repository checkout used by the structure tests
+_REPO_FILES = {
+    "file1.py": "import os\n",
+    "file2.py": "print('hi')\n",
+    "dir1/file3.py": "x = 1\n",
+    "dir2/file4.md": "# Title\n",
+    "node_modules/lib.js": "ignored\n",
+    "app.min.js": "ignored\n",
+}
+
+# Keys every file structure entry must have
+_REQUIRED_KEYS = frozenset({"path", "content", "size", "extension"})
+
+
+@pytest.fixture(scope="module")
+def github_client():
+    """Mocked PyGithub client, built once for the module."""
+    client = MagicMock()
+    client.get_repo.return_value = SimpleNamespace(**_REPO_ATTRIBUTES)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(github_client):
+    """Clear recorded calls on the shared mocks after each test."""
+    yield
+    github_client.reset_mock()
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    """A checked out repository containing _REPO_FILES."""
+    for file_path, content in _REPO_FILES.items():
+        target = tmp_path / file_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def github_utils(monkeypatch):
+    """The GithubRepositoryFetcher module, which needs Streamlit installed, with an empty ETag cache."""
+    module = pytest.importorskip("app.github.github_utils")
+    monkeypatch.setattr(module, "_ETAG_CACHE", module.OrderedDict())
+    monkeypatch.setattr(module, "_etag_cache_bytes", 0)
+    return module
+
+
+def _tarball(members):
+    """Build a gzipped tarball from (name, content or None for a symlink) pairs."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.SYMTYPE
+                info.linkname = "/etc/passwd"
+                archive.addfile(info)
+            else:
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+def _download_session(status_code=200, raw=None):
+    """Mocked download session whose get() returns one streamed response."""
+    response = MagicMock(status_code=status_code, raw=raw)
+    response.__enter__.return_value = response
+    session = MagicMock()
+    session.get.return_value = response
+    return session
+
+
+@pytest.mark.parametrize("url", [
+    TEST_URL,
+    TEST_URL + "/",  # Trailing slash
+    TEST_URL + ".git",  # .git extension
+    "git@github.com:username/repo.git",  # SSH form
+])
+def test_parse_github_url_valid(repo_fetcher, url):
+    """Test parsing valid GitHub URLs."""
+    owner, repo = repo_fetcher._parse_github_url(url)
+    assert owner == "username"
+    assert repo == "repo"
+
+
+@pytest.mark.parametrize("url", [
+    "https://gitlab.com/username/repo",
+    "https://github.com",
+    "https://github.com/username",
+    "invalid_url",
+])
+def test_parse_github_url_invalid(repo_fetcher, url):
+    """Test parsing invalid GitHub URLs."""
+    with pytest.raises(ValueError):
+        repo_fetcher._parse_github_url(url)
+
+
+def test_fetch_repository_metadata(repo_fetcher, github_client, monkeypatch):
+    """Test fetching repository metadata through the REST API, then the cache."""
+    monkeypatch.setattr(repo_fetcher, "github_token", "")
+    monkeypatch.setattr(repo_fetcher, "github", github_client)
+    monkeypatch.setattr("app.github.repo_fetcher._METADATA_CACHE", {})
+    
+    metadata = repo_fetcher.fetch_repository_metadata(TEST_URL)
+    
+    expected = {
+        "name": "repo",
+        "description": "Test repository",
+        "stars": 100,
+        "forks": 20,
+        "language": "Python",
+        "owner": "username",
+        "repo_name": "repo",
+        "default_branch": "main",
+    }
+    assert {key: metadata[key] for key in expected} == expected
+    github_client.get_repo.assert_called_once_with("username/repo")
+    
+    # A second lookup is served from the cache, as an independent copy
+    metadata["name"] = "changed"
+    assert repo_fetcher.fetch_repository_metadata(TEST_URL + ".git")["name"] == "repo"
+    assert github_client.get_repo.call_count == 1
+
+
+def test_clone_repository_falls_back_to_git(repo_fetcher, monkeypatch):
+    """Test cloning with git when the tarball download fails."""
+    def fail_download(url, branch, path):
+        raise ValueError("Failed to download repository archive: 404")
+    
+    monkeypatch.setattr(repo_fetcher, "download_tarball", fail_download)
+    
+    # Only the attributes of the subprocess.run result are read
+    completed = SimpleNamespace(returncode=0, stdout="", stderr="")
+    mock_run = MagicMock(return_value=completed)
+    monkeypatch.setattr("app.github.repo_fetcher.subprocess.run", mock_run)
+    
+    result = repo_fetcher.clone_repository(TEST_URL, branch="dev")
+    
+    assert result == repo_fetcher.clone_path
+    
+    # Assert that git clone was called with the correct arguments
+    mock_run.assert_called_once()
+    command = mock_run.call_args.args[0]
+    assert command[:2] == ["git", "clone"]
+    assert command[command.index("--branch") + 1] == "dev"
+    assert command[-2:] == [TEST_URL, result]
+
+
+def test_clone_repository_prefers_tarball(repo_fetcher, monkeypatch):
+    """Test that git is not run when the tarball download succeeds."""
+    downloads = []
+    monkeypatch.setattr(repo_fetcher, "download_tarball", lambda url, branch, path: downloads.append((url, branch, path)))
+    mock_run = MagicMock()
+    monkeypatch.setattr("app.github.repo_fetcher.subprocess.run", mock_run)
+    
+    result = repo_fetcher.clone_repository(TEST_URL)
+    
+    assert downloads == [(TEST_URL, None, result)]
+    mock_run.assert_not_called()
+
+
+@pytest.mark.real_fs
+def test_download_tarball_extracts_regular_files_only(repo_fetcher, tmp_path, monkeypatch):
+    """Test that links and paths escaping the target directory are skipped."""
+    archive = _tarball([
+        ("repo-main/a.py", b"print('a')\n"),
+        ("repo-main/pkg/b.txt", b"b\n"),
+        ("repo-main/link", None),
+        ("repo-main/../../escape.txt", b"nope\n"),
+        ("top_level_file", b"outside the repo directory\n"),
+    ])
+    session = _download_session(raw=archive)
+    monkeypatch.setattr("app.github.repo_fetcher._get_download_session", lambda: session)
+    
+    repo_fetcher.download_tarball(TEST_URL, "main", str(tmp_path))
+    
+    assert session.get.call_args.args[0] == "https://codeload.github.com/username/repo/tar.gz/main"
+    extracted = sorted(str(path.relative_to(tmp_path)) for path in tmp_path.rglob("*") if path.is_file())
+    assert extracted == ["a.py", "pkg/b.txt"]
+    assert (tmp_path / "pkg" / "b.txt").read_text() == "b\n"
+    assert not (tmp_path.parent / "escape.txt").exists()
+
+
+def test_download_tarball_error_status(repo_fetcher, tmp_path, monkeypatch):
+    """Test that a failed download raises ValueError."""
+    monkeypatch.setattr("app.github.repo_fetcher._get_download_session", lambda: _download_session(status_code=404))
+    
+    with pytest.raises(ValueError, match="404"):
+        repo_fetcher.download_tarball(TEST_URL, None, str(tmp_path))
+
+
+def test_get_repository_structure(repo_fetcher, repo_dir):
+    """Test getting the file structure of a checked out repository."""
+    structure = repo_fetcher.get_repository_structure(repo_dir)
+    
+    # Ignored directories and minified files are left out
+    assert isinstance(structure, LazyFileTree)
+    assert sorted(structure) == ["dir1/file3.py", "dir2/file4.md", "file1.py", "file2.py"]
+    
+    # Check that each file has the correct properties
+    for file_path in structure:
+        entry = structure[file_path]
+        assert _REQUIRED_KEYS <= entry.keys()
+        assert entry["content"] == _REPO_FILES[file_path]
+    assert structure["dir2/file4.md"]["extension"] == "md"
+
+
+
+def test_lazy_file_tree_reads_each_file_once(repo_fetcher, repo_dir, monkeypatch):
+    """Test that files are read on first access only, and materialize reuses them."""
+    reads = []
+    read_file = repo_fetcher.read_file
+    
+    def counting_read(repo_path, file_path, size=None):
+        reads.append(file_path)
+        return read_file(repo_path, file_path, size=size)
+    
+    monkeypatch.setattr(repo_fetcher, "read_file", counting_read)
+    structure = repo_fetcher.get_repository_structure(repo_dir)
+    
+    # Enumerating and sizing files does not read them
+    assert len(structure) == 4
+    assert "file1.py" in structure
+    assert structure.size_on_disk("file1.py") == len(_REPO_FILES["file1.py"])
+    assert reads == []
+    
+    assert structure["file1.py"] is structure["file1.py"]
+    assert reads == ["file1.py"]
+    
+    materialized = structure.materialize()
+    assert type(materialized) is dict
+    assert materialized["file1.py"] is structure["file1.py"]
+    assert sorted(reads) == sorted(structure)
+
+
+
+def test_etag_cache_returns_independent_copies(github_utils, monkeypatch):
+    """Test that callers mutating a result cannot alter the cached response."""
+    body = json.dumps([{"path": "a.py"}]).encode()
+    responses = [
+        SimpleNamespace(status_code=200, headers={"ETag": '"v1"'}, content=body, text=""),
+        SimpleNamespace(status_code=304, headers={}, content=b"", text=""),
+    ]
+    fetcher = github_utils.GithubRepositoryFetcher()
+    mock_get = MagicMock(side_effect=responses)
+    monkeypatch.setattr(fetcher.session, "get", mock_get)
+    
+    first = fetcher._cached_get("https://api.github.com/x", "Failed")
+    first[0]["full_path"] = "changed"
+    second = fetcher._cached_get("https://api.github.com/x", "Failed")
+    
+    assert second == [{"path": "a.py"}]
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert mock_get.call_args.kwargs["timeout"] == github_utils._REQUEST_TIMEOUT
+
+
+def test_etag_cache_is_bounded_by_total_bytes(github_utils, monkeypatch):
+    """Test that the least recently used bodies are evicted, and oversized ones never cached."""
+    monkeypatch.setattr(github_utils, "_ETAG_CACHE_MAX_BYTES", 6)
+    bodies = {"a": b"[1]", "b": b"[2]", "c": b"[3]", "big": b"[12345]"}
+    fetcher = github_utils.GithubRepositoryFetcher()
+    monkeypatch.setattr(fetcher.session, "get", lambda url, headers=None, timeout=None: SimpleNamespace(
+        status_code=200, headers={"ETag": url}, content=bodies[url], text=""))
+    
+    for url in ("a", "b", "c"):
+        fetcher._cached_get(url, "Failed")
+    assert [key[1] for key in github_utils._ETAG_CACHE] == ["b", "c"]
+    
+    assert fetcher._cached_get("big", "Failed") == [12345]
+    assert [key[1] for key in github_utils._ETAG_CACHE] == ["b", "c"]
+    assert github_utils._etag_cache_bytes == 6
+
+
+@pytest.mark.requires_benchmark
+def test_parse_github_url_benchmark(benchmark, repo_fetcher):
+    """Guard the cost of parsing a repository URL."""
+    assert benchmark(repo_fetcher._parse_github_url, TEST_URL) == ("username", "repo")
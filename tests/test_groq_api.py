@@ -0,0 +1,168 @@
+"""
+Unit tests for the rate limiting and response caching shared by the Groq calls.
+"""
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.agents import groq_api
+
+# Everything these tests call out to is mocked
+pytestmark = pytest.mark.local
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock for the rate limiter; advance it by assigning clock.now."""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(groq_api, "time", SimpleNamespace(monotonic=lambda: fake.now, sleep=None))
+    return fake
+
+
+@pytest.fixture
+def no_limits(monkeypatch):
+    """Disable the shared limiter and record the back-off sleeps instead of sleeping."""
+    sleeps = []
+    monkeypatch.setattr(groq_api, "rate_limiter", groq_api.RateLimiter(max_rpm=0))
+    monkeypatch.setattr(groq_api, "time", SimpleNamespace(monotonic=lambda: 0.0, sleep=sleeps.append))
+    return sleeps
+
+
+class _RateLimited(Exception):
+    """Stand-in for groq.RateLimitError, which carries the 429 status and response."""
+    
+    status_code = 429
+    response = SimpleNamespace(headers={"retry-after": "2"})
+
+
+def _chunk(text, usage=None):
+    """A streamed chat completion chunk."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text))],
+        x_groq=SimpleNamespace(usage=usage) if usage else None,
+    )
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    """Empty response cache holding at most two entries."""
+    cache = OrderedDict()
+    monkeypatch.setattr(groq_api, "_RESPONSE_CACHE", cache)
+    monkeypatch.setattr(groq_api, "_RESPONSE_CACHE_SIZE", 2)
+    return cache
+
+
+def test_response_cache_evicts_least_recently_used(response_cache):
+    """A lookup marks an entry as recently used, so the other one is evicted."""
+    groq_api.store_cached_response("a", "first")
+    groq_api.store_cached_response("b", "second")
+    assert groq_api.get_cached_response("a") == "first"
+    
+    groq_api.store_cached_response("c", "third")
+    
+    assert list(response_cache) == ["a", "c"]
+    assert groq_api.get_cached_response("b") is None
+
+
+def test_response_cache_key_covers_model_temperature_and_prompt():
+    """Changing any part of a request changes its cache key."""
+    key = groq_api.response_cache_key("model", 0.2, "prompt")
+    
+    assert key == groq_api.response_cache_key("model", 0.2, "prompt")
+    assert key != groq_api.response_cache_key("other", 0.2, "prompt")
+    assert key != groq_api.response_cache_key("model", 0.3, "prompt")
+    assert key != groq_api.response_cache_key("model", 0.2, "prompt!")
+
+
+def test_response_cache_key_skips_high_temperatures():
+    """Requests above the caching temperature get no key, so they are never replayed."""
+    assert groq_api.response_cache_key("model", 0.9, "prompt") is None
+
+
+def test_rate_limiter_blocks_until_the_window_moves(clock):
+    """Requests beyond max_rpm wait until the oldest one leaves the window."""
+    limiter = groq_api.RateLimiter(max_rpm=2)
+    
+    assert limiter.reserve() == 0
+    clock.now += 10
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(50)
+    
+    clock.now += 50
+    assert limiter.reserve() == 0
+
+
+def test_rate_limiter_tracks_tokens(clock):
+    """Requests wait once the tokens used in the window reach max_tpm."""
+    limiter = groq_api.RateLimiter(max_rpm=100, max_tpm=1000)
+    
+    assert limiter.reserve() == 0
+    limiter.record_tokens(1000)
+    assert limiter.reserve() == pytest.approx(60)
+    
+    clock.now += 60
+    assert limiter.reserve() == 0
+
+
+@pytest.mark.parametrize("max_rpm,max_tpm", [(0, 0), (-1, -1)])
+def test_rate_limiter_non_positive_limits_are_disabled(clock, max_rpm, max_tpm):
+    """Limits of zero or less never make a request wait."""
+    limiter = groq_api.RateLimiter(max_rpm=max_rpm, max_tpm=max_tpm)
+    
+    for _ in range(5):
+        limiter.record_tokens(10_000)
+        assert limiter.reserve() == 0
+
+
+@pytest.mark.parametrize("value,expected", [("", 30), ("45", 45), (" 7 ", 7), ("-1", -1)])
+def test_env_int(monkeypatch, value, expected):
+    """Integer settings fall back to the default when unset or empty."""
+    monkeypatch.setenv("GROQ_TEST_SETTING", value)
+    assert groq_api.env_int("GROQ_TEST_SETTING", 30) == expected
+
+
+def test_env_int_rejects_non_integers(monkeypatch):
+    """A non-integer setting warns and uses the default instead of failing."""
+    monkeypatch.setenv("GROQ_TEST_SETTING", "fast")
+    with pytest.warns(UserWarning, match="GROQ_TEST_SETTING"):
+        assert groq_api.env_int("GROQ_TEST_SETTING", 30) == 30
+
+
+def test_stream_completion_retries_rate_limits(no_limits, monkeypatch):
+    """A 429 when opening the stream is retried after Retry-After, and usage is recorded."""
+    recorded = []
+    monkeypatch.setattr(groq_api.rate_limiter, "record_tokens", recorded.append)
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [
+        _RateLimited(),
+        iter([_chunk("Hel"), _chunk(None), _chunk("lo", usage=SimpleNamespace(total_tokens=7))]),
+    ]
+    
+    assert list(groq_api.stream_completion(client, model="m", messages=[])) == ["Hel", "lo"]
+    assert no_limits == [2.0]
+    assert client.chat.completions.create.call_count == 2
+    assert client.chat.completions.create.call_args.kwargs == {"stream": True, "model": "m", "messages": []}
+    assert recorded == [7]
+
+
+def test_stream_completion_raises_other_errors_without_retrying(no_limits):
+    """Errors other than 429 reach the caller on the first attempt."""
+    client = MagicMock()
+    client.chat.completions.create.side_effect = ValueError("bad request")
+    
+    with pytest.raises(ValueError, match="bad request"):
+        list(groq_api.stream_completion(client, model="m", messages=[]))
+    assert client.chat.completions.create.call_count == 1
+    assert no_limits == []
+
+
+def test_create_completion_gives_up_after_the_retry_limit(no_limits):
+    """A request still rate limited after MAX_RATE_LIMIT_RETRIES retries raises the 429."""
+    client = MagicMock()
+    client.chat.completions.create.side_effect = _RateLimited()
+    
+    with pytest.raises(_RateLimited):
+        groq_api.create_completion(client, model="m", messages=[])
+    assert client.chat.completions.create.call_count == groq_api.MAX_RATE_LIMIT_RETRIES + 1
@@ -1,112 +1,199 @@
 """
 Unit tests for code parser functionality.
 """
-import unittest
-from unittest.mock import patch, MagicMock, mock_open
+import os
+from types import MappingProxyType
+
+import pytest
 
 from app.parsers.code_parser import CodeParser
 
+# Everything these tests call out to is mocked
+pytestmark = pytest.mark.local
+
+
+@pytest.fixture(scope="session")
+def parsed_files():
+    """Read-only parse results for a three-module dependency chain."""
+    return MappingProxyType({
+        "module1.py": MappingProxyType({
+            "imports": ("module2", "module3"),
+            "language": "Python"
+        }),
+        "module2.py": MappingProxyType({
+            "imports": ("module3",),
+            "language": "Python"
+        }),
+        "module3.py": MappingProxyType({
+            "imports": (),
+            "language": "Python"
+        })
+    })
+
+
+@pytest.fixture
+def counting_parser(tmp_path, monkeypatch):
+    """Factory for parsers sharing one cache dir, recording every real parse."""
+    parses = []
+    parse_structure = CodeParser._parse_structure
+    
+    def counting_parse(self, content, language):
+        parses.append(content)
+        return parse_structure(self, content, language)
+    
+    monkeypatch.setattr(CodeParser, "_parse_structure", counting_parse)
+    
+    def make_parser():
+        return CodeParser(cache_dir=str(tmp_path))
+    
+    make_parser.parses = parses
+    return make_parser
+
+
+@pytest.mark.parametrize("filename,expected_language", [
+    ("file.py", "Python"),
+    ("file.js", "JavaScript"),
+    ("file.ts", "TypeScript"),
+    ("file.java", "Java"),
+    ("file.cpp", "C++"),
+    ("file.c", "C"),
+    ("file.go", "Go"),
+    ("file.rb", "Ruby"),
+    ("file.php", "PHP"),
+    ("file.html", "HTML"),
+    ("file.css", "CSS"),
+    ("file.unknown", "Unknown")
+])
+def test_detect_language_by_extension(code_parser, filename, expected_language):
+    """Test language detection by file extension."""
+    assert code_parser.detect_language(filename, "") == expected_language
+
+
+def test_parse_python_file(code_parser):
+    """Test parsing a Python file."""
+    result = code_parser.parse_file("example.py", "import os\n\ndef main():\n    print('Hello')")
+    
+    # Check that the result contains the expected keys
+    assert {"imports", "functions", "classes", "language"} <= result.keys()
+    
+    # Check that the language is correctly identified
+    assert result["language"] == "Python"
+    
+    # Check that imports were detected
+    assert "os" in result["imports"]
+    
+    # Check that functions were detected
+    assert "main" in [function["name"] for function in result["functions"]]
+
+
+def test_parse_javascript_file(code_parser):
+    """Test parsing a JavaScript file."""
+    result = code_parser.parse_file("example.js", "class Example {\n  constructor() {}\n  method() {}\n}")
+    
+    # Check language detection
+    assert result["language"] == "JavaScript"
+    
+    # Check that classes were detected
+    assert "Example" in [cls["name"] for cls in result["classes"]]
+    
+    # Check that methods were detected
+    function_names = [function["name"] for function in result["functions"]]
+    assert "method" in function_names
+    assert "constructor" in function_names
+
+
+def test_parse_binary_file(code_parser):
+    """Binary content is reported without being parsed."""
+    result = code_parser.parse_file("data.py", "abc\x00def")
+    
+    assert result["type"] == "binary"
+    assert "imports" not in result
+
+
+def test_parse_cache_reuses_results_across_parsers(counting_parser):
+    """A second parser with the same cache dir does not parse unchanged content again."""
+    first = counting_parser().parse_file("a.py", "import os\n")
+    second = counting_parser().parse_file("b.py", "import os\n")
+    
+    assert counting_parser.parses == ["import os\n"]
+    assert second["imports"] == first["imports"] == ["os"]
+    
+    # Changed content misses the cache
+    counting_parser().parse_file("a.py", "import sys\n")
+    assert counting_parser.parses == ["import os\n", "import sys\n"]
+
+
+def test_parse_cache_prune_evicts_least_recently_used(tmp_path):
+    """Pruning deletes the oldest entries until the cache fits."""
+    parser = CodeParser(cache_dir=str(tmp_path))
+    for age, name in enumerate(["old", "middle", "new"]):
+        entry = tmp_path / f"{name}.json"
+        entry.write_text("x" * 100)
+        os.utime(entry, (age, age))
+    
+    parser._prune_cache(max_bytes=250)
+    
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["middle.json", "new.json"]
+
+
+def test_build_dependency_graph_simple(code_parser, parsed_files):
+    """Test building a simple dependency graph."""
+    graph = code_parser.build_dependency_graph(parsed_files)
+    
+    # Check that dependencies are correctly mapped; files without any are left out
+    assert graph == {
+        "module1.py": ["module2.py", "module3.py"],
+        "module2.py": ["module3.py"],
+    }
+
+
 
-class TestCodeParser(unittest.TestCase):
-    """Test cases for CodeParser class."""
-
-    def setUp(self):
-        """Set up test environment."""
-        self.code_parser = CodeParser()
-        
-    def test_detect_language_by_extension(self):
-        """Test language detection by file extension."""
-        test_cases = [
-            ("file.py", "python"),
-            ("file.js", "javascript"),
-            ("file.ts", "typescript"),
-            ("file.java", "java"),
-            ("file.cpp", "cpp"),
-            ("file.c", "c"),
-            ("file.go", "go"),
-            ("file.rb", "ruby"),
-            ("file.php", "php"),
-            ("file.html", "html"),
-            ("file.css", "css"),
-            ("file.unknown", "unknown")
-        ]
-        
-        for filename, expected_language in test_cases:
-            detected_language = self.code_parser.detect_language(filename)
-            self.assertEqual(detected_language, expected_language)
-    
-    @patch('builtins.open', new_callable=mock_open, read_data="import os\n\ndef main():\n    print('Hello')")
-    def test_parse_python_file(self, mock_file):
-        """Test parsing a Python file."""
-        result = self.code_parser.parse_file("example.py")
-        
-        # Check that the result contains the expected keys
-        self.assertIn("imports", result)
-        self.assertIn("functions", result)
-        self.assertIn("classes", result)
-        self.assertIn("language", result)
-        
-        # Check that the language is correctly identified
-        self.assertEqual(result["language"], "python")
-        
-        # Check that imports were detected
-        self.assertIn("os", result["imports"])
-        
-        # Check that functions were detected
-        self.assertIn("main", result["functions"])
-    
-    @patch('builtins.open', new_callable=mock_open, read_data="class Example {\n  constructor() {}\n  method() {}\n}")
-    def test_parse_javascript_file(self, mock_file):
-        """Test parsing a JavaScript file."""
-        result = self.code_parser.parse_file("example.js")
-        
-        # Check language detection
-        self.assertEqual(result["language"], "javascript")
-        
-        # Check that classes were detected
-        self.assertIn("Example", result["classes"])
-        
-        # Check that methods were detected
-        self.assertIn("method", result["methods"])
-        self.assertIn("constructor", result["methods"])
-    
-    def test_build_dependency_graph_simple(self):
-        """Test building a simple dependency graph."""
-        # Mock file parse results
-        parsed_files = {
-            "module1.py": {
-                "imports": ["module2", "module3"],
-                "language": "python"
-            },
-            "module2.py": {
-                "imports": ["module3"],
-                "language": "python"
-            },
-            "module3.py": {
-                "imports": [],
-                "language": "python"
-            }
-        }
-        
-        # Build dependency graph
-        with patch.object(self.code_parser, 'parse_file', side_effect=lambda f: parsed_files.get(f, {})):
-            graph = self.code_parser.build_dependency_graph(list(parsed_files.keys()))
-            
-            # Check that the graph has the correct nodes
-            self.assertEqual(len(graph), 3)
-            
-            # Check that dependencies are correctly mapped
-            self.assertIn("module2", graph["module1.py"]["depends_on"])
-            self.assertIn("module3", graph["module1.py"]["depends_on"])
-            self.assertIn("module3", graph["module2.py"]["depends_on"])
-            self.assertEqual(len(graph["module3.py"]["depends_on"]), 0)
-            
-            # Check reverse dependencies
-            self.assertIn("module1.py", graph["module2.py"]["used_by"])
-            self.assertIn("module1.py", graph["module3.py"]["used_by"])
-            self.assertIn("module2.py", graph["module3.py"]["used_by"])
-            self.assertEqual(len(graph["module1.py"]["used_by"]), 0)
-
-
-if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+def test_build_dependency_graph_packages_and_js(code_parser):
+    """Dotted imports resolve to package modules, and JS paths to their files."""
+    parsed_files = {
+        "app/main.py": {"language": "Python", "imports": ["app.utils.helpers", "os"]},
+        "app/utils/helpers.py": {"language": "Python", "imports": ["app.main"]},
+        "web/index.js": {"language": "JavaScript", "imports": ["./web/api", "react"]},
+        "web/api.js": {"language": "JavaScript", "imports": []},
+    }
+    
+    graph = code_parser.build_dependency_graph(parsed_files)
+    
+    assert graph == {
+        "app/main.py": ["app/utils/helpers.py"],
+        "app/utils/helpers.py": ["app/main.py"],
+        "web/index.js": ["web/api.js"],
+    }
+
+
+def test_build_dependency_graph_skips_ambiguous_suffixes(code_parser):
+    """A short import shared by several files resolves only through a full module path."""
+    parsed_files = {
+        "a/utils.py": {"language": "Python", "imports": []},
+        "b/utils.py": {"language": "Python", "imports": []},
+        "b/helpers.py": {"language": "Python", "imports": []},
+        "main.py": {"language": "Python", "imports": ["utils", "b.utils", "helpers"]},
+    }
+    
+    graph = code_parser.build_dependency_graph(parsed_files)
+    
+    assert graph == {"main.py": ["b/utils.py", "b/helpers.py"]}
+
+
+@pytest.mark.requires_benchmark
+def test_detect_language_benchmark(benchmark, code_parser):
+    """Guard the cost of detecting a language from a known extension."""
+    assert benchmark(code_parser.detect_language, "file.py", "") == "Python"
+
+
+def test_build_dependency_graph_ignores_external_dotted_imports(code_parser):
+    """Stdlib and third-party dotted imports do not resolve to repo files sharing a name."""
+    parsed_files = {
+        "app/path.py": {"language": "Python", "imports": ["os.path"]},
+        "app/adapters.py": {"language": "Python", "imports": ["requests.adapters", "app.path"]},
+        "app/utils/json.py": {"language": "Python", "imports": ["simplejson.json"]},
+    }
+    
+    graph = code_parser.build_dependency_graph(parsed_files)
+    
+    assert graph == {"app/adapters.py": ["app/path.py"]}